@@ -0,0 +1,149 @@
+"""Doppler effect of a moving source heard by a moving observer.
+
+Everything is computed in closed form, or by bisection where an equation has
+no closed form, over NumPy arrays of times, so a whole animation is worked
+out in one batch instead of being integrated frame by frame.
+
+Trajectories are functions of time returning positions; they must accept an
+array of times and return one position per time, or a single position for a
+source that does not move. Wavefronts travel at ``speed`` from where the
+source was when they were emitted. The observed frequency is
+
+    f_o = (speed - v_o . n) / (speed - v_s . n) f_s
+
+with ``n`` the unit vector from the source, at emission, to the observer,
+at reception: ``(υ ± υ_o) / (υ ∓ υ_s) f_s`` along the line between them.
+"""
+
+import numpy as np
+
+
+def positions(trajectory, t):
+    """Return the positions of ``trajectory`` at times ``t``, shaped ``t.shape + (3,)``."""
+    t = np.asarray(t, dtype=float)
+    return np.broadcast_to(np.asarray(trajectory(t), dtype=float), t.shape + (3,))
+
+
+def velocities(trajectory, t, h=1e-4):
+    """Return the velocities of ``trajectory`` at times ``t``, by central differences."""
+    t = np.asarray(t, dtype=float)
+    return (positions(trajectory, t + h) - positions(trajectory, t - h)) / (2 * h)
+
+
+def emission_times(t, start, end, interval, lifetime):
+    """Return the emissions, every ``interval`` from ``start`` and before ``end``, still alive at time ``t``."""
+    # The tolerance keeps emissions that fall on a frame from depending on rounding
+    first = max(int(np.floor((t - lifetime - start) / interval + 1e-9)) + 1, 0)
+    last = int(np.floor((t - start) / interval + 1e-9))
+    emitted = start + np.arange(first, last + 1) * interval
+    return emitted[emitted < end]
+
+
+def wavefronts(t, emitted, source, speed):
+    """Return the centres and radii at time ``t`` of the wavefronts emitted at times ``emitted``."""
+    emitted = np.asarray(emitted, dtype=float)
+    return positions(source, emitted), speed * (t - emitted)
+
+
+def _bisect(function, low, high, iterations=60):
+    """Return the root of ``function``, increasing and elementwise, between ``low`` and ``high``."""
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        below = function(middle) < 0
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    return (low + high) / 2
+
+
+def arrival_times(emitted, source, observer, speed):
+    """Return the times at which the wavefronts emitted at ``emitted`` reach the observer.
+
+    The observer must move slower than the waves.
+    """
+    emitted = np.asarray(emitted, dtype=float)
+    centers = positions(source, emitted)
+
+    def gap(t):
+        return speed * (t - emitted) - np.linalg.norm(positions(observer, t) - centers, axis=-1)
+
+    span = np.ones_like(emitted)
+    while np.any(gap(emitted + span) < 0):
+        span = np.where(gap(emitted + span) < 0, span * 2, span)
+    return _bisect(gap, emitted, emitted + span)
+
+
+def retarded_times(t, source, observer, speed):
+    """Return the emission times of the wavefronts reaching the observer at times ``t``.
+
+    The source must move slower than the waves.
+    """
+    t = np.asarray(t, dtype=float)
+    listening = positions(observer, t)
+
+    def gap(emitted):
+        return np.linalg.norm(listening - positions(source, emitted), axis=-1) - speed * (t - emitted)
+
+    span = np.ones_like(t)
+    while np.any(gap(t - span) > 0):
+        span = np.where(gap(t - span) > 0, span * 2, span)
+    return _bisect(gap, t - span, t)
+
+
+def observed_frequency(t, source, observer, speed, frequency):
+    """Return the frequency heard by the observer at times ``t``, from wavefronts emitted at ``frequency``."""
+    t = np.asarray(t, dtype=float)
+    emitted = retarded_times(t, source, observer, speed)
+    direction = positions(observer, t) - positions(source, emitted)
+    direction /= np.maximum(np.linalg.norm(direction, axis=-1, keepdims=True), 1e-12)
+    source_speed = np.sum(velocities(source, emitted) * direction, axis=-1)
+    observer_speed = np.sum(velocities(observer, t) * direction, axis=-1)
+    return frequency * (speed - observer_speed) / (speed - source_speed)
+
+
+class Listener:
+    """Frequency heard by an observer, tabulated in one batch on the frame grid.
+
+    The source emits from ``start`` to ``end``: the observer hears it from
+    the arrival of the first of these wavefronts to that of the last, and
+    hears ``0`` outside. Works like ``MotionProfile`` in ``slides.py``:
+    :meth:`frequency_at` is a lookup on frame times and falls back to
+    :meth:`observed` anywhere else.
+    """
+
+    def __init__(self, source, observer, speed, frequency, start=-np.inf, end=np.inf):
+        self.source = source
+        self.observer = observer
+        self.speed = speed
+        self.frequency = frequency
+        self.start = start
+        self.end = end
+        self.heard_from = self._arrival(start)
+        self.heard_until = self._arrival(end)
+        self.grid_start = None
+        self.fps = None
+        self.values = None
+
+    def _arrival(self, emitted):
+        if not np.isfinite(emitted):
+            return emitted
+        return float(arrival_times(emitted, self.source, self.observer, self.speed))
+
+    def observed(self, t):
+        t = np.asarray(t, dtype=float)
+        heard = (t >= self.heard_from) & (t < self.heard_until)
+        return np.where(heard, observed_frequency(t, self.source, self.observer, self.speed, self.frequency), 0.0)
+
+    def precompute(self, start, duration, fps):
+        self.grid_start = start
+        self.fps = fps
+        times = start + np.arange(int(np.ceil(duration * fps)) + 1) / fps
+        self.values = self.observed(times)
+        return self
+
+    def frequency_at(self, t):
+        if self.values is not None:
+            frame = (t - self.grid_start) * self.fps
+            index = round(frame)
+            if 0 <= index < len(self.values) and abs(frame - index) < 1e-6:
+                return float(self.values[index])
+        return float(self.observed(t))
@@ -0,0 +1,112 @@
+"""Render infrastructure for the slide decks in this repository.
+
+The names below are imported from their modules on first use, so that the
+command line tools of the package, such as :mod:`render_tools.daemon`, start
+without loading manim.
+"""
+
+import importlib
+
+_exports = {
+    "run_benchmark": "bench",
+    "build_deck": "build",
+    "discover_scenes": "build",
+    "CheckpointMixin": "checkpoint",
+    "Snapshot": "checkpoint",
+    "ClockMixin": "clock",
+    "Stopwatch": "clock",
+    "CullingMixin": "culling",
+    "install_culling": "culling",
+    "is_visible": "culling",
+    "FrameStore": "frame_store",
+    "FrameStoreMixin": "frame_store",
+    "encode_presentation": "frame_store",
+    "FrameReuseMixin": "frames",
+    "LayerCacheMixin": "layers",
+    "LoopMixin": "loops",
+    "find_period": "loops",
+    "RenderOptions": "options",
+    "Patch": "patches",
+    "PatchesMixin": "patches",
+    "render_parallel": "parallel",
+    "split_boundaries": "parallel",
+    "PreviewMixin": "preview",
+    "ProfilingMixin": "profiling",
+    "Tracer": "profiling",
+    "install_profiler": "profiling",
+    "ExtraResolutionsMixin": "resolutions",
+    "resolution_folder": "resolutions",
+    "DeckSlide": "scene",
+    "UpdaterSchedulerMixin": "scheduler",
+    "update_order": "scheduler",
+    "SlideCache": "slide_cache",
+    "SlideCacheMixin": "slide_cache",
+    "hash_appearance": "state",
+    "hash_mobjects": "state",
+    "hash_scene_state": "state",
+    "TexCache": "tex_cache",
+    "TexCacheMixin": "tex_cache",
+    "install_tex_cache": "tex_cache",
+    "tex_request": "tex_cache",
+    "TextCache": "text_cache",
+    "TextCacheMixin": "text_cache",
+    "install_text_cache": "text_cache",
+}
+
+__all__ = [
+    "CheckpointMixin",
+    "ClockMixin",
+    "CullingMixin",
+    "DeckSlide",
+    "ExtraResolutionsMixin",
+    "FrameReuseMixin",
+    "FrameStore",
+    "FrameStoreMixin",
+    "LayerCacheMixin",
+    "LoopMixin",
+    "Patch",
+    "PatchesMixin",
+    "PreviewMixin",
+    "ProfilingMixin",
+    "RenderOptions",
+    "SlideCache",
+    "SlideCacheMixin",
+    "Snapshot",
+    "Stopwatch",
+    "TexCache",
+    "TexCacheMixin",
+    "TextCache",
+    "TextCacheMixin",
+    "Tracer",
+    "UpdaterSchedulerMixin",
+    "build_deck",
+    "discover_scenes",
+    "encode_presentation",
+    "find_period",
+    "hash_appearance",
+    "hash_mobjects",
+    "hash_scene_state",
+    "install_culling",
+    "install_profiler",
+    "install_tex_cache",
+    "install_text_cache",
+    "is_visible",
+    "render_parallel",
+    "resolution_folder",
+    "run_benchmark",
+    "split_boundaries",
+    "tex_request",
+    "update_order",
+]
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
@@ -0,0 +1,259 @@
+"""Render benchmark of representative slices of the deck.
+
+Usage::
+
+    python -m render_tools.bench [--baseline FILE] [--update] [--tolerance 0.15] [--quality l] [SLICE...]
+
+Each slice of :data:`SLICES` is rendered by its own ``manim`` process, at a
+fixed quality, with the slide cache off and empty TeX and ``Text`` caches, so
+that runs on the same machine are comparable. Slices are cut at
+``next_slide()`` boundaries, resuming from checkpoints recorded by a dry run
+of each scene first (see :mod:`render_tools.checkpoint`). A slice starts at
+the ``next_slide()`` call that follows a ``# bench: <name>`` comment in the
+scene's ``construct``, so that editing the deck does not move it.
+
+For every slice the wall time, the frames rendered per second, the peak
+resident memory of the ``manim`` process and the number of TeX programs it
+started are recorded. With ``--update`` they are written to the baseline;
+otherwise they are compared with it and the command fails when a slice got
+slower, bigger or ran TeX more often by more than the tolerance.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from manim_slides.config import PresentationConfig
+
+from .parallel import _run_manim
+from .text_cache import _version
+
+TEX_PROGRAMS = {"latex", "pdflatex", "xelatex", "lualatex", "dvisvgm"}
+
+
+@dataclass(frozen=True)
+class Slice:
+    """``slides`` slides of a scene from its ``# bench: <name>`` marker, or the whole scene if ``None``."""
+
+    name: str
+    scene: str
+    slides: int | None = 1
+
+
+SLICES = (
+    Slice("wave-emission", "DopplerEffect"),
+    Slice("relative-velocity", "DopplerEffect"),
+    Slice("camera-follow", "DopplerEffect"),
+    Slice("glyph-map-chain", "DopplerEffect", 3),
+    Slice("outro", "Outro", None),
+)
+
+
+def _construct(file, scene):
+    """Return the ``construct`` method of ``scene`` in ``file``, parsed, and the lines of ``file``."""
+    source = Path(file).read_text(encoding="utf-8")
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef) and node.name == scene:
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == "construct":
+                    return item, source.splitlines()
+    raise ValueError(f"{file} has no {scene}.construct")
+
+
+def _boundaries(construct):
+    # As SourceIndex finds them, without importing the deck
+    return sorted(
+        call.lineno
+        for call in ast.walk(construct)
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "next_slide"
+    )
+
+
+def slice_boundaries(file, bench_slice):
+    """Return the ``DECK_START_SLIDE`` and ``DECK_STOP_SLIDE`` of ``bench_slice`` in ``file``."""
+    if bench_slice.slides is None:
+        return 0, 0
+    construct, lines = _construct(file, bench_slice.scene)
+    marker = re.compile(rf"#\s*bench:\s*{re.escape(bench_slice.name)}\s*$")
+    marked = [line for line in range(construct.lineno, construct.end_lineno + 1) if marker.search(lines[line - 1])]
+    if len(marked) != 1:
+        raise ValueError(
+            f"Expected one '# bench: {bench_slice.name}' comment in {bench_slice.scene}.construct, found {len(marked)}"
+        )
+    boundaries = _boundaries(construct)
+    # Boundaries count the next_slide() calls from 1
+    start = next((number for number, line in enumerate(boundaries, 1) if line >= marked[0]), None)
+    if start is None or start + bench_slice.slides > len(boundaries):
+        raise ValueError(f"Slice {bench_slice.name} runs past the last next_slide() of {bench_slice.scene}")
+    return start, start + bench_slice.slides
+
+
+def _count_frames(slides_file):
+    import av
+
+    frames = 0
+    for slide in PresentationConfig.from_file(slides_file).slides:
+        with av.open(str(slide.file)) as container:
+            frames += container.streams.video[0].frames
+    return frames
+
+
+def _measure(file, bench_slice, boundaries, quality, workdir):
+    """Render ``bench_slice``, from and to ``boundaries``, in a fresh directory and return its measurements."""
+    start, stop = boundaries
+    run = Path(tempfile.mkdtemp(prefix=f"{bench_slice.name}-", dir=workdir))
+    env = dict(os.environ)
+    env.update({
+        "DECK_SLIDE_CACHE": "0",
+        "DECK_CHECKPOINTS": str(Path(workdir, "checkpoints")),
+        "DECK_TEX_CACHE": str(run / "tex"),
+        "DECK_TEXT_CACHE": str(run / "text"),
+        "DECK_OUTPUT_FOLDER": str(run / "slides"),
+        "DECK_START_SLIDE": str(start),
+        "DECK_STOP_SLIDE": str(stop),
+    })
+    stats = run / "stats.json"
+    command = [
+        sys.executable, "-m", "render_tools.bench", "--child", str(stats), "--",
+        "render", "--quality", quality, "--progress_bar", "none", "--media_dir", str(run / "media"),
+        str(file), bench_slice.scene,
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, env=env)
+    # wait4() rather than wait() for the peak memory of this very process
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+    frames = _count_frames(run / "slides" / f"{bench_slice.scene}.json")
+    programs = json.loads(stats.read_text())
+    return {
+        "wall_time": round(wall_time, 3),
+        "frames": frames,
+        "fps": round(frames / wall_time, 2),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),  # ru_maxrss is in KiB on Linux
+        "tex_invocations": sum(count for program, count in programs.items() if program in TEX_PROGRAMS),
+    }
+
+
+def run_benchmark(file, slices=SLICES, quality="l", repeat=1):
+    """Render every slice ``repeat`` times and return the best measurements of each."""
+    results = {}
+    # Before the dry runs, so that a missing marker fails at once
+    boundaries = {bench_slice.name: slice_boundaries(file, bench_slice) for bench_slice in slices}
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as workdir:
+        for scene in dict.fromkeys(bench_slice.scene for bench_slice in slices):
+            _run_manim(
+                file, scene, ["--quality", quality, "--progress_bar", "none", "--media_dir", str(Path(workdir, "media"))],
+                DECK_DRY_RUN=1, DECK_SLIDE_CACHE=0, DECK_CHECKPOINTS=Path(workdir, "checkpoints"),
+                DECK_START_SLIDE=0, DECK_STOP_SLIDE=0,
+            )
+            # Markers are placed from the source: a next_slide() in a loop or a helper would shift them
+            summary = json.loads(Path(workdir, "checkpoints", scene, "summary.json").read_text())
+            calls = len(_boundaries(_construct(file, scene)[0]))
+            if summary["boundaries"] != calls:
+                raise RuntimeError(
+                    f"{scene} ran {summary['boundaries']} next_slide() calls but its construct has {calls}; "
+                    "the bench markers cannot be placed"
+                )
+        for bench_slice in slices:
+            runs = [_measure(file, bench_slice, boundaries[bench_slice.name], quality, workdir) for _ in range(repeat)]
+            results[bench_slice.name] = min(runs, key=lambda run: run["wall_time"])
+    return {
+        "quality": quality,
+        "versions": {package: _version(package) for package in ("manim", "manim-slides", "MF_Tools")},
+        "slices": results,
+    }
+
+
+def compare(baseline, results, tolerance):
+    """Return a message for every measurement of ``results`` that regressed from ``baseline``."""
+    regressions = []
+    for name, current in results["slices"].items():
+        previous = baseline["slices"].get(name)
+        if previous is None:
+            continue
+        for key, worse in (
+            ("wall_time", current["wall_time"] > previous["wall_time"] * (1 + tolerance)),
+            ("fps", current["fps"] < previous["fps"] * (1 - tolerance)),
+            ("peak_rss_mb", current["peak_rss_mb"] > previous["peak_rss_mb"] * (1 + tolerance)),
+            ("tex_invocations", current["tex_invocations"] > previous["tex_invocations"]),
+        ):
+            if worse:
+                regressions.append(f"{name}: {key} went from {previous[key]} to {current[key]}")
+    return regressions
+
+
+def _child(stats, manim_args):
+    """Run ``manim`` in this process, counting the programs it starts."""
+    programs = Counter()
+
+    def count_programs(event, args):
+        if event == "subprocess.Popen":
+            command = args[1]
+            program = command.split()[0] if isinstance(command, str) else os.fsdecode(command[0])
+            programs[Path(program).stem] += 1
+
+    sys.addaudithook(count_programs)
+    sys.argv = ["manim", *manim_args]
+    try:
+        runpy.run_module("manim", run_name="__main__", alter_sys=True)
+    finally:
+        Path(stats).write_text(json.dumps(programs))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["--child"]:
+        return _child(argv[1], argv[3:])
+
+    names = [bench_slice.name for bench_slice in SLICES]
+    parser = argparse.ArgumentParser(prog="python -m render_tools.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("slices", nargs="*", metavar="SLICE", help=f"slices to render (default: all of {', '.join(names)})")
+    parser.add_argument("--file", type=Path, default=Path("slides.py"))
+    parser.add_argument("--baseline", type=Path, default=Path("bench/baseline.json"))
+    parser.add_argument("--update", action="store_true", help="write the results to the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression (default: 0.15)")
+    parser.add_argument("--quality", default="l", help="manim quality flag (default: l)")
+    parser.add_argument("--repeat", type=int, default=1, help="renders per slice, the fastest one counts")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.slices) - set(names))
+    if unknown:
+        parser.error(f"unknown slices: {', '.join(unknown)}")
+
+    slices = [bench_slice for bench_slice in SLICES if not args.slices or bench_slice.name in args.slices]
+    results = run_benchmark(args.file, slices, args.quality, args.repeat)
+    print(json.dumps(results, indent=2))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if args.update or baseline is None:
+        if baseline is not None and baseline.get("quality") == results["quality"]:
+            # Slices left out of this run keep their previous measurements
+            results["slices"] = {**baseline["slices"], **results["slices"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if baseline.get("quality") != results["quality"]:
+        print(f"The baseline was rendered at quality {baseline.get('quality')!r}, not {args.quality!r}")
+        return 1
+    regressions = compare(baseline, results, args.tolerance)
+    for regression in regressions:
+        print(regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Build the deck: render every scene at once, then convert the slides to HTML.
+
+Usage::
+
+    python -m render_tools.build [-j JOBS] [--force] [--html _site/index.html] [slides.py [SCENE...]] [-- MANIM_ARGS...]
+
+Every scene of the file, that is every class deriving from ``Slide`` or
+:class:`~render_tools.DeckSlide` there, directly or not, is rendered by its
+own ``manim`` process, all of them at the same time, so that the build takes
+as long as its slowest scene. The processes share the slide cache, the TeX
+and ``Text`` caches and manim's partial movie files, as separate ``manim``
+commands do.
+
+A scene is rendered only if its source changed since the last build: the
+code of its class, the rest of the file outside the scene classes, or the
+local modules the file imports, such as ``doppler`` and ``render_tools``,
+or else the ``manim`` arguments or ``DECK_*`` settings. What each scene was
+built from is kept in ``<output folder>/.build.json``; ``--force`` renders
+every scene. Once the last scene is rendered, ``manim-slides convert``
+writes the HTML presentation.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .options import RenderOptions
+from .parallel import _run_manim
+
+SLIDE_BASES = {"Slide", "ThreeDSlide", "DeckSlide"}
+
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _scene_classes(tree):
+    """Return the top-level class definitions of ``tree`` that are slides, in order."""
+    slides = set(SLIDE_BASES)
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+    found = True
+    while found:
+        found = False
+        for node in classes:
+            if node.name not in slides and any(_base_name(base) in slides for base in node.bases):
+                slides.add(node.name)
+                found = True
+    return [node for node in classes if node.name in slides]
+
+
+def discover_scenes(file):
+    """Return the names of the scenes defined in ``file``, in order, without importing it."""
+    return [node.name for node in _scene_classes(ast.parse(Path(file).read_text()))]
+
+
+def _local_sources(file):
+    """Return the files of the local modules imported by ``file``, directly or not."""
+    root = Path(file).resolve().parent
+    pending = [Path(file).resolve()]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                top = name.split(".")[0]
+                if (root / f"{top}.py").is_file():
+                    pending.append(root / f"{top}.py")
+                elif (root / top / "__init__.py").is_file():
+                    pending.extend(sorted((root / top).rglob("*.py")))
+    seen.discard(Path(file).resolve())
+    return sorted(seen)
+
+
+def scene_fingerprints(file, manim_args=(), environ=None):
+    """Return ``{scene: hash}`` of what each scene of ``file`` is built from."""
+    environ = os.environ if environ is None else environ
+    source = Path(file).read_text()
+    tree = ast.parse(source)
+    classes = _scene_classes(tree)
+    lines = source.splitlines(keepends=True)
+
+    shared = hashlib.sha256()
+    # The file without the scene classes: imports, helpers and components
+    scene_lines = {line for node in classes for line in range(node.lineno - len(node.decorator_list), node.end_lineno + 1)}
+    shared.update("".join(line for number, line in enumerate(lines, 1) if number not in scene_lines).encode())
+    root = Path(file).resolve().parent
+    for path in _local_sources(file):
+        shared.update(f"\0{path.relative_to(root)}\0".encode())
+        shared.update(path.read_bytes())
+    shared.update(json.dumps([list(manim_args), sorted((key, value) for key, value in environ.items()
+                                                        if key.startswith("DECK_"))]).encode())
+
+    fingerprints = {}
+    for node in classes:
+        hasher = shared.copy()
+        hasher.update("".join(lines[node.lineno - len(node.decorator_list) - 1:node.end_lineno]).encode())
+        fingerprints[node.name] = hasher.hexdigest()
+    return fingerprints
+
+
+def build_deck(file, scenes=None, jobs=None, manim_args=(), html=None, force=False, options=None):
+    """Render the changed ``scenes`` of ``file`` concurrently, then convert them to ``html``.
+
+    Returns the names of the scenes that were rendered.
+    """
+    options = options or RenderOptions.from_env()
+    manim_args = list(manim_args)
+    scenes = list(scenes or discover_scenes(file))
+    if not scenes:
+        raise ValueError(f"No scene in {file}")
+    fingerprints = scene_fingerprints(file, manim_args)
+    state_file = options.output_folder / ".build.json"
+    try:
+        state = json.loads(state_file.read_text())
+    except (OSError, ValueError):
+        state = {}
+
+    changed = [
+        scene for scene in scenes
+        if force or state.get(scene) != fingerprints[scene] or not (options.output_folder / f"{scene}.json").exists()
+    ]
+    for scene in scenes:
+        if scene not in changed:
+            print(f"{scene} is unchanged; not rendered", flush=True)
+
+    failed = []
+    if changed:
+        with ThreadPoolExecutor(jobs or len(changed)) as pool:
+            futures = {pool.submit(_run_manim, file, scene, manim_args): scene for scene in changed}
+            for future in as_completed(futures):
+                scene = futures[future]
+                try:
+                    future.result()
+                except subprocess.CalledProcessError:
+                    failed.append(scene)
+                    state.pop(scene, None)
+                else:
+                    state[scene] = fingerprints[scene]
+                # Kept after every scene, so that a failed build only renders what is left
+                state_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = state_file.with_suffix(".tmp")
+                tmp.write_text(json.dumps(state, indent=2))
+                tmp.replace(state_file)
+    if failed:
+        raise RuntimeError(f"Rendering failed for {', '.join(failed)}")
+
+    if html is not None:
+        command = [sys.executable, "-m", "manim_slides", "convert", "--folder", str(options.output_folder), *scenes, str(html)]
+        subprocess.run(command, check=True)
+    return changed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    manim_args = []
+    if "--" in argv:
+        argv, manim_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="python -m render_tools.build", description=__doc__.splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="manim processes (default: one per scene)")
+    parser.add_argument("--force", action="store_true", help="render every scene, changed or not")
+    parser.add_argument("--html", type=Path, default=None, help="convert the slides to this HTML file")
+    parser.add_argument("file", type=Path, nargs="?", default=Path("slides.py"))
+    parser.add_argument("scenes", nargs="*", help="scenes to build (default: every scene of the file)")
+    args = parser.parse_args(argv)
+    try:
+        build_deck(args.file, args.scenes, args.jobs, manim_args, args.html, args.force)
+    except (RuntimeError, ValueError) as error:
+        sys.exit(str(error))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Checkpoint and resume of scene state at ``next_slide()`` boundaries.
+
+At every ``next_slide()`` call the scene graph is written to disk: the data of
+every mobject reachable from the scene, the camera frame and the local
+variables of ``construct``, together with the scene time. Updaters are not
+saved, they are code.
+
+To resume at boundary ``N`` (``DECK_START_SLIDE=N``), ``construct`` still runs
+from the top, so that every local variable and updater exists again, but each
+``play()`` and ``wait()`` before boundary ``N`` returns immediately. At
+boundary ``N`` the saved data is copied back into the live mobjects, which
+are matched by local variable name and then by position in their families.
+Mobjects that no longer exist in the live run are rebuilt from the snapshot.
+
+``DECK_STOP_SLIDE`` ends the scene at a boundary, and ``DECK_DRY_RUN`` records
+the checkpoints of a whole scene without rendering anything; together they let
+:mod:`render_tools.parallel` render a scene in independent pieces.
+"""
+
+import hashlib
+import inspect
+import json
+import numbers
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+from manim import ManimColor, Mobject, Scene, config, logger
+from manim.utils.exceptions import EndSceneEarlyException
+
+from .slide_cache import SourceIndex
+
+_PLAIN_TYPES = (np.ndarray, ManimColor, numbers.Number, str, bytes, bool, type(None))
+
+
+def _is_plain(value):
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    return False
+
+
+def _resolve_class(module, qualname):
+    obj = sys.modules[module]
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Snapshot:
+    """Picklable copy of the data of a set of mobjects."""
+
+    def __init__(self):
+        self.nodes = []
+        self.roots = {}
+        self.mobjects = []
+        self.foreground_mobjects = []
+        self.time = 0.0
+        self.scene_time = None
+        self._indices = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("_indices", None)
+        return state
+
+    def add(self, mobject):
+        """Record ``mobject`` and everything it references, return its node index."""
+        if id(mobject) in self._indices:
+            return self._indices[id(mobject)]
+        index = len(self.nodes)
+        self._indices[id(mobject)] = index
+        self.nodes.append(None)
+
+        attrs, refs = {}, {}
+        for name, value in vars(mobject).items():
+            if name in ("submobjects", "updaters"):
+                continue
+            if isinstance(value, Mobject):
+                refs[name] = self.add(value)
+            elif _is_plain(value):
+                attrs[name] = value
+        self.nodes[index] = {
+            "class": (type(mobject).__module__, type(mobject).__qualname__),
+            "attrs": attrs,
+            "refs": refs,
+            "children": [self.add(submobject) for submobject in mobject.submobjects],
+        }
+        return index
+
+    @classmethod
+    def capture(cls, scene, local_variables):
+        snapshot = cls()
+        frame = getattr(scene.camera, "frame", None)
+        if frame is not None:
+            snapshot.roots["camera.frame"] = snapshot.add(frame)
+        for name, value in local_variables.items():
+            if isinstance(value, Mobject):
+                snapshot.roots[f"local:{name}"] = snapshot.add(value)
+        snapshot.mobjects = [snapshot.add(mobject) for mobject in scene.mobjects]
+        snapshot.foreground_mobjects = [snapshot.add(mobject) for mobject in scene.foreground_mobjects]
+        snapshot.time = scene.renderer.time
+        snapshot.scene_time = getattr(scene, "scene_time", None)
+        return snapshot
+
+    def _match(self, scene, local_variables):
+        live = {}
+
+        def match(index, mobject):
+            node = self.nodes[index]
+            if index in live or node["class"] != (type(mobject).__module__, type(mobject).__qualname__):
+                return
+            live[index] = mobject
+            if len(node["children"]) == len(mobject.submobjects):
+                for child, submobject in zip(node["children"], mobject.submobjects):
+                    match(child, submobject)
+            for name, ref in node["refs"].items():
+                if isinstance(getattr(mobject, name, None), Mobject):
+                    match(ref, getattr(mobject, name))
+
+        for key, index in self.roots.items():
+            if key == "camera.frame":
+                mobject = getattr(scene.camera, "frame", None)
+            else:
+                mobject = local_variables.get(key[len("local:"):])
+            if isinstance(mobject, Mobject):
+                match(index, mobject)
+        return live
+
+    def restore(self, scene, local_variables):
+        """Copy the snapshot back into ``scene`` and the live ``local_variables``."""
+        objects = self._match(scene, local_variables)
+        for index, node in enumerate(self.nodes):
+            if index not in objects:
+                mobject = _resolve_class(*node["class"]).__new__(_resolve_class(*node["class"]))
+                mobject.updaters = []
+                objects[index] = mobject
+        for index, node in enumerate(self.nodes):
+            mobject = objects[index]
+            for name, value in node["attrs"].items():
+                setattr(mobject, name, value)
+            for name, ref in node["refs"].items():
+                setattr(mobject, name, objects[ref])
+            mobject.submobjects = [objects[child] for child in node["children"]]
+
+        scene.mobjects = [objects[index] for index in self.mobjects]
+        scene.foreground_mobjects = [objects[index] for index in self.foreground_mobjects]
+        scene.renderer.time = self.time
+        if getattr(self, "scene_time", None) is not None:
+            scene.scene_time = self.scene_time
+
+
+class CheckpointMixin:
+    """Saves a :class:`Snapshot` at each ``next_slide()`` and can resume from one."""
+
+    def setup(self):
+        super().setup()
+        root = self.render_options.checkpoints
+        self.checkpoint_directory = None if root is None else Path(root) / type(self).__name__
+        self._boundary = 0
+        self._fast_forward = False
+        if self.render_options.dry_run:
+            Scene.next_section(self, skip_animations=True)
+        if self.checkpoint_directory is None:
+            return
+
+        self._checkpoint_source = SourceIndex(type(self))
+        start = self.render_options.start_slide
+        if start:
+            if self._load_checkpoint(start) is not None:
+                logger.info(f"Resuming {type(self).__name__} from slide boundary {start}")
+                self._fast_forward = True
+            else:
+                logger.warning(
+                    f"No up-to-date checkpoint for slide boundary {start} of {type(self).__name__}; "
+                    "rendering the whole scene and recording checkpoints"
+                )
+
+    def play(self, *args, **kwargs):
+        if self._fast_forward:
+            return
+        return super().play(*args, **kwargs)
+
+    def next_slide(self, *args, **kwargs):
+        self._boundary += 1
+        if self.checkpoint_directory is not None:
+            frame = self._construct_frame()
+            local_variables = {} if frame is None else frame.f_locals
+            if self._fast_forward:
+                if self._boundary == self.render_options.start_slide:
+                    self._fast_forward = False
+                    self._load_checkpoint(self._boundary).restore(self, local_variables)
+            else:
+                self._save(local_variables)
+        if self.render_options.dry_run:
+            kwargs["skip_animations"] = True
+        super().next_slide(*args, **kwargs)
+        if self._boundary == self.render_options.stop_slide:
+            raise EndSceneEarlyException()
+
+    def tear_down(self):
+        super().tear_down()
+        if self.render_options.dry_run and self.checkpoint_directory is not None:
+            # On the clock of the boundary times kept in the checkpoints, see render_tools.parallel
+            summary = {"boundaries": self._boundary, "time": getattr(self, "scene_time", self.renderer.time)}
+            self.checkpoint_directory.mkdir(parents=True, exist_ok=True)
+            (self.checkpoint_directory / "summary.json").write_text(json.dumps(summary))
+
+    def _save_slides(self, *args, **kwargs):
+        if not self.render_options.dry_run:
+            super()._save_slides(*args, **kwargs)
+
+    def _construct_frame(self):
+        frame = inspect.currentframe()
+        while frame is not None and frame.f_code is not self._checkpoint_source.code:
+            frame = frame.f_back
+        return frame
+
+    def _checkpoint_path(self, boundary):
+        return self.checkpoint_directory / f"{boundary:04d}.pkl"
+
+    def _fingerprint(self, boundary):
+        source = self._checkpoint_source
+        line = source.boundaries[boundary - 1] if boundary <= len(source.boundaries) else source.last_line
+        code = "".join(source.lines[:line - source.first_line + 1])
+        text = f"{source.context_hash}\0{code}\0{config['frame_rate']}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _save(self, local_variables):
+        snapshot = Snapshot.capture(self, local_variables)
+        path = self._checkpoint_path(self._boundary)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, other processes may be reading the old one
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as file:
+            pickle.dump({"fingerprint": self._fingerprint(self._boundary), "snapshot": snapshot}, file)
+        os.replace(tmp, path)
+
+    def _load_checkpoint(self, boundary):
+        """Return the snapshot saved at ``boundary`` if the code before it is unchanged."""
+        try:
+            with self._checkpoint_path(boundary).open("rb") as file:
+                checkpoint = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError):
+            return None
+        if checkpoint["fingerprint"] != self._fingerprint(boundary):
+            return None
+        return checkpoint["snapshot"]
@@ -0,0 +1,74 @@
+"""Absolute scene time, for updaters that are functions of time.
+
+An updater that accumulates ``dt`` (``tracker.increment_value(dt)``,
+``m.scale(1 + speed * dt)``) depends on the frame rate, on the order in which
+updaters run and on every frame before it. :class:`ClockMixin` keeps
+``scene_time``, the time of the frame being computed in seconds since the
+start of ``construct``: each ``play()`` starts where the previous one ended,
+whatever the frame rate, and advances by exactly its run time. Updaters that
+compute everything from ``scene_time`` (or from a :class:`Stopwatch`) give
+the same frame for the same time whatever was computed before it, at any
+frame rate.
+"""
+
+from manim import Mobject
+
+
+class Stopwatch(Mobject):
+    """Seconds of scene time since :meth:`start` was called, ``0`` before.
+
+    It is a mobject, never drawn, so that checkpoints save and restore it
+    like any other local variable of ``construct``.
+    """
+
+    def __init__(self, scene, **kwargs):
+        super().__init__(**kwargs)
+        self.scene = scene
+        self.started_at = None
+
+    def __deepcopy__(self, memo):
+        memo[id(self.scene)] = self.scene  # Copies keep reading the same scene
+        return super().__deepcopy__(memo)
+
+    def start(self):
+        self.started_at = self.scene.scene_time
+        return self
+
+    def elapsed(self, t=None):
+        """Return the time elapsed at scene time ``t``, by default now."""
+        if self.started_at is None:
+            return 0.0
+        return (self.scene.scene_time if t is None else t) - self.started_at
+
+    def update_key(self):
+        """What updaters reading this stopwatch see, see :mod:`render_tools.scheduler`."""
+        return self.elapsed()
+
+
+class ClockMixin:
+    """Keeps ``scene_time``, the absolute time of the frame being computed."""
+
+    def setup(self):
+        super().setup()
+        self.scene_time = 0.0
+        self._play_start = 0.0
+
+    def now(self):
+        return self.scene_time
+
+    def stopwatch(self):
+        """Return a :class:`Stopwatch` of this scene, not started yet."""
+        return Stopwatch(self)
+
+    def update_to_time(self, t):
+        self.scene_time = self._play_start + t
+        super().update_to_time(t)
+
+    def play(self, *args, **kwargs):
+        self._play_start = self.scene_time
+        plays = self.renderer.num_plays
+        result = super().play(*args, **kwargs)
+        # Nothing is played while resuming from a checkpoint
+        if self.renderer.num_plays > plays:
+            self.scene_time = self._play_start + self.duration
+        return result
@@ -0,0 +1,111 @@
+"""Culling of what the camera would draw outside its frame or fully transparent.
+
+manim's Cairo camera builds the path of every mobject on screen and strokes
+or fills it, even when it lies outside the camera frame, as the dots and
+titles do while the camera follows a moving dot, or has nothing left to
+show, like a faded wavefront. While :func:`install_culling` is in effect, a
+test comes before anything is drawn:
+
+- mobjects whose fill and stroke are fully transparent, or whose bounding
+  box, widened by their stroke, does not meet the camera frame, are left
+  out;
+- stroke-only paths that cross the edge of the frame, such as wavefronts
+  grown past it, are drawn with their off-screen curves left out.
+
+Every camera is culled against its own frame, including the cameras of
+:mod:`render_tools.layers` and :mod:`render_tools.resolutions`.
+"""
+
+import numpy as np
+from manim import VMobject, config
+from manim.camera.camera import Camera
+
+from .patches import Patch, PatchesMixin
+
+_original_get_mobjects_to_display = Camera.get_mobjects_to_display
+_original_set_cairo_context_path = Camera.set_cairo_context_path
+
+
+def _stroke_margin(mobject, camera):
+    """Return how far, in frame units, the strokes of ``mobject`` may reach past its points."""
+    if not isinstance(mobject, VMobject):
+        return 0.0
+    width = max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+    # Generous: line widths are scaled with the zoom of the camera frame
+    zoom = max(config.frame_width / camera.frame_width, camera.frame_width / config.frame_width)
+    return 2 * width * camera.cairo_line_width_multiple * zoom
+
+
+def _view(camera, margin=0.0):
+    center = camera.frame_center
+    half_width = camera.frame_width / 2 + margin
+    half_height = camera.frame_height / 2 + margin
+    return center[0] - half_width, center[0] + half_width, center[1] - half_height, center[1] + half_height
+
+
+def _is_transparent(mobject):
+    if not isinstance(mobject, VMobject):
+        return False
+    for background in (False, True):
+        if mobject.get_stroke_width(background=background) > 0 and np.any(mobject.get_stroke_opacities(background=background) > 0):
+            return False
+    return not np.any(mobject.get_fill_opacities() > 0)
+
+
+def is_visible(mobject, camera):
+    """Return whether ``camera`` would draw anything of ``mobject`` itself, not its submobjects."""
+    points = mobject.points
+    if len(points) == 0 or _is_transparent(mobject):
+        return False
+    left, right, bottom, top = _view(camera, _stroke_margin(mobject, camera))
+    low = points[:, :2].min(axis=0)
+    high = points[:, :2].max(axis=0)
+    return high[0] >= left and low[0] <= right and high[1] >= bottom and low[1] <= top
+
+
+def _get_visible_mobjects_to_display(self, *args, **kwargs):
+    return [mobject for mobject in _original_get_mobjects_to_display(self, *args, **kwargs) if is_visible(mobject, self)]
+
+
+def _set_clipped_cairo_context_path(self, ctx, vmobject):
+    points = self.transform_points_pre_display(vmobject, vmobject.points)
+    curves = len(points) // 4
+    # Filled paths must stay closed, and short ones are not worth it
+    if curves < 4 or np.any(vmobject.get_fill_opacities() > 0):
+        return _original_set_cairo_context_path(self, ctx, vmobject)
+
+    left, right, bottom, top = _view(self, _stroke_margin(vmobject, self))
+    quads = points[:curves * 4].reshape(curves, 4, 3)
+    low = quads[..., :2].min(axis=1)
+    high = quads[..., :2].max(axis=1)
+    visible = (high[:, 0] >= left) & (low[:, 0] <= right) & (high[:, 1] >= bottom) & (low[:, 1] <= top)
+    if visible.all():
+        return _original_set_cairo_context_path(self, ctx, vmobject)
+
+    ctx.new_path()
+    end = None
+    for start, handle1, handle2, finish in quads[visible]:
+        if end is None or not np.allclose(start[:2], end[:2]):
+            ctx.new_sub_path()
+            ctx.move_to(*start[:2])
+        ctx.curve_to(*handle1[:2], *handle2[:2], *finish[:2])
+        end = finish
+    return self
+
+
+def install_culling():
+    """Cull what every Cairo camera draws until the returned :class:`Patch` is closed."""
+    return Patch(
+        Camera,
+        get_mobjects_to_display=_get_visible_mobjects_to_display,
+        set_cairo_context_path=_set_clipped_cairo_context_path,
+    )
+
+
+class CullingMixin(PatchesMixin):
+    """Culls what the cameras draw when ``render_options.culling`` is set."""
+
+    def setup(self):
+        super().setup()
+        if self.render_options.culling:
+            self.patch(install_culling())
@@ -0,0 +1,235 @@
+"""Render server keeping manim, the deck's modules and fonts loaded between renders.
+
+Usage::
+
+    python -m render_tools.daemon serve [--socket PATH]
+    python -m render_tools.daemon render [--socket PATH] [--start N] [--stop N] slides.py DopplerEffect [-- MANIM_ARGS...]
+    python -m render_tools.daemon stop [--socket PATH]
+
+``manim slides.py DopplerEffect`` spends seconds importing manim, MF_Tools
+and their dependencies and looking up fonts before it draws anything. The
+server does this once, then forks a child for every render job, which runs
+the ``manim render`` command line in a process where all of it is loaded
+already. The child's output is sent back to the ``render`` command.
+
+Before each job the modules imported from the deck's directory, such as
+``doppler`` and ``render_tools``, are imported again if one of their files
+changed, and only then; ``slides.py`` itself is run again by ``manim`` in
+every job. The server never renders anything itself, so the patches that
+the mixins install (see :mod:`render_tools.culling`) stay in the
+children. Which slides are drawn again is left to the slide cache and the
+checkpoints: ``--start`` and ``--stop`` set ``DECK_START_SLIDE`` and
+``DECK_STOP_SLIDE``, and the ``DECK_*`` variables of the ``render`` command
+apply to its job.
+
+Jobs are run one at a time.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+import traceback
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+DEFAULT_SOCKET = ".deck-daemon.sock"
+
+
+def _local_modules(root):
+    """Return ``{name: (path, mtime)}`` of the loaded modules whose files are under ``root``."""
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path is None:
+            continue
+        path = Path(path).resolve()
+        if name != "__main__" and path.is_relative_to(root):
+            try:
+                modules[name] = (path, path.stat().st_mtime_ns)
+            except OSError:
+                modules[name] = (path, None)
+    return modules
+
+
+class RenderServer:
+    """Keeps the imports warm and runs render jobs in forked children."""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.loaded = {}
+        self.warm_files = {}
+
+    def warm_up(self):
+        import manim  # noqa: F401
+        import manim_slides  # noqa: F401
+
+        try:
+            import MF_Tools  # noqa: F401
+        except ImportError:
+            pass
+        try:
+            import manimpango
+
+            # Font discovery, kept by the forked children
+            manimpango.list_fonts()
+        except ImportError:
+            pass
+        importlib.import_module("render_tools.scene")
+        self.loaded = _local_modules(self.root)
+
+    def refresh(self, file):
+        """Import the local modules again if one changed, and those of ``file``."""
+        stale = [
+            name for name, (path, mtime) in self.loaded.items()
+            if not path.exists() or path.stat().st_mtime_ns != mtime
+        ]
+        if stale:
+            # Modules import one another: drop them all, then import them afresh
+            for name in self.loaded:
+                sys.modules.pop(name, None)
+            importlib.invalidate_caches()
+            importlib.import_module("render_tools.scene")
+            self.warm_files.clear()
+        file = Path(file).resolve()
+        mtime = file.stat().st_mtime_ns
+        if self.warm_files.get(file) != mtime:
+            # Run the deck once here so that what it imports is loaded for the children
+            spec = importlib.util.spec_from_file_location(f"_deck_{file.stem}", file)
+            module = importlib.util.module_from_spec(spec)
+            sys.path.insert(0, str(file.parent))
+            try:
+                spec.loader.exec_module(module)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                sys.path.remove(str(file.parent))
+            self.warm_files[file] = mtime
+        self.loaded = _local_modules(self.root)
+        return stale
+
+    def run(self, job, connection):
+        """Render ``job`` in a forked child, sending its output to ``connection``; return its exit status."""
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.dup2(write_end, 1)
+            os.dup2(write_end, 2)
+            status = 1
+            try:
+                os.chdir(job["cwd"])
+                for key in [key for key in os.environ if key.startswith("DECK_")]:
+                    del os.environ[key]
+                os.environ.update(job["environ"])
+                sys.path.insert(0, str(Path(job["file"]).resolve().parent))
+                from manim.__main__ import main as manim_main
+
+                manim_main(["render", *job["manim_args"], job["file"], *job["scenes"]], standalone_mode=False)
+                status = 0
+            except SystemExit as error:
+                status = error.code if isinstance(error.code, int) else 1
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+
+        os.close(write_end)
+        with os.fdopen(read_end, "rb", buffering=0) as output:
+            while chunk := output.read(65536):
+                connection.send(("output", chunk))
+        return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+    def serve(self, address):
+        address = str(address)
+        self.warm_up()
+        if os.path.exists(address):
+            os.unlink(address)
+        old_umask = os.umask(0o077)
+        try:
+            listener = Listener(address, family="AF_UNIX")
+        finally:
+            os.umask(old_umask)
+        print(f"Render server listening on {address}", flush=True)
+        try:
+            with listener:
+                while True:
+                    with listener.accept() as connection:
+                        job = connection.recv()
+                        if job.get("command") == "stop":
+                            connection.send(("exit", 0))
+                            return
+                        try:
+                            stale = self.refresh(job["file"])
+                            if stale:
+                                connection.send(("output", f"Imported again: {', '.join(sorted(stale))}\n".encode()))
+                            status = self.run(job, connection)
+                        except Exception:
+                            connection.send(("output", traceback.format_exc().encode()))
+                            status = 1
+                        connection.send(("exit", status))
+        finally:
+            if os.path.exists(address):
+                os.unlink(address)
+
+
+def submit(job, address=DEFAULT_SOCKET):
+    """Send ``job`` to the server at ``address``, copy its output to stdout and return its exit status."""
+    with Client(str(address), family="AF_UNIX") as connection:
+        connection.send(job)
+        while True:
+            kind, value = connection.recv()
+            if kind == "exit":
+                return value
+            sys.stdout.buffer.write(value)
+            sys.stdout.buffer.flush()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    manim_args = []
+    if "--" in argv:
+        argv, manim_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="python -m render_tools.daemon", description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", type=Path, default=Path(DEFAULT_SOCKET), help=f"server socket (default: {DEFAULT_SOCKET})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start the server")
+    commands.add_parser("stop", help="stop the server")
+    render = commands.add_parser("render", help="render scenes with the server")
+    render.add_argument("--start", type=int, default=None, help="first slide boundary (DECK_START_SLIDE)")
+    render.add_argument("--stop", type=int, default=None, help="last slide boundary (DECK_STOP_SLIDE)")
+    render.add_argument("file", type=Path)
+    render.add_argument("scenes", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        RenderServer(Path.cwd()).serve(args.socket)
+        return
+    if args.command == "stop":
+        sys.exit(submit({"command": "stop"}, args.socket))
+
+    environ = {key: value for key, value in os.environ.items() if key.startswith("DECK_")}
+    if args.start is not None:
+        environ["DECK_START_SLIDE"] = str(args.start)
+    if args.stop is not None:
+        environ["DECK_STOP_SLIDE"] = str(args.stop)
+    job = {
+        "command": "render",
+        "cwd": str(Path.cwd()),
+        "file": str(args.file),
+        "scenes": args.scenes,
+        "manim_args": manim_args,
+        "environ": environ,
+    }
+    try:
+        status = submit(job, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        parser.error(f"no render server on {args.socket}; start one with `python -m render_tools.daemon serve`")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
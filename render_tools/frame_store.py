@@ -0,0 +1,300 @@
+"""Raw frames of every animation, kept on disk to encode the slides again.
+
+Usage::
+
+    python -m render_tools.frame_store [--output DIR] [--codec libx264] [--crf 23] [--resolution WxH] SCENE... [-- FFMPEG_ARGS...]
+
+With ``DECK_FRAME_STORE=<directory>`` every frame handed to the movie writer
+is also written, as raw RGBA, to ``<directory>/<Scene>/frames/<name>/``,
+where ``<name>`` is the name of the partial movie file it belongs to. Frames
+are appended to chunk files of about 256 MiB that readers map into memory,
+and a frame written several times in a row (see :mod:`render_tools.frames`
+and :mod:`render_tools.preview`) is stored once with a repeat count. Every
+slide written by ``manim-slides`` is listed in ``<directory>/<Scene>/slides/``
+with the partial movie files it is made of.
+
+The command above then encodes the slides of ``slides/<Scene>.json`` again,
+and their reversed versions, by streaming the stored frames straight from
+the mapped chunks to ffmpeg: ``construct`` is not run again. The new slides
+go to ``--output``, ready for ``manim-slides convert --folder``. A slide
+whose frames are not in the store is encoded from its current video instead.
+
+Partial movie files are named after manim's hash of the animation, so an
+animation that manim or the slide cache does not render again keeps its
+stored frames. While the store is on, an animation whose frames are missing
+from it is rendered even if its movie is cached.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from manim import config, logger
+from manim.constants import RendererType
+from manim_slides.config import PresentationConfig
+from manim_slides.utils import merge_basenames
+
+
+class FrameEntry:
+    """Frames of one partial movie file, read from memory-mapped chunks."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / FrameStore.meta_name).read_text())
+        self.shape = tuple(meta["shape"])
+        self.fps = meta["fps"]
+        self.chunk_frames = meta["chunk_frames"]
+        self.repeats = meta["repeats"]
+
+    def __len__(self):
+        return sum(self.repeats)
+
+    def chunk(self, index):
+        path = self.directory / f"chunk-{index:05d}.raw"
+        return np.memmap(path, dtype=np.uint8, mode="r").reshape(-1, *self.shape)
+
+    def frames(self, reverse=False):
+        """Yield ``(frame, repeat)`` pairs; each frame is a view of a mapped chunk."""
+        count = len(self.repeats)
+        chunks = range(math.ceil(count / self.chunk_frames))
+        for index in reversed(chunks) if reverse else chunks:
+            chunk = self.chunk(index)
+            first = index * self.chunk_frames
+            offsets = range(len(chunk))
+            for offset in reversed(offsets) if reverse else offsets:
+                yield chunk[offset], self.repeats[first + offset]
+
+
+class FrameWriter:
+    """Appends the frames of one partial movie file to chunk files."""
+
+    def __init__(self, directory, shape, fps, chunk_bytes):
+        self.directory = directory
+        self.tmp = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir(parents=True)
+        self.shape = tuple(shape)
+        self.fps = fps
+        self.chunk_frames = max(chunk_bytes // math.prod(self.shape), 1)
+        self.repeats = []
+        self.file = None
+        self.last_key = None
+
+    def write(self, frame, repeat=1, key=None):
+        # The key of the previous frame again is that frame written again, see render_tools.frames
+        if key is not None and key == self.last_key:
+            self.repeats[-1] += repeat
+            return
+        if len(self.repeats) % self.chunk_frames == 0:
+            if self.file is not None:
+                self.file.close()
+            index = len(self.repeats) // self.chunk_frames
+            self.file = (self.tmp / f"chunk-{index:05d}.raw").open("wb")
+        self.file.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        self.repeats.append(repeat)
+        self.last_key = key
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        meta = {"shape": self.shape, "fps": self.fps, "chunk_frames": self.chunk_frames, "repeats": self.repeats}
+        (self.tmp / FrameStore.meta_name).write_text(json.dumps(meta))
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.tmp.rename(self.directory)
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+class FrameStore:
+    """On-disk store of the raw frames of one scene, by partial movie file."""
+
+    meta_name = "meta.json"
+    chunk_bytes = 256 * 2**20
+
+    def __init__(self, root, scene_name):
+        self.directory = Path(root) / scene_name
+
+    def has(self, name):
+        return (self.directory / "frames" / name / self.meta_name).exists()
+
+    def writer(self, name, shape, fps):
+        return FrameWriter(self.directory / "frames" / name, shape, fps, self.chunk_bytes)
+
+    def add_slide(self, name, partial_names):
+        path = self.directory / "slides" / f"{name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(partial_names))
+
+    def slide(self, name):
+        """Return the frame entries of the slide ``name``, or ``None`` if any is missing."""
+        try:
+            partial_names = json.loads((self.directory / "slides" / f"{name}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        if not all(self.has(partial_name) for partial_name in partial_names):
+            return None
+        return [FrameEntry(self.directory / "frames" / partial_name) for partial_name in partial_names]
+
+
+class FrameStoreMixin:
+    """Keeps the raw frames of the scene when ``render_options.frame_store`` is set.
+
+    Must come before :class:`~render_tools.SlideCacheMixin`, whose cached
+    slides it checks.
+    """
+
+    def setup(self):
+        root = self.render_options.frame_store
+        if root is not None and (config.renderer != RendererType.CAIRO or config.disable_caching):
+            logger.warning("The frame store needs the Cairo renderer and manim's animation hashes; it is off")
+            root = None
+        # Read by the slide cache as soon as it is set up
+        self.frame_store = None if root is None else FrameStore(root, type(self).__name__)
+        self._frame_writer = None
+        super().setup()
+        if self.frame_store is None:
+            return
+
+        renderer = self.renderer
+        file_writer = renderer.file_writer
+        write_frame = file_writer.write_frame
+        is_already_cached = file_writer.is_already_cached
+
+        def write_and_store(frame, *, repeat=1):
+            if self._frame_writer is None:
+                name = Path(file_writer.partial_movie_files[renderer.num_plays]).stem
+                self._frame_writer = self.frame_store.writer(name, frame.shape, config.frame_rate)
+            self._frame_writer.write(frame, repeat, getattr(self, "frame_key", None))
+            return write_frame(frame, repeat=repeat)
+
+        def is_cached_and_stored(hash_invocation):
+            return is_already_cached(hash_invocation) and self.frame_store.has(hash_invocation)
+
+        file_writer.write_frame = write_and_store
+        file_writer.is_already_cached = is_cached_and_stored
+
+    def play(self, *args, **kwargs):
+        try:
+            result = super().play(*args, **kwargs)
+        except BaseException:
+            if self._frame_writer is not None:
+                self._frame_writer.abort()
+            self._frame_writer = None
+            raise
+        if self._frame_writer is not None:
+            self._frame_writer.close()
+            self._frame_writer = None
+        return result
+
+    def _can_reuse(self, files):
+        if self.frame_store is not None and not all(self.frame_store.has(Path(file).stem) for file in files):
+            return False
+        return super()._can_reuse(files)
+
+    def _save_slides(self, *args, **kwargs):
+        super()._save_slides(*args, **kwargs)
+        if self.frame_store is None:
+            return
+        files = self._partial_movie_files
+        for slide in self._slides:
+            slide_files = files[slide.slides_slice]
+            self.frame_store.add_slide(merge_basenames(slide_files).stem, [file.stem for file in slide_files])
+
+
+def encode_slide(entries, source, output, codec="libx264", crf=23, resolution=None, ffmpeg_args=(), reverse=False):
+    """Encode the frames of ``entries`` to ``output``, or ``source`` again if ``entries`` is ``None``."""
+    command = ["ffmpeg", "-y", "-loglevel", "error"]
+    if entries is None:
+        command += ["-i", str(source)]
+    else:
+        height, width = entries[0].shape[:2]
+        command += ["-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(entries[0].fps), "-i", "-"]
+    if resolution is not None:
+        command += ["-vf", f"scale={resolution[0]}:{resolution[1]}"]
+    command += ["-c:v", codec, "-crf", str(crf), "-pix_fmt", "yuv420p", *ffmpeg_args, str(output)]
+
+    process = subprocess.Popen(command, stdin=None if entries is None else subprocess.PIPE)
+    if entries is not None:
+        try:
+            for entry in reversed(entries) if reverse else entries:
+                for frame, repeat in entry.frames(reverse):
+                    for _ in range(repeat):
+                        process.stdin.write(frame.data)
+        finally:
+            process.stdin.close()
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+
+def encode_presentation(scene, store, slides_folder, output_folder, jobs=None, resolution=None, **encode_options):
+    """Encode the slides of ``scene`` again from ``store`` into ``output_folder``."""
+    presentation = PresentationConfig.from_file(Path(slides_folder) / f"{scene}.json")
+    store = FrameStore(store, scene)
+    files_folder = Path(output_folder) / "files" / scene
+    files_folder.mkdir(parents=True, exist_ok=True)
+
+    work = []
+    for slide in presentation.slides:
+        entries = store.slide(slide.file.stem)
+        if entries is None:
+            logger.warning(f"Frames of {slide.file.name} are not in the store; encoding it from its video")
+        file = files_folder / slide.file.name
+        rev_file = files_folder / slide.rev_file.name
+        work += [(entries, slide.file, file, False), (entries, slide.rev_file, rev_file, True)]
+        slide.file, slide.rev_file = file, rev_file
+
+    with ThreadPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        list(pool.map(
+            lambda item: encode_slide(
+                item[0], item[1], item[2], resolution=resolution, reverse=item[3] and item[0] is not None, **encode_options
+            ),
+            work,
+        ))
+    if resolution is not None:
+        presentation.resolution = resolution
+    presentation.to_file(Path(output_folder) / f"{scene}.json")
+
+
+def _resolution(value):
+    width, _, height = value.partition("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    ffmpeg_args = []
+    if "--" in argv:
+        argv, ffmpeg_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="python -m render_tools.frame_store", description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument("--store", type=Path, default=None, help="frame store (default: DECK_FRAME_STORE)")
+    parser.add_argument("--slides", type=Path, default=Path("slides"), help="slides to encode again (default: slides)")
+    parser.add_argument("--output", type=Path, default=Path("slides-encoded"), help="where to write the new slides")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="ffmpeg processes (default: CPU count)")
+    parser.add_argument("--codec", default="libx264")
+    parser.add_argument("--crf", type=int, default=23)
+    parser.add_argument("--resolution", type=_resolution, default=None, metavar="WxH")
+    args = parser.parse_args(argv)
+
+    store = args.store or os.environ.get("DECK_FRAME_STORE")
+    if not store:
+        parser.error("no frame store; pass --store or set DECK_FRAME_STORE")
+    for scene in args.scenes:
+        encode_presentation(
+            scene, store, args.slides, args.output, args.jobs, args.resolution,
+            codec=args.codec, crf=args.crf, ffmpeg_args=ffmpeg_args,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Reuse of the previous frame when nothing on screen changed.
+
+manim only skips drawing for a ``wait()`` without any updater. As soon as one
+updater is attached, say a speed readout refreshing itself or a wave field
+whose emission has ended, every frame of the wait is rasterized again, even
+though it is pixel for pixel the previous one. Here the points and styles of
+everything on screen, and the camera frame, are hashed before each frame;
+when the hash matches the previous frame's, that frame is handed to the
+movie writer again instead of being drawn. While a frame is written, its
+hash is ``scene.frame_key``, so that what else stores or draws the frame
+can tell it is the previous one again.
+"""
+
+import hashlib
+
+import numpy as np
+from manim import config
+from manim.constants import RendererType
+
+from .state import hash_appearance
+
+
+class FrameReuseMixin:
+    """Writes the previous frame again instead of drawing an identical one."""
+
+    def setup(self):
+        super().setup()
+        self._last_frame = None
+        self._last_frame_key = None
+        # Key of the frame being written, read by the frame store and the extra resolutions
+        self.frame_key = None
+        if not self.render_options.reuse_frames or config.renderer != RendererType.CAIRO:
+            return
+        renderer = self.renderer
+        render = renderer.render
+
+        def render_or_reuse(scene, time, moving_mobjects):
+            if renderer.skip_animations:
+                return render(scene, time, moving_mobjects)
+            key = self.frame_key = self._frame_key()
+            if key == self._last_frame_key:
+                renderer.add_frame(self._last_frame)
+                return
+            render(scene, time, moving_mobjects)
+            self._last_frame = renderer.get_frame()
+            self._last_frame_key = key
+
+        renderer.render = render_or_reuse
+
+    def _frame_key(self):
+        camera = self.renderer.camera
+        mobjects = [*self.mobjects, *self.foreground_mobjects]
+        view = np.array([*camera.frame_center, camera.frame_width, camera.frame_height])
+        hasher = hashlib.sha256(hash_appearance(mobjects).encode())
+        hasher.update(np.round(view, 9).tobytes())
+        hasher.update(f"{camera.pixel_array.shape}".encode())
+        return hasher.hexdigest()
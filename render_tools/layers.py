@@ -0,0 +1,182 @@
+"""Cached raster layers for the mobjects that do not move during a play.
+
+manim's Cairo renderer rasterizes the mobjects that come before the first
+moving one once per ``play()``, and everything from there on at every frame,
+so a title added after a moving dot is drawn again for every frame of a
+25 second ``wait()``. Here the mobjects are split, in drawing order, into
+runs of static and moving ones:
+
+- the static run at the bottom is drawn once over the background;
+- every other static run is drawn once into a transparent layer, cropped to
+  what it covers, and composited over the moving mobjects beneath it.
+
+Layers are kept across plays, keyed by the content of their mobjects and the
+camera frame, so they are drawn again only when one of those changes. While
+the camera frame moves, every mobject moves on screen and manim's own
+rendering is used.
+"""
+
+from collections import OrderedDict
+from itertools import groupby
+
+import numpy as np
+from manim import VMobject, config
+from manim.animation.composition import AnimationGroup
+from manim.constants import RendererType
+
+from .state import hash_mobjects
+
+
+def _animated_mobjects(animations):
+    mobjects = []
+    for animation in animations:
+        mobjects.extend(animation.mobject.get_family())
+        if isinstance(animation, AnimationGroup):
+            mobjects.extend(_animated_mobjects(animation.animations))
+    return mobjects
+
+
+def _composite(pixel_array, layer):
+    """Draw a premultiplied ``(slices, pixels)`` layer over ``pixel_array`` in place."""
+    rows, columns, pixels = layer
+    region = pixel_array[rows, columns]
+    alpha = pixels[..., 3:4].astype(np.uint16)
+    region[...] = pixels + (region * (255 - alpha) + 127) // 255
+
+
+class LayerPlan:
+    """How to draw the frames of one ``play()``: a background, then moving runs and static layers."""
+
+    def __init__(self, background, steps, frame_key, mobjects):
+        self.background = background
+        self.steps = steps
+        self.frame_key = frame_key
+        self.mobjects = mobjects
+        self.moving_mobjects = [mobject for run, _ in steps for mobject in run]
+
+
+class LayerCacheMixin:
+    """Draws static mobjects once into cached layers instead of at every frame."""
+
+    layer_cache_size = 16
+
+    def setup(self):
+        super().setup()
+        self._layer_plan = None
+        self._layers = OrderedDict()
+        self._layering = self.render_options.layer_cache and config.renderer == RendererType.CAIRO
+        if self._layering:
+            update_frame = self.renderer.update_frame
+
+            def update_frame_with_layers(scene, mobjects=None, *args, **kwargs):
+                plan = self._layer_plan
+                if plan is None or mobjects is not plan.moving_mobjects:
+                    return update_frame(scene, mobjects, *args, **kwargs)
+                if self.renderer.skip_animations and not kwargs.get("ignore_skipping", True):
+                    return
+                self._draw_frame(plan)
+
+            self.renderer.update_frame = update_frame_with_layers
+
+    def begin_animations(self):
+        super().begin_animations()
+        self._layer_plan = None
+        if not self._layering or self.renderer.skip_animations:
+            return
+        plan = self._plan_layers()
+        if plan is not None:
+            self._layer_plan = plan
+            self.moving_mobjects = plan.moving_mobjects
+            self.static_mobjects = []
+
+    def _frame_key(self):
+        camera = self.renderer.camera
+        return (tuple(np.round(camera.frame_center, 9)), round(camera.frame_width, 9), round(camera.frame_height, 9))
+
+    def _plan_layers(self):
+        camera = self.renderer.camera
+        animated = {id(mobject) for mobject in _animated_mobjects(self.animations)}
+        for indicator in getattr(camera, "get_mobjects_indicating_movement", list)():
+            if id(indicator) in animated or any(m.updaters for m in indicator.get_family()):
+                return None
+
+        def is_moving(mobject):
+            return (
+                id(mobject) in animated
+                or bool(mobject.updaters)
+                or mobject in self.foreground_mobjects
+                or any(is_moving(submobject) for submobject in mobject.submobjects)
+            )
+
+        mobjects = [*self.mobjects, *[m for m in self.foreground_mobjects if m not in self.mobjects]]
+        if camera.use_z_index and any(member.z_index for mobject in mobjects for member in mobject.get_family()):
+            return None
+
+        def is_static(mobject):
+            # Only vectorized mobjects are drawn premultiplied, so only they can be layered
+            return not is_moving(mobject) and all(
+                isinstance(member, VMobject) or not member.has_points() for member in mobject.get_family()
+            )
+
+        runs = [(static, list(run)) for static, run in groupby(mobjects, is_static)]
+        if not any(static for static, _ in runs):
+            return None
+
+        frame_key = self._frame_key()
+        background = None
+        if runs and runs[0][0]:
+            background = self._layer("background", runs.pop(0)[1], frame_key)
+        steps = []
+        for index in range(0, len(runs), 2):
+            moving_run = runs[index][1]
+            overlay = None
+            if index + 1 < len(runs):
+                overlay = self._layer("overlay", runs[index + 1][1], frame_key)
+            steps.append((moving_run, overlay))
+        return LayerPlan(background, steps, frame_key, mobjects)
+
+    def _layer(self, kind, mobjects, frame_key):
+        camera = self.renderer.camera
+        key = (kind, hash_mobjects(mobjects), frame_key, camera.pixel_array.shape)
+        if key in self._layers:
+            self._layers.move_to_end(key)
+            return self._layers[key]
+
+        if kind == "background":
+            camera.reset()
+        else:
+            camera.set_pixel_array(np.zeros_like(camera.pixel_array))
+        camera.capture_mobjects(mobjects)
+        pixels = camera.pixel_array.copy()
+        if kind == "background":
+            layer = pixels
+        else:
+            covered = np.nonzero(pixels[..., 3])
+            if len(covered[0]) == 0:
+                layer = None
+            else:
+                rows = slice(covered[0].min(), covered[0].max() + 1)
+                columns = slice(covered[1].min(), covered[1].max() + 1)
+                layer = (rows, columns, pixels[rows, columns].copy())
+
+        self._layers[key] = layer
+        if len(self._layers) > self.layer_cache_size:
+            self._layers.popitem(last=False)
+        return layer
+
+    def _draw_frame(self, plan):
+        camera = self.renderer.camera
+        if self._frame_key() != plan.frame_key:
+            # The camera frame was moved by an updater that runs outside the scene
+            camera.reset()
+            camera.capture_mobjects(plan.mobjects)
+            return
+        if plan.background is None:
+            camera.reset()
+        else:
+            camera.set_frame_to_background(plan.background)
+        for moving_run, overlay in plan.steps:
+            if moving_run:
+                camera.capture_mobjects(moving_run)
+            if overlay is not None:
+                _composite(camera.pixel_array, overlay)
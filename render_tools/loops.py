@@ -0,0 +1,184 @@
+"""Render a single cycle of a looping slide.
+
+A looping slide is usually one long ``wait()`` that lets updaters run, such as
+a stationary source emitting wavefronts for 25 seconds, while everything it
+shows repeats every ``wave_interval`` once the first wavefronts have spread.
+:meth:`LoopMixin.wait_loop` stands for that ``wait()``:
+
+1. the updaters are stepped through the whole wait, frame by frame, without
+   drawing anything, and a digest of what each frame would show is recorded;
+2. :func:`find_period` looks for the frame ``start`` from which the frames
+   repeat with the shortest ``period``;
+3. the scene is rewound and only the ``start`` frames before the cycle are
+   rendered, as an ``auto_next`` slide, followed by one cycle of ``period``
+   frames, as the looping slide;
+4. the updaters are stepped through the rest of the wait, again without
+   drawing, so that the next slides start from the same state as after the
+   full ``wait()``.
+
+When the frames never repeat, the full ``wait()`` is rendered.
+
+With the slide cache on, the cycle found is kept in its directory, under a
+key made of the key of the slide segment (which covers the code of the
+segment and the state at its start), the animations played since and the
+duration of the wait. The next renders, including those skipping the slide,
+use it instead of stepping through the wait again, and play the same one or
+two animations as the render that found it.
+
+The scene is rewound with a :class:`~render_tools.checkpoint.Snapshot`, so
+updaters must keep their state in mobjects, not in variables of a closure.
+``scene_time`` ends where the full ``wait()`` would have left it, while
+manim's ``renderer.time``, which places sounds and subcaptions in the movie,
+only counts what was rendered.
+"""
+
+import hashlib
+import json
+import pickle
+
+import numpy as np
+from manim import config, logger
+from manim_slides import Slide
+
+from .checkpoint import Snapshot
+from .state import hash_appearance
+
+
+def find_period(digests, repeats=3):
+    """Return the ``(start, period)`` of ``digests`` with the least frames to render, or ``None``.
+
+    From ``start`` on, the frames must repeat with ``period`` at least
+    ``repeats`` times in a row.
+    """
+    ids = {}
+    frames = np.array([ids.setdefault(digest, len(ids)) for digest in digests])
+    best = None
+    for period in range(1, len(frames) // repeats + 1):
+        if best is not None and period >= sum(best):
+            break
+        window = (repeats - 1) * period
+        # matches[k] counts the frames before k that equal the frame one period later
+        matches = np.concatenate([[0], np.cumsum(frames[:-period] == frames[period:])])
+        starts = np.flatnonzero(matches[window:] - matches[:-window] == window)
+        if len(starts) and (best is None or starts[0] + period < sum(best)):
+            best = (int(starts[0]), period)
+    return best
+
+
+def _read_cycle(path):
+    """Return ``{"cycle": [start, period] or None}`` kept at ``path``, or ``None``."""
+    if path is None:
+        return None
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class LoopMixin:
+    """Adds :meth:`wait_loop`, a ``wait()`` that renders one cycle of a looping slide.
+
+    Needs the ``scene_time`` of :class:`~render_tools.clock.ClockMixin`.
+    """
+
+    def wait_loop(self, duration):
+        """Wait ``duration`` seconds, rendering only what a looping slide needs to show.
+
+        Call it right after ``next_slide(loop=True)``, in place of
+        ``wait(duration)``.
+        """
+        if not self.render_options.loop_extraction:
+            return self.wait(duration)
+
+        step = 1 / config.frame_rate
+        frames = len(np.arange(0, duration, step))
+        scene_time = self.scene_time
+        path = self._cycle_path(duration)
+        stored = _read_cycle(path)
+        if stored is not None:
+            found = stored["cycle"]
+        else:
+            found = self._find_cycle(frames, step, scene_time)
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"cycle": found}))
+                tmp.replace(path)
+
+        if found is None:
+            logger.info(f"No cycle found in the {duration}s loop; rendering all of it")
+            return self.wait(duration)
+        start, period = found
+        logger.info(f"Looping {period} frames after {start} frames of build-up, out of {frames}")
+
+        played = 0.0
+        if start:
+            slide_config = self._base_slide_config
+            self._base_slide_config = slide_config.model_copy(update={"loop": False, "auto_next": True})
+            played += self._wait_frames(start)
+            if self._current_animation > self._start_animation:
+                # Not self.next_slide(): the mixins count every next_slide() of construct
+                section = self.renderer.file_writer.sections[-1]
+                Slide.next_slide(self, skip_animations=section.skip_animations)
+            self._base_slide_config = slide_config
+            # The cycle starts one frame after the last one of the build-up, not on it
+            gap = scene_time + start * step - self.scene_time
+            self._step_updaters(gap, scene_time + start * step)
+            played += gap
+        played += self._wait_frames(period)
+
+        if self.renderer.skip_animations:
+            if duration > played:
+                self._step_updaters(duration - played, scene_time + duration)
+        else:
+            for frame in range(start + period, frames):
+                self._step_updaters(step, scene_time + frame * step)
+        self.scene_time = scene_time + duration
+
+    def _find_cycle(self, frames, step, scene_time):
+        """Step the updaters through ``frames`` frames without drawing, rewind, and return :func:`find_period`."""
+        roots = {str(index): mobject for index, mobject in enumerate([*self.mobjects, *self.foreground_mobjects])}
+        snapshot = pickle.dumps(Snapshot.capture(self, roots))
+        digests = []
+        for frame in range(frames):
+            self._step_updaters(0 if frame == 0 else step, scene_time + frame * step)
+            digests.append(hash_appearance(self._drawn_mobjects(), ordered=False))
+        pickle.loads(snapshot).restore(self, roots)
+        return find_period(digests)
+
+    def _cycle_path(self, duration):
+        """Return the file keeping the cycle of the loop about to be played, or ``None`` without a slide cache."""
+        if getattr(self, "slide_cache", None) is None:
+            return None
+        segment = self._segment
+        played = len(self.renderer.file_writer.partial_movie_files) - segment["start"]
+        hasher = hashlib.sha256()
+        for part in (segment["key"], played, duration, config["frame_rate"]):
+            hasher.update(f"{part}\0".encode())
+        return self.slide_cache.directory / "loops" / f"{hasher.hexdigest()[:32]}.json"
+
+    def _drawn_mobjects(self):
+        mobjects = [*self.mobjects, *self.foreground_mobjects]
+        frame = getattr(self.camera, "frame", None)
+        if frame is not None:
+            mobjects.append(frame)
+        return mobjects
+
+    def _step_updaters(self, dt, scene_time):
+        # What Scene.update_to_time does at each frame of a wait()
+        self.scene_time = scene_time
+        self.update_mobjects(dt)
+        self.update_meshes(dt)
+        self.update_self(dt)
+
+    def _wait_frames(self, frames):
+        """Render exactly ``frames`` frames of ``wait()``, return the time its updaters saw."""
+        step = 1 / config.frame_rate
+        # Half a frame short, so that np.arange(0, run_time, step) has exactly `frames` items
+        run_time = (frames - 0.5) * step
+        start = self.scene_time
+        self.wait(run_time, frozen_frame=False)
+        played = run_time if self.renderer.skip_animations else (frames - 1) * step
+        # The next play starts on the last frame of this one, as in the simulation
+        self.scene_time = start + played
+        return played
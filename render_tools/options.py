@@ -0,0 +1,156 @@
+"""Render options shared by the mixins in :mod:`render_tools`.
+
+Scenes are usually started by the ``manim`` command line, which gives us no
+way to pass arguments to a scene, so every option can also be set through a
+``DECK_*`` environment variable.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+def _path_or_none(value):
+    if value is None:
+        return None
+    if value.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    return Path(value)
+
+
+def _user_cache_dir(name):
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / name
+
+
+def _resolutions(value):
+    resolutions = []
+    for item in value.replace(" ", "").split(","):
+        if item:
+            width, _, height = item.lower().partition("x")
+            resolutions.append((int(width), int(height)))
+    return tuple(resolutions)
+
+
+def _flag(value):
+    return value.strip().lower() in ("1", "on", "true", "yes")
+
+
+@dataclass
+class RenderOptions:
+    """Options controlling how a :class:`~render_tools.DeckSlide` is rendered.
+
+    slide_cache
+        Directory of the per-slide render cache, or ``None`` to disable it
+        (``DECK_SLIDE_CACHE``).
+    checkpoints
+        Directory where the scene state is saved at each ``next_slide()``, or
+        ``None`` to disable checkpoints (``DECK_CHECKPOINTS``).
+    start_slide
+        Resume rendering at this ``next_slide()`` boundary, counted from 1,
+        using its checkpoint (``DECK_START_SLIDE``). ``0`` renders everything.
+    stop_slide
+        End the scene at this ``next_slide()`` boundary (``DECK_STOP_SLIDE``).
+        ``0`` renders up to the end.
+    dry_run
+        Skip every animation and write no slides, only the checkpoints
+        (``DECK_DRY_RUN``).
+    output_folder
+        Where ``manim-slides`` writes the slides (``DECK_OUTPUT_FOLDER``).
+    tex_cache
+        Directory of the typeset TeX expressions and precompiled formats,
+        shared by every checkout, or ``None`` to let manim typeset each
+        expression (``DECK_TEX_CACHE``).
+    text_cache
+        Directory of the shaped ``Text`` objects, shared by every checkout, or
+        ``None`` to shape every ``Text`` again (``DECK_TEXT_CACHE``).
+    layer_cache
+        Draw the mobjects that do not move during a play once, into cached
+        layers, instead of at every frame (``DECK_LAYER_CACHE``).
+    loop_extraction
+        Render a single cycle of the waits of looping slides, see
+        :meth:`~render_tools.LoopMixin.wait_loop` (``DECK_LOOP_EXTRACTION``).
+    reuse_frames
+        Write the previous frame again instead of drawing a frame in which
+        nothing changed (``DECK_REUSE_FRAMES``).
+    culling
+        Leave out of each frame what is outside the camera frame or fully
+        transparent, see :mod:`render_tools.culling` (``DECK_CULLING``).
+    update_scheduler
+        Run updaters in dependency order and skip those whose declared
+        inputs did not change, see :mod:`render_tools.scheduler`
+        (``DECK_UPDATE_SCHEDULER``).
+    preview
+        Render a fast, low resolution draft, see :mod:`render_tools.preview`
+        (``DECK_PREVIEW``).
+    extra_resolutions
+        Other ``(width, height)`` resolutions to render every frame at, in
+        the same pass, see :mod:`render_tools.resolutions`
+        (``DECK_EXTRA_RESOLUTIONS``, such as ``854x480,1280x720``).
+    frame_store
+        Directory where the raw frames of every animation are kept, to
+        encode the slides again without rendering them, see
+        :mod:`render_tools.frame_store`, or ``None`` not to keep them
+        (``DECK_FRAME_STORE``).
+    profile
+        Directory where a trace of the updaters, animations and frames of
+        each scene is written, or ``None`` not to record one
+        (``DECK_PROFILE``).
+    """
+
+    slide_cache: Path | None = Path(".slide_cache")
+    checkpoints: Path | None = Path(".checkpoints")
+    start_slide: int = 0
+    stop_slide: int = 0
+    dry_run: bool = False
+    output_folder: Path = Path("slides")
+    tex_cache: Path | None = field(default_factory=lambda: _user_cache_dir("deck-tex"))
+    text_cache: Path | None = field(default_factory=lambda: _user_cache_dir("deck-text"))
+    layer_cache: bool = True
+    loop_extraction: bool = True
+    reuse_frames: bool = True
+    culling: bool = True
+    update_scheduler: bool = True
+    preview: bool = False
+    extra_resolutions: tuple[tuple[int, int], ...] = ()
+    frame_store: Path | None = None
+    profile: Path | None = None
+
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        options = cls()
+        if "DECK_SLIDE_CACHE" in environ:
+            options.slide_cache = _path_or_none(environ["DECK_SLIDE_CACHE"])
+        if "DECK_CHECKPOINTS" in environ:
+            options.checkpoints = _path_or_none(environ["DECK_CHECKPOINTS"])
+        if "DECK_START_SLIDE" in environ:
+            options.start_slide = int(environ["DECK_START_SLIDE"] or 0)
+        if "DECK_STOP_SLIDE" in environ:
+            options.stop_slide = int(environ["DECK_STOP_SLIDE"] or 0)
+        if "DECK_DRY_RUN" in environ:
+            options.dry_run = _flag(environ["DECK_DRY_RUN"])
+        if "DECK_OUTPUT_FOLDER" in environ:
+            options.output_folder = Path(environ["DECK_OUTPUT_FOLDER"])
+        if "DECK_TEX_CACHE" in environ:
+            options.tex_cache = _path_or_none(environ["DECK_TEX_CACHE"])
+        if "DECK_TEXT_CACHE" in environ:
+            options.text_cache = _path_or_none(environ["DECK_TEXT_CACHE"])
+        if "DECK_LAYER_CACHE" in environ:
+            options.layer_cache = _flag(environ["DECK_LAYER_CACHE"])
+        if "DECK_LOOP_EXTRACTION" in environ:
+            options.loop_extraction = _flag(environ["DECK_LOOP_EXTRACTION"])
+        if "DECK_REUSE_FRAMES" in environ:
+            options.reuse_frames = _flag(environ["DECK_REUSE_FRAMES"])
+        if "DECK_CULLING" in environ:
+            options.culling = _flag(environ["DECK_CULLING"])
+        if "DECK_UPDATE_SCHEDULER" in environ:
+            options.update_scheduler = _flag(environ["DECK_UPDATE_SCHEDULER"])
+        if "DECK_PREVIEW" in environ:
+            options.preview = _flag(environ["DECK_PREVIEW"])
+        if "DECK_EXTRA_RESOLUTIONS" in environ:
+            options.extra_resolutions = _resolutions(environ["DECK_EXTRA_RESOLUTIONS"])
+        if "DECK_FRAME_STORE" in environ:
+            options.frame_store = _path_or_none(environ["DECK_FRAME_STORE"])
+        if "DECK_PROFILE" in environ:
+            options.profile = _path_or_none(environ["DECK_PROFILE"])
+        return options
@@ -0,0 +1,149 @@
+"""Render the slides of a scene in parallel, one process per group of slides.
+
+Usage::
+
+    python -m render_tools.parallel [-j JOBS] slides.py DopplerEffect Outro [-- MANIM_ARGS...]
+
+Each scene first runs once with ``DECK_DRY_RUN=1``: every animation is
+skipped, so this is cheap, but a checkpoint is saved at every ``next_slide()``
+together with the scene time there. The boundaries are then split into
+groups of about the same duration, and each group is rendered by its own
+``manim`` process, resuming from the checkpoint at its first boundary
+(``DECK_START_SLIDE``) and ending at the next group's (``DECK_STOP_SLIDE``).
+Finally the slides of all groups are joined, in order, into the usual
+``slides/<Scene>.json``, and likewise for every extra resolution (see
+:mod:`render_tools.resolutions`).
+
+The full scene video that ``manim`` writes next to the partial movie files is
+not assembled; ``manim-slides convert`` only needs the slides.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from manim_slides.config import PresentationConfig
+
+from .options import RenderOptions
+from .resolutions import resolution_folder
+
+
+def _run_manim(file, scene, manim_args, **environ):
+    env = dict(os.environ)
+    env.update({key: str(value) for key, value in environ.items()})
+    command = [sys.executable, "-m", "manim", "render", *manim_args, str(file), scene]
+    subprocess.run(command, env=env, check=True)
+
+
+def _boundary_times(directory):
+    """Return the scene time at each boundary, from 0 at the start to the end of the scene."""
+    summary = json.loads((directory / "summary.json").read_text())
+    times = [0.0]
+    for boundary in range(1, summary["boundaries"] + 1):
+        with (directory / f"{boundary:04d}.pkl").open("rb") as file:
+            snapshot = pickle.load(file)["snapshot"]
+        times.append(snapshot.time if snapshot.scene_time is None else snapshot.scene_time)
+    times.append(summary["time"])
+    return times
+
+
+def split_boundaries(times, jobs):
+    """Split the segments between ``times`` into at most ``jobs`` groups of similar duration.
+
+    Returns ``(start, stop)`` boundary pairs for ``DECK_START_SLIDE`` and
+    ``DECK_STOP_SLIDE``; ``0`` means the start or the end of the scene. A group
+    is never cut so that it, or what remains after it, plays nothing.
+    """
+    total = times[-1]
+    last = len(times) - 2
+    target = total / max(jobs, 1)
+    groups = []
+    start = 0
+    for boundary in range(1, last + 1):
+        if len(groups) == jobs - 1:
+            break
+        played = times[boundary] - times[start]
+        remaining = total - times[boundary]
+        if played >= target and played > 0 and remaining > 0:
+            groups.append((start, boundary))
+            start = boundary
+    groups.append((start, 0))
+    return groups
+
+
+def render_parallel(file, scenes, jobs=None, manim_args=(), options=None):
+    """Render ``scenes`` from ``file`` with up to ``jobs`` ``manim`` processes."""
+    options = options or RenderOptions.from_env()
+    if options.checkpoints is None:
+        raise ValueError("Parallel rendering resumes from checkpoints; DECK_CHECKPOINTS must be enabled.")
+    jobs = jobs or os.cpu_count() or 1
+    manim_args = list(manim_args)
+
+    with ThreadPoolExecutor(jobs) as pool, tempfile.TemporaryDirectory(prefix="deck-") as workdir:
+        list(pool.map(
+            lambda scene: _run_manim(file, scene, manim_args, DECK_DRY_RUN=1, DECK_START_SLIDE=0, DECK_STOP_SLIDE=0),
+            scenes,
+        ))
+
+        work = []
+        for scene in scenes:
+            groups = split_boundaries(_boundary_times(options.checkpoints / scene), jobs)
+            for index, (start, stop) in enumerate(groups):
+                output = Path(workdir, scene, str(index)).absolute()
+                work.append((scene, output, start, stop))
+
+        list(pool.map(
+            lambda item: _run_manim(
+                file,
+                item[0],
+                ["--media_dir", str(item[1] / "media"), *manim_args],
+                DECK_START_SLIDE=item[2],
+                DECK_STOP_SLIDE=item[3],
+                DECK_OUTPUT_FOLDER=item[1] / "slides",
+            ),
+            work,
+        ))
+
+        # The slides of each extra resolution are joined the same way
+        folders = [("slides", options.output_folder)] + [
+            (resolution_folder("slides", resolution).name, resolution_folder(options.output_folder, resolution))
+            for resolution in options.extra_resolutions
+        ]
+        for scene in scenes:
+            for part_name, output_folder in folders:
+                parts = [
+                    PresentationConfig.from_file(output / part_name / f"{scene}.json")
+                    for name, output, _, _ in work
+                    if name == scene
+                ]
+                presentation = PresentationConfig(
+                    slides=[slide for part in parts for slide in part.slides],
+                    resolution=parts[0].resolution,
+                    background_color=parts[0].background_color,
+                )
+                files_folder = output_folder / "files" / scene
+                files_folder.mkdir(parents=True, exist_ok=True)
+                presentation.copy_to(files_folder).to_file(output_folder / f"{scene}.json")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    manim_args = []
+    if "--" in argv:
+        argv, manim_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="python -m render_tools.parallel", description=__doc__.splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of manim processes (default: CPU count)")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("scenes", nargs="+")
+    args = parser.parse_args(argv)
+    render_parallel(args.file, args.scenes, args.jobs, manim_args)
+
+
+if __name__ == "__main__":
+    main()
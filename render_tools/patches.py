@@ -0,0 +1,53 @@
+"""Patches of manim that last as long as a scene.
+
+The TeX and ``Text`` caches, the profiler and culling replace functions that
+manim shares between every scene, such as ``Text.__init__``. A
+:class:`Patch` sets such attributes and puts back what was there when it is
+closed, and :class:`PatchesMixin` keeps the patches of a scene from
+``setup()`` to ``tear_down()``, so that the next scene rendered in the same
+process, by :mod:`render_tools.bench` say, starts from manim's own code.
+"""
+
+from contextlib import ExitStack
+
+_MISSING = object()
+
+
+class Patch:
+    """Attributes of ``target`` replaced until :meth:`close` is called; also a context manager."""
+
+    def __init__(self, target, **attributes):
+        self.target = target
+        self.saved = {name: vars(target).get(name, _MISSING) for name in attributes}
+        for name, value in attributes.items():
+            setattr(target, name, value)
+
+    def close(self):
+        for name, value in self.saved.items():
+            if value is _MISSING:
+                delattr(self.target, name)
+            else:
+                setattr(self.target, name, value)
+        self.saved = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PatchesMixin:
+    """Closes the patches of the scene, newest first, when it is torn down."""
+
+    def patch(self, patch):
+        """Keep ``patch`` until ``tear_down()`` and return it."""
+        if getattr(self, "_patches", None) is None:
+            self._patches = ExitStack()
+        return self._patches.enter_context(patch)
+
+    def tear_down(self):
+        super().tear_down()
+        if getattr(self, "_patches", None) is not None:
+            self._patches.close()
+            self._patches = None
@@ -0,0 +1,80 @@
+"""Draft preview renders, for rehearsing the deck.
+
+With ``DECK_PREVIEW=1`` scenes are rendered at 854x480 and 30 fps, and every
+``play()`` in which nothing has an updater, such as a ``Write`` or a
+``FadeOut`` of a title, is drawn at only 6 fps: each drawn frame is written
+5 times, so the videos keep their frame rate and ``manim-slides`` sees a
+regular presentation.
+
+The times seen by updaters are a subset of the usual frame times and always
+end at the same last frame, so everything driven by ``dt`` ends each
+``play()`` exactly where a full render would.
+"""
+
+from manim import config
+
+
+class PreviewMixin:
+    """Renders a fast, low resolution draft when ``render_options.preview`` is set."""
+
+    preview_resolution = (854, 480)
+    preview_frame_rate = 30
+    preview_still_frame_rate = 6
+
+    def __init__(self, *args, **kwargs):
+        if self.render_options.preview:
+            # Read by the camera and the movie writer as they are created
+            config.pixel_width, config.pixel_height = self.preview_resolution
+            config.frame_rate = self.preview_frame_rate
+        super().__init__(*args, **kwargs)
+
+    def setup(self):
+        super().setup()
+        self._frame_repeats = {}
+        self._repeat = 1
+        if not self.render_options.preview:
+            return
+        renderer = self.renderer
+        render = renderer.render
+        add_frame = renderer.add_frame
+
+        def render_with_repeats(scene, time, moving_mobjects):
+            self._repeat = self._frame_repeats.get(time, 1)
+            try:
+                return render(scene, time, moving_mobjects)
+            finally:
+                self._repeat = 1
+
+        def add_repeated_frame(frame, num_frames=1):
+            return add_frame(frame, num_frames=num_frames * self._repeat)
+
+        renderer.render = render_with_repeats
+        renderer.add_frame = add_repeated_frame
+
+    def get_time_progression(self, run_time, *args, **kwargs):
+        progression = super().get_time_progression(run_time, *args, **kwargs)
+        self._frame_repeats = {}
+        stride = self._preview_stride()
+        times = list(progression.iterable)
+        if stride == 1 or len(times) <= 1:
+            return progression
+
+        indices = list(range(0, len(times), stride))
+        if indices[-1] != len(times) - 1:
+            indices.append(len(times) - 1)
+        for index, next_index in zip(indices, indices[1:] + [len(times)]):
+            self._frame_repeats[times[index]] = next_index - index
+        # The progress bar iterates over whatever its iterable is when the play starts
+        progression.iterable = [times[index] for index in indices]
+        progression.total = len(indices)
+        return progression
+
+    def _preview_stride(self):
+        """Return how many frames each drawn frame of the current play stands for."""
+        if not self.render_options.preview:
+            return 1
+        frame = getattr(self.camera, "frame", None)
+        mobjects = [*self.mobjects, *self.foreground_mobjects, *([frame] if frame is not None else [])]
+        if self.updaters or any(member.updaters for mobject in mobjects for member in mobject.get_family()):
+            return 1
+        return max(round(config.frame_rate / self.preview_still_frame_rate), 1)
@@ -0,0 +1,208 @@
+"""Opt-in timing of updaters, animations and frames.
+
+With ``DECK_PROFILE=<directory>``, every updater attached with
+``add_updater()`` during ``construct``, every ``play()`` and ``wait()``, and
+the rasterization and encoding of every frame is timed. Each span records
+the slide it belongs to, counted by ``next_slide()`` calls from 0.
+
+At the end of the scene ``<Scene>.trace.json`` is written to the directory,
+in the Chrome trace event format (open it in https://ui.perfetto.dev or
+``chrome://tracing``), together with ``<Scene>.summary.txt``, the spans that
+took the most time in total.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import Mobject, logger
+
+from .patches import Patch, PatchesMixin
+
+_original_add_updater = Mobject.add_updater
+
+
+def _label(function):
+    function = getattr(function, "__func__", function)
+    name = getattr(function, "__qualname__", type(function).__qualname__).replace(".<locals>", "")
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return name
+    return f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class Tracer:
+    """Spans in the Chrome trace event format, with times in microseconds."""
+
+    def __init__(self):
+        self.events = []
+        self.slide = 0
+        self._origin = time.perf_counter_ns()
+        self._slide_start = self._origin
+
+    def _add(self, name, category, start, end, args):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": args,
+        })
+
+    @contextmanager
+    def span(self, name, category, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._add(name, category, start, time.perf_counter_ns(), {"slide": self.slide, **args})
+
+    def next_slide(self):
+        """Close the span of the current slide and start the next one."""
+        now = time.perf_counter_ns()
+        self._add(f"slide {self.slide}", "slide", self._slide_start, now, {"slide": self.slide})
+        self.slide += 1
+        self._slide_start = now
+
+    def to_file(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}))
+
+    def summary(self, top=20):
+        """Return a table of the ``top`` span names by total time, slides left out."""
+        totals = {}
+        for event in self.events:
+            if event["cat"] == "slide":
+                continue
+            total, calls, longest = totals.get((event["cat"], event["name"]), (0.0, 0, 0.0))
+            totals[event["cat"], event["name"]] = (total + event["dur"], calls + 1, max(longest, event["dur"]))
+        rows = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        lines = [f"{'total ms':>10} {'calls':>7} {'mean ms':>9} {'max ms':>9}  {'kind':<8} span"]
+        for (category, name), (total, calls, longest) in rows:
+            lines.append(
+                f"{total / 1000:10.1f} {calls:7d} {total / calls / 1000:9.3f} {longest / 1000:9.3f}  {category:<8} {name}"
+            )
+        return "\n".join(lines)
+
+
+class _TimedUpdater:
+    """Updater that records a span for each call of ``function``.
+
+    Compares equal to ``function``, so that ``remove_updater(function)`` still
+    works, and exposes it as ``__wrapped__``, so that manim still sees whether
+    it takes ``dt``.
+    """
+
+    def __init__(self, function, tracer):
+        self.__wrapped__ = function
+        self.tracer = tracer
+        self.name = _label(function)
+
+    def __call__(self, mobject, *args, **kwargs):
+        with self.tracer.span(self.name, "updater", mobject=type(mobject).__name__):
+            return self.__wrapped__(mobject, *args, **kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, _TimedUpdater):
+            other = other.__wrapped__
+        return other is self.__wrapped__ or other == self.__wrapped__
+
+    def __hash__(self):
+        return hash(self.__wrapped__)
+
+    def __deepcopy__(self, memo):
+        # Copies of a mobject share its updaters, as they do without profiling
+        return self
+
+
+def install_profiler(tracer):
+    """Time every updater attached with ``tracer`` until the returned :class:`Patch` is closed.
+
+    Updaters attached in the meantime stay timed.
+    """
+
+    def add_updater(self, update_function, *args, **kwargs):
+        if not isinstance(update_function, _TimedUpdater):
+            update_function = _TimedUpdater(update_function, tracer)
+        return _original_add_updater(self, update_function, *args, **kwargs)
+
+    return Patch(Mobject, add_updater=add_updater)
+
+
+def _play_label(args):
+    names = []
+    for animation in args:
+        name = type(animation).__name__
+        names.append("animate" if name == "_AnimationBuilder" else name)
+    return ", ".join(names) or "play"
+
+
+class ProfilingMixin(PatchesMixin):
+    """Records a trace of the scene when ``render_options.profile`` is set.
+
+    Must come first in the bases of a scene, so that its spans include the
+    work of every other mixin.
+    """
+
+    profile_top = 20
+
+    def setup(self):
+        super().setup()
+        self.tracer = None if self.render_options.profile is None else Tracer()
+        if self.tracer is None:
+            return
+        self.patch(install_profiler(self.tracer))
+
+        renderer = self.renderer
+        update_frame = renderer.update_frame
+        write_frame = renderer.file_writer.write_frame
+
+        def timed_update_frame(*args, **kwargs):
+            with self.tracer.span("rasterize", "frame"):
+                return update_frame(*args, **kwargs)
+
+        def timed_write_frame(*args, **kwargs):
+            with self.tracer.span("encode", "frame"):
+                return write_frame(*args, **kwargs)
+
+        renderer.update_frame = timed_update_frame
+        renderer.file_writer.write_frame = timed_write_frame
+
+    def play(self, *args, **kwargs):
+        if self.tracer is None:
+            return super().play(*args, **kwargs)
+        with self.tracer.span(_play_label(args), "play"):
+            return super().play(*args, **kwargs)
+
+    def update_mobjects(self, dt):
+        if self.tracer is None:
+            return super().update_mobjects(dt)
+        with self.tracer.span("update_mobjects", "frame"):
+            return super().update_mobjects(dt)
+
+    def next_slide(self, *args, **kwargs):
+        if self.tracer is not None:
+            self.tracer.next_slide()
+        return super().next_slide(*args, **kwargs)
+
+    def render(self, *args, **kwargs):
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            # setup() is not reached if the scene fails before it
+            if getattr(self, "tracer", None) is not None:
+                self._write_profile()
+
+    def _write_profile(self):
+        self.tracer.next_slide()
+        directory = self.render_options.profile
+        name = type(self).__name__
+        self.tracer.to_file(directory / f"{name}.trace.json")
+        summary = self.tracer.summary(self.profile_top)
+        (directory / f"{name}.summary.txt").write_text(summary + "\n")
+        logger.info(f"Profile of {name} written to {directory}\n{summary}")
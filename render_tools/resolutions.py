@@ -0,0 +1,194 @@
+"""Several output resolutions from a single render.
+
+With ``DECK_EXTRA_RESOLUTIONS=854x480,1280x720`` each frame of the scene is
+computed once, by the usual updaters and animations, and then rasterized by
+one extra camera per resolution besides the scene's own. The extra cameras
+share the scene camera's frame, so they follow its moves and zooms; their
+resolutions should have the same aspect ratio. The extra frames are drawn
+in threads while the scene's frame is encoded, and each resolution has its
+own ffmpeg process per animation, writing next to manim's partial movie
+files in a ``<width>x<height>`` directory.
+
+At the end of the scene the slides of each extra resolution are assembled as
+``manim-slides`` does and written to their own folder, ``slides-480p`` for
+``slides`` at 854x480 (see :func:`resolution_folder`), ready for
+``manim-slides convert --folder``.
+"""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from manim import config, logger
+from manim.constants import RendererType
+from manim.utils.iterables import list_update
+from manim_slides.config import PresentationConfig, SlideConfig
+from manim_slides.utils import concatenate_video_files, merge_basenames, reverse_video_file
+
+
+def resolution_folder(output_folder, resolution):
+    """Return the slides folder of ``resolution`` next to ``output_folder``."""
+    output_folder = Path(output_folder)
+    return output_folder.with_name(f"{output_folder.name}-{resolution[1]}p")
+
+
+class _PartialMovie:
+    """ffmpeg process encoding the frames of one animation at one resolution."""
+
+    def __init__(self, path, resolution):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed once complete, so that a cut render is never reused
+        self.tmp = self.path.with_name(f"{self.path.stem}.tmp{self.path.suffix}")
+        width, height = resolution
+        self.command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(config.frame_rate), "-i", "-",
+            "-an", "-c:v", "libx264", "-pix_fmt", "yuv420p", str(self.tmp),
+        ]
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+
+    def write(self, frame, num_frames=1):
+        for _ in range(num_frames):
+            self.process.stdin.write(frame.data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise subprocess.CalledProcessError(self.process.returncode, self.command)
+        self.tmp.replace(self.path)
+
+    def abort(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.tmp.unlink(missing_ok=True)
+
+
+class ExtraResolutionsMixin:
+    """Renders every frame at ``render_options.extra_resolutions`` too.
+
+    Must come before :class:`~render_tools.SlideCacheMixin`, whose cached
+    slides it checks.
+    """
+
+    def setup(self):
+        resolutions = list(self.render_options.extra_resolutions)
+        if resolutions and (config.renderer != RendererType.CAIRO or config.movie_file_extension != ".mp4"):
+            logger.warning("Extra resolutions need the Cairo renderer and .mp4 movies; they are off")
+            resolutions = []
+        # Read by the slide cache as soon as it is set up
+        self.extra_resolutions = resolutions
+        self._extra_movies = {}
+        if not self.extra_resolutions:
+            return super().setup()
+
+        self._last_key_drawn = None
+        self._last_extra_frames = {}
+        renderer = self.renderer
+        file_writer = renderer.file_writer
+        add_frame = renderer.add_frame
+        is_already_cached = file_writer.is_already_cached
+
+        def add_frame_at_every_resolution(frame, num_frames=1):
+            if renderer.skip_animations:
+                return add_frame(frame, num_frames=num_frames)
+            key = getattr(self, "frame_key", None)
+            if key is not None and key == self._last_key_drawn:
+                # The scene's frame written again, see render_tools.frames
+                futures = None
+            else:
+                futures = {resolution: self._extra_pool.submit(self._draw, camera)
+                           for resolution, camera in self.extra_cameras.items()}
+            result = add_frame(frame, num_frames=num_frames)
+            if futures is not None:
+                self._last_extra_frames = {resolution: future.result() for resolution, future in futures.items()}
+                self._last_key_drawn = key
+
+            stem = Path(file_writer.partial_movie_files[renderer.num_plays]).stem
+            for resolution, extra_frame in self._last_extra_frames.items():
+                if resolution not in self._extra_movies:
+                    self._extra_movies[resolution] = _PartialMovie(self._extra_partial(resolution, stem), resolution)
+                self._extra_movies[resolution].write(extra_frame, num_frames)
+            return result
+
+        def is_cached_at_every_resolution(hash_invocation):
+            return is_already_cached(hash_invocation) and all(
+                self._extra_partial(resolution, hash_invocation).exists() for resolution in self.extra_resolutions
+            )
+
+        # Installed first, so that the wrappers of the next mixins, such as
+        # the frame repeats of render_tools.preview, are applied before it
+        renderer.add_frame = add_frame_at_every_resolution
+        file_writer.is_already_cached = is_cached_at_every_resolution
+        super().setup()
+        self.extra_cameras = {resolution: self._extra_camera(resolution) for resolution in resolutions}
+        self._extra_pool = ThreadPoolExecutor(len(resolutions), thread_name_prefix="extra-resolution")
+
+    def _extra_camera(self, resolution):
+        camera = self.renderer.camera
+        width, height = resolution
+        if hasattr(camera, "frame"):
+            # A moving camera: share the frame, whatever moves it
+            return type(camera)(frame=camera.frame, pixel_width=width, pixel_height=height)
+        return type(camera)(pixel_width=width, pixel_height=height)
+
+    def _draw(self, camera):
+        main = self.renderer.camera
+        if not hasattr(main, "frame"):
+            camera.frame_center = main.frame_center
+            camera.frame_width = main.frame_width
+            camera.frame_height = main.frame_height
+        camera.reset()
+        camera.capture_mobjects(list_update(self.mobjects, self.foreground_mobjects))
+        return camera.pixel_array.copy()
+
+    def _extra_partial(self, resolution, stem):
+        directory = Path(self.renderer.file_writer.partial_movie_directory)
+        return directory / f"{resolution[0]}x{resolution[1]}" / f"{stem}{config.movie_file_extension}"
+
+    def play(self, *args, **kwargs):
+        try:
+            result = super().play(*args, **kwargs)
+        except BaseException:
+            for movie in self._extra_movies.values():
+                movie.abort()
+            self._extra_movies = {}
+            raise
+        for movie in self._extra_movies.values():
+            movie.close()
+        self._extra_movies = {}
+        return result
+
+    def tear_down(self):
+        super().tear_down()
+        if self.extra_resolutions:
+            self._extra_pool.shutdown()
+
+    def _can_reuse(self, files):
+        for resolution in self.extra_resolutions:
+            if not all(self._extra_partial(resolution, Path(file).stem).exists() for file in files):
+                return False
+        return super()._can_reuse(files)
+
+    def _save_slides(self, *args, **kwargs):
+        super()._save_slides(*args, **kwargs)
+        files = self._partial_movie_files
+        scene_name = str(self)
+        for resolution in self.extra_resolutions:
+            folder = resolution_folder(self._output_folder, resolution)
+            files_folder = folder / "files" / scene_name
+            files_folder.mkdir(parents=True, exist_ok=True)
+            slides = []
+            for pre_slide_config in self._slides:
+                slide_files = [self._extra_partial(resolution, file.stem) for file in files[pre_slide_config.slides_slice]]
+                file = files_folder / merge_basenames(slide_files).name
+                rev_file = files_folder / f"{file.stem}_reversed{file.suffix}"
+                if not file.exists():
+                    concatenate_video_files(slide_files, file)
+                if not rev_file.exists():
+                    reverse_video_file(file, rev_file)
+                slides.append(SlideConfig.from_pre_slide_config_and_files(pre_slide_config, file, rev_file))
+            PresentationConfig(
+                slides=slides, resolution=resolution, background_color=self._background_color
+            ).to_file(folder / f"{scene_name}.json")
+            logger.info(f"Slides of {scene_name} at {resolution[0]}x{resolution[1]} written to {folder}")
@@ -0,0 +1,50 @@
+"""Base class for the slide decks in this repository."""
+
+from manim_slides import Slide
+
+from .checkpoint import CheckpointMixin
+from .clock import ClockMixin
+from .culling import CullingMixin
+from .frame_store import FrameStoreMixin
+from .frames import FrameReuseMixin
+from .layers import LayerCacheMixin
+from .loops import LoopMixin
+from .options import RenderOptions
+from .preview import PreviewMixin
+from .profiling import ProfilingMixin
+from .resolutions import ExtraResolutionsMixin
+from .scheduler import UpdaterSchedulerMixin
+from .slide_cache import SlideCacheMixin
+from .tex_cache import TexCacheMixin
+from .text_cache import TextCacheMixin
+
+
+class DeckSlide(
+    ProfilingMixin,
+    TexCacheMixin,
+    TextCacheMixin,
+    CheckpointMixin,
+    FrameStoreMixin,
+    ExtraResolutionsMixin,
+    SlideCacheMixin,
+    PreviewMixin,
+    FrameReuseMixin,
+    LayerCacheMixin,
+    CullingMixin,
+    UpdaterSchedulerMixin,
+    ClockMixin,
+    LoopMixin,
+    Slide,
+):
+    """:class:`manim_slides.Slide` with the render optimizations of this package.
+
+    Each mixin overrides scene methods and calls ``super()``, so all of them
+    come before ``Slide``, and a mixin that wraps what another one does comes
+    first. Options are read from the environment unless ``render_options`` is
+    given.
+    """
+
+    def __init__(self, *args, render_options=None, **kwargs):
+        self.render_options = render_options or RenderOptions.from_env()
+        kwargs.setdefault("output_folder", self.render_options.output_folder)
+        super().__init__(*args, **kwargs)
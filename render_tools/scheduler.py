@@ -0,0 +1,173 @@
+"""Updaters run in dependency order, and only when their inputs changed.
+
+manim runs the updaters of ``scene.mobjects`` in list order, each family top
+down, and every one of them at every frame: a label that follows a dot added
+after it is placed where the dot was on the previous frame, and an updater
+whose inputs did not change since the last frame runs again all the same.
+
+:class:`UpdaterSchedulerMixin` runs the updaters of each mobject once per
+frame, in an order where every mobject comes after the mobjects it reads.
+These inputs are inferred from the mobjects that its updaters capture,
+directly or through the functions they capture, and from the mobject's own
+attributes (the anchor of a ``SpeedLabel``). A mobject may also declare its
+inputs, with :meth:`UpdaterSchedulerMixin.depends_on` or an
+``updater_inputs`` list: mobjects, or functions returning a value. The
+updaters of a mobject with declared inputs are skipped at the frames where
+none of those inputs changed since they last ran, so the inputs must cover
+everything they read. Updaters that take ``dt`` are never skipped, and the
+first frame of every ``play()`` runs everything.
+"""
+
+import heapq
+import inspect
+import weakref
+
+import numpy as np
+from manim import Mobject, logger
+
+from .state import hash_appearance
+
+
+def _captured(function):
+    """Yield the values ``function`` reads through its closure and globals."""
+    function = inspect.unwrap(getattr(function, "__func__", function))
+    if not inspect.isfunction(function):
+        return
+    for cell in function.__closure__ or ():
+        try:
+            yield cell.cell_contents
+        except ValueError:  # A cell not filled yet
+            pass
+    for name in function.__code__.co_names:
+        if isinstance(function.__globals__.get(name), Mobject):
+            yield function.__globals__[name]
+
+
+def inferred_inputs(mobject):
+    """Return the mobjects read by the updaters of ``mobject``, outside its own family."""
+    family = {id(member) for member in mobject.get_family()}
+    found = {}
+    seen = set()
+
+    def visit(value, depth):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        if isinstance(value, Mobject):
+            if id(value) not in family:
+                found[id(value)] = value
+        elif callable(value) and depth:
+            for captured in _captured(value):
+                visit(captured, depth - 1)
+
+    for updater in mobject.updaters:
+        visit(updater, 3)
+    # The mobject's own attributes, such as what a label is anchored to
+    for name, value in vars(mobject).items():
+        if name not in ("submobjects", "updaters"):
+            visit(value, 2)
+    for value in getattr(mobject, "updater_inputs", None) or ():
+        visit(value, 2)
+    return list(found.values())
+
+
+def _input_key(value):
+    if isinstance(value, Mobject):
+        update_key = getattr(value, "update_key", None)
+        return update_key() if update_key is not None else hash_appearance([value])
+    value = value()
+    try:
+        return np.round(np.asarray(value, dtype=float), 9).tobytes()
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def update_order(mobjects):
+    """Return the mobjects of the families of ``mobjects`` that have updaters, inputs first.
+
+    Parents still come before their children and, where nothing else decides,
+    the order is manim's. Mobjects in a cycle of inputs keep manim's order.
+    """
+    nodes = list({id(member): member for mobject in mobjects for member in mobject.get_family() if member.updaters}.values())
+    index = {id(node): position for position, node in enumerate(nodes)}
+    after = [set() for _ in nodes]
+    waiting = [0] * len(nodes)
+
+    def edge(before, later):
+        if later not in after[before]:
+            after[before].add(later)
+            waiting[later] += 1
+
+    for position, node in enumerate(nodes):
+        for member in node.get_family()[1:]:
+            if id(member) in index:
+                edge(position, index[id(member)])
+        for source in inferred_inputs(node):
+            if id(source) in index:
+                edge(index[id(source)], position)
+
+    ready = [position for position in range(len(nodes)) if not waiting[position]]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        position = heapq.heappop(ready)
+        order.append(position)
+        for later in after[position]:
+            waiting[later] -= 1
+            if not waiting[later]:
+                heapq.heappush(ready, later)
+    if len(order) < len(nodes):
+        logger.debug("Updater inputs form a cycle; those updaters run in scene order")
+        placed = set(order)
+        order += [position for position in range(len(nodes)) if position not in placed]
+    return [nodes[position] for position in order]
+
+
+class UpdaterSchedulerMixin:
+    """Runs updaters in dependency order, skipping those whose declared inputs did not change."""
+
+    def setup(self):
+        super().setup()
+        self._update_order = []
+        self._update_order_key = None
+        self._last_inputs = weakref.WeakKeyDictionary()
+        self._scheduled_play = None
+
+    def depends_on(self, mobject, *inputs):
+        """Declare everything the updaters of ``mobject`` read, and return it.
+
+        ``inputs`` are mobjects, or functions returning a value; the updaters
+        then only run when one of them changed.
+        """
+        mobject.updater_inputs = list(inputs)
+        return mobject
+
+    def update_mobjects(self, dt):
+        if not self.render_options.update_scheduler:
+            return super().update_mobjects(dt)
+        if self._scheduled_play != self.renderer.num_plays:
+            self._scheduled_play = self.renderer.num_plays
+            self._last_inputs.clear()
+
+        keys = {}
+        for mobject in self._ordered_mobjects():
+            inputs = getattr(mobject, "updater_inputs", None)
+            if inputs is not None and not mobject.has_time_based_updater():
+                current = [keys[id(value)] if id(value) in keys else keys.setdefault(id(value), _input_key(value))
+                           for value in inputs]
+                if self._last_inputs.get(mobject) == current:
+                    continue
+                self._last_inputs[mobject] = current
+            mobject.update(dt, recursive=False)
+
+    def _ordered_mobjects(self):
+        key = tuple(
+            (id(member), tuple(map(id, member.updaters)), id(getattr(member, "updater_inputs", None)))
+            for mobject in self.mobjects
+            for member in mobject.get_family()
+            if member.updaters
+        )
+        if key != self._update_order_key:
+            self._update_order = update_order(self.mobjects)
+            self._update_order_key = key
+        return self._update_order
@@ -0,0 +1,230 @@
+"""Per-slide render cache.
+
+A slide segment is everything a scene does between two ``next_slide()``
+calls. Its cache key combines
+
+- the source code of the segment, read from the scene's ``construct``;
+- the rest of the module, since helpers defined there can change any slide;
+- the scene state at the start of the segment (see :mod:`render_tools.state`),
+  and the local variables of ``construct`` that the segment uses;
+- the render settings (resolution, frame rate, background, draft preview).
+
+When a key is found on disk the whole segment is played with
+``skip_animations=True``, which runs its updaters once per animation instead
+of once per frame, and the cached partial movie files are spliced back in so
+that both manim and ``manim-slides`` see a complete scene.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import textwrap
+from pathlib import Path
+
+from manim import Scene, config, logger
+
+from .state import hash_scene_state, hash_values
+
+
+class SourceIndex:
+    """Locates the ``next_slide()`` calls in a scene's ``construct`` method."""
+
+    def __init__(self, scene_class):
+        construct = scene_class.construct
+        self.code = construct.__code__
+        lines, self.first_line = inspect.getsourcelines(construct)
+        self.lines = lines
+        self.last_line = self.first_line + len(lines) - 1
+
+        tree = ast.parse(textwrap.dedent("".join(lines)))
+        self.boundaries = sorted(
+            self.first_line + node.lineno - 1
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "next_slide"
+        )
+        self.names = sorted({
+            (self.first_line + node.lineno - 1, node.id) for node in ast.walk(tree) if isinstance(node, ast.Name)
+        })
+
+        module_lines = inspect.getsource(inspect.getmodule(scene_class)).splitlines(keepends=True)
+        context = module_lines[:self.first_line - 1] + module_lines[self.last_line:]
+        self.context_hash = hashlib.sha256("".join(context).encode()).hexdigest()
+
+    def _end_line(self, start_line):
+        return next((line for line in self.boundaries if line > start_line), self.last_line + 1)
+
+    def segment_source(self, start_line):
+        """Return the code run from the boundary at ``start_line`` up to the next one."""
+        return "".join(self.lines[start_line - self.first_line:self._end_line(start_line) - self.first_line])
+
+    def segment_names(self, start_line):
+        """Return the names of the variables used from the boundary at ``start_line`` up to the next one."""
+        end_line = self._end_line(start_line)
+        return {name for line, name in self.names if start_line <= line < end_line}
+
+    def _caller_frame(self):
+        frame = inspect.currentframe()
+        while frame is not None and frame.f_code is not self.code:
+            frame = frame.f_back
+        return frame
+
+    def caller_line(self):
+        """Return the line of ``construct`` currently being executed."""
+        frame = self._caller_frame()
+        return None if frame is None else frame.f_lineno
+
+    def caller_locals(self):
+        """Return the local variables of ``construct`` as it is being executed."""
+        frame = self._caller_frame()
+        return {} if frame is None else dict(frame.f_locals)
+
+
+class SlideCache:
+    """On-disk store of the partial movie files of each slide segment."""
+
+    manifest_name = "manifest.json"
+
+    def __init__(self, root, scene_name):
+        self.directory = Path(root) / scene_name
+
+    def lookup(self, key):
+        """Return the cached movie files and end state for ``key``, or ``None``."""
+        entry = self.directory / key
+        try:
+            manifest = json.loads((entry / self.manifest_name).read_text())
+        except (OSError, ValueError):
+            return None
+        files = [entry / name for name in manifest["files"]]
+        if not all(file.exists() for file in files):
+            return None
+        return files, manifest["end_state"]
+
+    def store(self, key, files, end_state):
+        entry = self.directory / key
+        tmp = self.directory / f"{key}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for file in files:
+            file = Path(file)
+            try:
+                os.link(file, tmp / file.name)
+            except OSError:
+                shutil.copy2(file, tmp / file.name)
+        manifest = {"files": [Path(file).name for file in files], "end_state": end_state}
+        (tmp / self.manifest_name).write_text(json.dumps(manifest, indent=2))
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+
+
+class SlideCacheMixin:
+    """Reuses the rendered slides whose code and starting state did not change."""
+
+    def setup(self):
+        super().setup()
+        root = self.render_options.slide_cache
+        self.slide_cache = None if root is None else SlideCache(root, type(self).__name__)
+        if self.slide_cache is None:
+            return
+
+        self._source_index = SourceIndex(type(self))
+        self._pending_stores = []
+        self._chained_state = None
+        self._segment = None
+        self._begin_segment(self._source_index.first_line)
+        if self._segment["cached"] is not None:
+            Scene.next_section(self, skip_animations=True)
+
+    def next_slide(self, *args, **kwargs):
+        if self.slide_cache is None:
+            return super().next_slide(*args, **kwargs)
+
+        line = self._source_index.caller_line()
+        self._end_segment()
+        self._begin_segment(line)
+        kwargs.setdefault("skip_animations", self._segment["cached"] is not None)
+        return super().next_slide(*args, **kwargs)
+
+    def tear_down(self):
+        if self.slide_cache is not None:
+            self._end_segment()
+        super().tear_down()
+
+    def render(self, *args, **kwargs):
+        result = super().render(*args, **kwargs)
+        if self.slide_cache is not None:
+            # Partial movie files are only complete once the scene is finished
+            for key, files, end_state in self._pending_stores:
+                self.slide_cache.store(key, files, end_state)
+            self._pending_stores = []
+        return result
+
+    def _can_reuse(self, files):
+        """Return whether the cached partial movie ``files`` can stand for a render of their segment."""
+        return True
+
+    def _segment_key(self, line, variables=None):
+        hasher = hashlib.sha256()
+        for part in (
+            self._source_index.context_hash,
+            "" if line is None else self._source_index.segment_source(line),
+            self._chained_state or hash_scene_state(self),
+            hash_values(variables or {}),
+            config["pixel_width"],
+            config["pixel_height"],
+            config["frame_rate"],
+            config["background_color"],
+            getattr(config, "movie_file_extension", ""),
+            self.render_options.preview,
+        ):
+            hasher.update(f"{part}\0".encode())
+        return hasher.hexdigest()[:32]
+
+    def _begin_segment(self, line):
+        variables = {}
+        if line is not None:
+            # Locals the segment reads, such as a component built in an earlier slide
+            local_variables = self._source_index.caller_locals()
+            variables = {
+                name: local_variables[name] for name in self._source_index.segment_names(line)
+                if name in local_variables and name != "self"
+            }
+        key = self._segment_key(line, variables)
+        cached = self.slide_cache.lookup(key)
+        if cached is not None and not self._can_reuse(cached[0]):
+            cached = None
+        if cached is not None:
+            logger.info(f"Slide segment at line {line}: using cached render {key}")
+        self._segment = {
+            "key": key,
+            "cached": cached,
+            "start": len(self.renderer.file_writer.partial_movie_files),
+        }
+
+    def _end_segment(self):
+        segment = self._segment
+        partial_movie_files = self.renderer.file_writer.partial_movie_files
+        files = partial_movie_files[segment["start"]:]
+
+        if segment["cached"] is not None:
+            cached_files, end_state = segment["cached"]
+            if not files:
+                # Nothing was played, e.g. while resuming from a checkpoint
+                pass
+            elif len(cached_files) != len(files):
+                raise RuntimeError(
+                    f"Slide cache entry {segment['key']} has {len(cached_files)} animations "
+                    f"but the scene played {len(files)}; delete {self.slide_cache.directory} and render again."
+                )
+            else:
+                partial_movie_files[segment["start"]:] = [str(file) for file in cached_files]
+        else:
+            end_state = hash_scene_state(self)
+            if files and all(file is not None for file in files):
+                self._pending_stores.append((segment["key"], files, end_state))
+
+        self._chained_state = end_state
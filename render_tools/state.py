@@ -0,0 +1,198 @@
+"""Content hashes of scene state.
+
+The hashes only depend on what a scene will draw and how it will evolve:
+points, styles and other attributes of every mobject, plus the code of the
+updaters attached to them and whatever that code closes over. Other objects
+are hashed by their attributes. They are stable across processes, so they
+can be used as keys of on-disk caches.
+
+:func:`hash_appearance` is narrower: it only covers what the mobjects look
+like right now, to tell whether two frames would be drawn the same.
+"""
+
+import functools
+import hashlib
+import inspect
+import types
+
+import numpy as np
+
+_SKIPPED_ATTRIBUTES = {"submobjects", "updaters", "original_id", "name"}
+
+_STYLE_ATTRIBUTES = (
+    "fill_rgbas",
+    "stroke_rgbas",
+    "stroke_width",
+    "background_stroke_rgbas",
+    "background_stroke_width",
+    "pixel_array",
+    "z_index",
+)
+
+
+def _update_with_code(hasher, code):
+    hasher.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_with_code(hasher, const)
+        else:
+            hasher.update(repr(const).encode())
+
+
+def _update_with_function(hasher, function, seen):
+    # Bound methods also hash the object they are bound to
+    if isinstance(function, types.MethodType):
+        _update_with_value(hasher, function.__self__, seen)
+    # Wrapped updaters, e.g. timed by render_tools.profiling, hash as the function they wrap
+    function = inspect.unwrap(getattr(function, "__func__", function))
+    code = getattr(function, "__code__", None)
+    if code is None:
+        hasher.update(type(function).__qualname__.encode())
+        return
+    _update_with_code(hasher, code)
+    # What the code reads besides its arguments: defaults and the variables it closes over
+    _update_with_value(hasher, function.__defaults__ or (), seen)
+    for cell in function.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            hasher.update(b"empty cell")
+            continue
+        _update_with_value(hasher, contents, seen)
+
+
+def _update_with_value(hasher, value, seen):
+    from manim import Mobject, Scene
+
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        hasher.update(repr(value).encode())
+        return
+    if isinstance(value, np.ndarray):
+        hasher.update(f"{value.dtype}{value.shape}".encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+        return
+    if isinstance(value, Mobject):
+        _update_with_mobject(hasher, value, seen)
+        return
+    if id(value) in seen:
+        hasher.update(f"ref{seen[id(value)]}".encode())
+        return
+    seen[id(value)] = len(seen)
+
+    if isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update_with_value(hasher, item, seen)
+    elif isinstance(value, dict):
+        hasher.update(f"dict{len(value)}".encode())
+        for key, item in sorted(value.items(), key=lambda entry: repr(entry[0])):
+            hasher.update(repr(key).encode())
+            _update_with_value(hasher, item, seen)
+    elif isinstance(value, Scene):
+        # What a scene holds is hashed from the scene itself, see hash_scene_state
+        hasher.update(type(value).__qualname__.encode())
+    elif isinstance(value, (type, types.ModuleType)):
+        hasher.update(getattr(value, "__qualname__", value.__name__).encode())
+    elif isinstance(value, functools.partial):
+        _update_with_function(hasher, value.func, seen)
+        _update_with_value(hasher, (value.args, value.keywords), seen)
+    elif callable(value) and hasattr(inspect.unwrap(getattr(value, "__func__", value)), "__code__"):
+        _update_with_function(hasher, value, seen)
+    elif hasattr(value, "__dict__"):
+        hasher.update(type(value).__qualname__.encode())
+        for name, item in sorted(vars(value).items()):
+            hasher.update(name.encode())
+            _update_with_value(hasher, item, seen)
+    else:
+        text = repr(value)
+        # Reprs that embed memory addresses change from one run to the next
+        hasher.update((type(value).__qualname__ if " at 0x" in text else text).encode())
+
+
+def _update_with_mobject(hasher, mobject, seen):
+    if id(mobject) in seen:
+        hasher.update(f"ref{seen[id(mobject)]}".encode())
+        return
+    seen[id(mobject)] = len(seen)
+
+    hasher.update(type(mobject).__qualname__.encode())
+    for name, value in sorted(vars(mobject).items()):
+        if name in _SKIPPED_ATTRIBUTES:
+            continue
+        hasher.update(name.encode())
+        _update_with_value(hasher, value, seen)
+    for updater in mobject.updaters:
+        _update_with_function(hasher, updater, seen)
+
+    hasher.update(f"children{len(mobject.submobjects)}".encode())
+    for submobject in mobject.submobjects:
+        _update_with_mobject(hasher, submobject, seen)
+
+
+def hash_mobjects(mobjects):
+    """Return a hex digest of ``mobjects``, their families and their updaters."""
+    hasher = hashlib.sha256()
+    seen = {}
+    for mobject in mobjects:
+        _update_with_mobject(hasher, mobject, seen)
+    return hasher.hexdigest()
+
+
+def hash_values(variables):
+    """Return a hex digest of the values of ``variables``, a mapping from names, as :func:`hash_mobjects` does."""
+    hasher = hashlib.sha256()
+    seen = {}
+    for name, value in sorted(variables.items()):
+        hasher.update(f"{name}\0".encode())
+        _update_with_value(hasher, value, seen)
+    return hasher.hexdigest()
+
+
+def hash_scene_state(scene):
+    """Return a hex digest of everything ``scene`` will draw from now on.
+
+    This covers the scene's mobjects, foreground mobjects and, for moving
+    camera scenes, the camera frame. The scene time is deliberately left out
+    so that changing the duration of one slide does not invalidate all the
+    following ones.
+    """
+    mobjects = [*scene.mobjects, *scene.foreground_mobjects]
+    frame = getattr(scene.camera, "frame", None)
+    if frame is not None:
+        mobjects.append(frame)
+    hasher = hashlib.sha256(hash_mobjects(mobjects).encode())
+    for updater in scene.updaters:
+        _update_with_function(hasher, updater, {})
+    return hasher.hexdigest()
+
+
+def _quantize(value, tolerance):
+    return np.round(np.asarray(value, dtype=float) / tolerance).astype(np.int64).tobytes()
+
+
+def hash_appearance(mobjects, ordered=True, tolerance=1e-6):
+    """Return a digest of how ``mobjects`` look, with coordinates rounded to ``tolerance``.
+
+    Only points and style count; value trackers are left out, they are not
+    drawn. With ``ordered=False`` the members are compared as a set, so that
+    a group recycling its submobjects, like the rings of a wave field, looks
+    the same whichever submobject draws which ring.
+    """
+    from manim import ValueTracker
+
+    leaves = []
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            if isinstance(member, ValueTracker) or not member.has_points():
+                continue
+            hasher = hashlib.sha256(type(member).__qualname__.encode())
+            hasher.update(_quantize(member.points, tolerance))
+            for name in _STYLE_ATTRIBUTES:
+                value = getattr(member, name, None)
+                if value is not None:
+                    hasher.update(name.encode())
+                    hasher.update(_quantize(value, tolerance))
+            leaves.append(hasher.digest())
+    if not ordered:
+        leaves.sort()
+    return hashlib.sha256(b"".join(leaves)).hexdigest()
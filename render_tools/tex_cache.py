@@ -0,0 +1,338 @@
+"""Persistent cache of typeset TeX expressions.
+
+manim compiles every :class:`~manim.MathTex` with a fresh TeX process that
+reads the whole preamble again, which takes seconds once ``fontspec`` is
+involved, and keeps the results in ``media/Tex``, which a clean checkout
+does not have. This module replaces that step with
+
+- one precompiled format (``mylatexformat``) per template preamble, so a
+  cold build only pays for loading the preamble once;
+- a content-addressed SVG store, keyed by the full TeX source and the
+  compiler, in a directory shared by every checkout (``DECK_TEX_CACHE``), so a
+  warm build runs no TeX at all.
+
+Fonts cannot be stored in a XeTeX or LuaTeX format, so the preamble lines
+that select fonts or languages are kept out of the dump and run each time.
+If a format cannot be built, expressions are compiled the way manim does.
+
+:meth:`TexCacheMixin.prepare_tex` typesets many expressions up front, as the
+pages of a few documents compiled concurrently, instead of one TeX run per
+constructor.
+"""
+
+import functools
+import hashlib
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from manim import MathTex, config, logger
+from manim.mobject.text import tex_mobject
+from manim.utils import tex_file_writing
+from manim.utils.tex import _BEGIN_DOCUMENT, _END_DOCUMENT, _texcode_for_environment
+
+from .patches import Patch, PatchesMixin
+
+_DEFERRED_COMMANDS = (
+    r"\setmainfont",
+    r"\setsansfont",
+    r"\setmonofont",
+    r"\setmathfont",
+    r"\newfontfamily",
+    r"\setdefaultlanguage",
+    r"\setotherlanguage",
+)
+
+
+def _sha256(*parts):
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(f"{part}\0".encode())
+    return hasher.hexdigest()
+
+
+def _compilers(tex_template):
+    compiler = tex_template.tex_compiler
+    return [compiler] if isinstance(compiler, str) else list(compiler)
+
+
+@functools.cache
+def _compiler_version(compiler):
+    try:
+        result = subprocess.run([compiler, "--version"], capture_output=True, text=True)
+    except OSError:
+        return ""
+    return result.stdout.partition("\n")[0]
+
+
+def _tex_code(expression, environment, tex_template):
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+def _batch_template(tex_template):
+    """Return a copy of ``tex_template`` whose ``standalone`` environments are pages, or ``None``."""
+    match = re.fullmatch(r"\\documentclass(?:\[(.*)\])?\{standalone\}", tex_template.documentclass.strip())
+    if tex_template._body or match is None:
+        return None
+    options = [option for option in (match[1] or "").split(",") if option.strip()]
+    batch_template = tex_template.copy()
+    batch_template.documentclass = rf"\documentclass[{','.join([*options, 'multi'])}]{{standalone}}"
+    return batch_template
+
+
+def split_preamble(tex_template):
+    """Return the part of the preamble that can be dumped into a format and the rest."""
+    dumped, deferred = [], []
+    for line in tex_template.preamble.splitlines():
+        (deferred if line.strip().startswith(_DEFERRED_COMMANDS) else dumped).append(line)
+    return "\n".join(dumped), "\n".join(deferred)
+
+
+class TexCache:
+    """SVG files of typeset expressions, and the formats used to typeset them."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._formats = {}
+
+    def _svg_path(self, key):
+        return self.root / "svg" / key[:2] / f"{key}.svg"
+
+    def lookup(self, tex_code, tex_template):
+        """Return the cached SVG of a full TeX document, or ``None``."""
+        path = self._svg_path(self.key(tex_code, tex_template))
+        return path if path.exists() else None
+
+    def key(self, tex_code, tex_template):
+        return _sha256(tex_code, *_compilers(tex_template), tex_template.output_format)
+
+    def store(self, key, svg_file):
+        """Atomically add ``svg_file`` to the cache under ``key``, return its cached path."""
+        path = self._svg_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(svg_file, tmp)
+        os.replace(tmp, path)
+        return path
+
+    def svg_file(self, expression, environment=None, tex_template=None):
+        """Drop-in replacement for :func:`manim.utils.tex_file_writing.tex_to_svg_file`."""
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        tex_code = _tex_code(expression, environment, tex_template)
+        key = self.key(tex_code, tex_template)
+        path = self._svg_path(key)
+        if path.exists():
+            return path
+
+        with tempfile.TemporaryDirectory(prefix="deck-tex-") as workdir:
+            svg_file = self._compile(tex_code, tex_template, Path(workdir))
+            if svg_file is None:
+                svg_file = tex_file_writing.tex_to_svg_file(expression, environment, tex_template)
+            return self.store(key, svg_file)
+
+    def format_file(self, tex_template):
+        """Return the precompiled format of the template's preamble, building it if needed.
+
+        Returns ``None`` if the template cannot use a format.
+        """
+        compilers = _compilers(tex_template)
+        if tex_template._body or len(compilers) != 1:
+            return None
+        dumped, _ = split_preamble(tex_template)
+        key = _sha256(compilers[0], _compiler_version(compilers[0]), tex_template.documentclass, dumped)[:32]
+        if key in self._formats:
+            return self._formats[key]
+
+        directory = self.root / "formats"
+        fmt = directory / f"{key}.fmt"
+        failed = directory / f"{key}.failed"
+        if not fmt.exists() and not failed.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix="deck-fmt-") as workdir:
+                source = Path(workdir, f"{key}.tex")
+                source.write_text(
+                    "\n".join([tex_template.documentclass, dumped, _BEGIN_DOCUMENT, r"\end{document}"]),
+                    encoding="utf-8",
+                )
+                logger.info(f"Precompiling TeX format {fmt.name} for the {compilers[0]} preamble")
+                command = [
+                    compilers[0],
+                    "-ini",
+                    "-interaction=batchmode",
+                    "-halt-on-error",
+                    f"-jobname={key}",
+                    f"-output-directory={workdir}",
+                    f"&{compilers[0]}",
+                    "mylatexformat.ltx",
+                    source.name,
+                ]
+                result = subprocess.run(command, cwd=workdir, stdout=subprocess.DEVNULL)
+                built = Path(workdir, f"{key}.fmt")
+                if result.returncode == 0 and built.exists():
+                    tmp = fmt.with_name(f"{fmt.name}.{os.getpid()}.tmp")
+                    shutil.copyfile(built, tmp)
+                    os.replace(tmp, fmt)
+                else:
+                    logger.warning(
+                        f"Could not precompile a TeX format with {compilers[0]}; is mylatexformat installed? "
+                        f"Delete {failed} to try again."
+                    )
+                    failed.touch()
+        self._formats[key] = fmt if fmt.exists() else None
+        return self._formats[key]
+
+    def typeset_batch(self, requests, jobs=None):
+        """Typeset every missing ``(expression, environment, tex_template)`` request at once.
+
+        The requests are split into at most ``jobs`` documents per template,
+        with one expression per page, which are compiled concurrently.
+        """
+        missing = {}
+        for expression, environment, tex_template in requests:
+            tex_template = tex_template or config["tex_template"]
+            key = self.key(_tex_code(expression, environment, tex_template), tex_template)
+            if not self._svg_path(key).exists():
+                missing.setdefault(key, (expression, environment, tex_template))
+        if not missing:
+            return
+
+        by_template = {}
+        for key, request in missing.items():
+            by_template.setdefault(repr(request[2]), []).append((key, request))
+        jobs = jobs or os.cpu_count() or 1
+        chunks = []
+        for items in by_template.values():
+            batch_template = _batch_template(items[0][1][2])
+            if batch_template is not None:
+                self.format_file(batch_template)
+            size = math.ceil(len(items) / jobs)
+            chunks += [(batch_template, items[i:i + size]) for i in range(0, len(items), size)]
+
+        logger.info(f"Typesetting {len(missing)} TeX expressions in {len(chunks)} documents")
+        with ThreadPoolExecutor(jobs) as pool:
+            list(pool.map(lambda chunk: self._typeset_chunk(*chunk), chunks))
+
+    def _typeset_chunk(self, batch_template, items):
+        with tempfile.TemporaryDirectory(prefix="deck-tex-") as workdir:
+            pages = None
+            if batch_template is not None:
+                pages = self._compile_pages(batch_template, [request for _, request in items], Path(workdir))
+            if pages is None:
+                for _, request in items:
+                    self.svg_file(*request)
+                return
+            for (key, _), page in zip(items, pages):
+                self.store(key, page)
+
+    def _compile_pages(self, batch_template, requests, workdir):
+        pages = []
+        for expression, environment, _ in requests:
+            begin, end = _texcode_for_environment(environment) if environment is not None else ("", "")
+            pages.append("\n".join([r"\begin{standalone}", begin, expression, end, r"\end{standalone}"]))
+        body = "\n".join([_BEGIN_DOCUMENT, batch_template.post_doc_commands, *pages, _END_DOCUMENT])
+        output = self._typeset(body, batch_template, workdir)
+        if output is None:
+            return None
+
+        extension = batch_template.output_format
+        command = [
+            "dvisvgm",
+            *(["--pdf"] if extension == ".pdf" else []),
+            "--page=1-",
+            "--no-fonts",
+            "--verbosity=0",
+            f"--output={(workdir / 'page-%p.svg').as_posix()}",
+            output.as_posix(),
+        ]
+        subprocess.run(command, stdout=subprocess.DEVNULL)
+        files = sorted(workdir.glob("page-*.svg"), key=lambda file: int(file.stem[len("page-"):]))
+        if len(files) != len(requests):
+            logger.warning(f"Expected {len(requests)} pages of TeX output but got {len(files)}")
+            return None
+        return files
+
+    def _compile(self, tex_code, tex_template, workdir):
+        """Typeset ``tex_code`` with the template's format into ``workdir``, return the SVG or ``None``."""
+        body = tex_code[tex_code.index(_BEGIN_DOCUMENT):]
+        output = self._typeset(body, tex_template, workdir)
+        if output is None:
+            return None
+        return tex_file_writing.convert_to_svg(output, tex_template.output_format)
+
+    def _typeset(self, body, tex_template, workdir):
+        """Compile ``body`` with the template's format, return the output file or ``None``."""
+        fmt = self.format_file(tex_template)
+        if fmt is None:
+            return None
+        _, deferred = split_preamble(tex_template)
+        # mylatexformat skips the dumped preamble up to \endofdump
+        source = workdir / "expression.tex"
+        source.write_text(
+            "\n".join([tex_template.documentclass, r"\endofdump", deferred, body]),
+            encoding="utf-8",
+        )
+
+        compiler = _compilers(tex_template)[0]
+        output_format = tex_template.output_format
+        command = tex_file_writing.make_tex_compilation_command(compiler, output_format, source, workdir)
+        command.insert(1, f"-fmt={fmt.with_suffix('')}")
+        if subprocess.run(command, cwd=workdir, stdout=subprocess.DEVNULL).returncode != 0:
+            logger.warning(f"Compiling with the format {fmt.name} failed, falling back to a full run")
+            return None
+        return source.with_suffix(output_format)
+
+
+class _TexRequest(Exception):
+    pass
+
+
+def tex_request(tex_class, *args, **kwargs):
+    """Return the ``(expression, environment, tex_template)`` that ``tex_class(*args, **kwargs)`` would typeset.
+
+    The mobject is not built: its constructor is stopped as soon as it asks
+    for the SVG file, so the request matches what it will ask for later.
+    """
+
+    def record(expression, environment=None, tex_template=None):
+        raise _TexRequest(expression, environment, tex_template or config["tex_template"])
+
+    try:
+        with Patch(tex_mobject, tex_to_svg_file=record):
+            tex_class(*args, **kwargs)
+    except _TexRequest as request:
+        return request.args
+    raise ValueError(f"{tex_class.__name__}{args} does not typeset anything")
+
+
+def install_tex_cache(cache):
+    """Route every ``Tex`` and ``MathTex`` built through ``cache`` until the returned :class:`Patch` is closed."""
+    return Patch(tex_mobject, tex_to_svg_file=cache.svg_file)
+
+
+class TexCacheMixin(PatchesMixin):
+    """Typesets through the :class:`TexCache` of ``render_options.tex_cache``."""
+
+    def setup(self):
+        root = self.render_options.tex_cache
+        self.tex_cache = None if root is None else TexCache(root)
+        if self.tex_cache is not None:
+            self.patch(install_tex_cache(self.tex_cache))
+        super().setup()
+
+    def prepare_tex(self, *tex_strings, tex_class=MathTex, jobs=None, **kwargs):
+        """Typeset ``tex_class(string, **kwargs)`` for every string in one batch.
+
+        Call it at the top of ``construct`` with every expression the scene
+        will build, so that the constructors later only read the cache.
+        """
+        if self.tex_cache is None:
+            return
+        self.tex_cache.typeset_batch([tex_request(tex_class, string, **kwargs) for string in tex_strings], jobs)
@@ -0,0 +1,106 @@
+"""Memo of shaped :class:`~manim.Text` objects.
+
+Every ``Text(...)`` lays its string out with Pango, writes an SVG and parses
+it back into glyph paths, even when an identical ``Text`` was built a moment
+ago. While :func:`install_text_cache` is in effect, the first construction of a
+given string and style is kept as a prototype and later ones are deep copies
+of it. Prototypes are also pickled to a directory shared by every checkout
+(``DECK_TEXT_CACHE``), so each title is shaped once per machine.
+"""
+
+import hashlib
+import os
+import pickle
+from importlib import metadata
+from pathlib import Path
+
+from manim import Text, config, logger
+
+from .patches import Patch, PatchesMixin
+
+_original_init = Text.__init__
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+class TextCache:
+    """Prototypes of shaped ``Text`` objects, in memory and on disk."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.prototypes = {}
+
+    def key(self, text, kwargs):
+        """Return the key of ``Text(text, **kwargs)``, or ``None`` if it cannot be cached."""
+        description = repr((text, sorted(kwargs.items())))
+        if " at 0x" in description:
+            return None
+        return hashlib.sha256(
+            "\0".join([
+                description,
+                str(config.renderer),
+                _version("manim"),
+                _version("manimpango"),
+            ]).encode()
+        ).hexdigest()
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def lookup(self, key):
+        if key in self.prototypes:
+            return self.prototypes[key]
+        try:
+            with self._path(key).open("rb") as file:
+                prototype = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+            return None
+        self.prototypes[key] = prototype
+        return prototype
+
+    def store(self, key, text):
+        prototype = text.copy()
+        self.prototypes[key] = prototype
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as file:
+                pickle.dump(prototype, file)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            logger.debug(f"Text {text.original_text!r} is only cached in memory: {error}")
+            tmp.unlink(missing_ok=True)
+            return
+        os.replace(tmp, path)
+
+
+def install_text_cache(cache):
+    """Make every ``Text`` a copy of a cached prototype when one exists, until the returned :class:`Patch` is closed."""
+
+    def __init__(self, text, *args, **kwargs):
+        key = None if args or type(self) is not Text else cache.key(text, kwargs)
+        prototype = None if key is None else cache.lookup(key)
+        if prototype is not None:
+            self.__dict__.update(prototype.copy().__dict__)
+            return
+        _original_init(self, text, *args, **kwargs)
+        if key is not None:
+            cache.store(key, self)
+
+    return Patch(Text, __init__=__init__)
+
+
+class TextCacheMixin(PatchesMixin):
+    """Builds ``Text`` through the :class:`TextCache` of ``render_options.text_cache``."""
+
+    def setup(self):
+        root = self.render_options.text_cache
+        self.text_cache = None if root is None else TextCache(root)
+        if self.text_cache is not None:
+            self.patch(install_text_cache(self.text_cache))
+        super().setup()
@@ -1,7 +1,10 @@
-from manim_slides import Slide
+from collections import OrderedDict
+
 from manim import *
 from MF_Tools import *
-from manim.utils.space_ops import normalize
+
+from doppler import Listener, emission_times, wavefronts
+from render_tools import DeckSlide
 
 # Greek text template
 
@@ -13,9 +16,320 @@ greek.add_to_preamble(r"""
 \setdefaultlanguage{greek}
 """)
 
-class DopplerEffect(Slide, MovingCameraScene):
+class SpeedLabel(VGroup):
+    """Speed readout that re-typesets only when its displayed digits change.
+
+    The value is quantized to ``precision`` decimals, and every formatted
+    string is typeset once and kept in an LRU cache shared by all labels.
+    """
+
+    cache = OrderedDict()
+    cache_size = 128
+
+    def __init__(self, symbol, value, anchor, precision=2, direction=UP, font_size=36, color=GREEN, **kwargs):
+        super().__init__(**kwargs)
+        self.symbol = symbol
+        self.value = value
+        self.anchor = anchor
+        self.precision = precision
+        self.direction = direction
+        self.label_font_size = font_size
+        self.label_color = color
+        self.text = None
+        self.anchor_center = None
+
+        self.refresh()
+        self.add_updater(lambda m: m.refresh())
+        # Nothing to do while neither the value nor the anchor moves
+        self.updater_inputs = [anchor, value]
+
+    def __deepcopy__(self, memo):
+        memo[id(self.anchor)] = self.anchor  # Copies made by Write keep following the same arrow
+        return super().__deepcopy__(memo)
+
+    @staticmethod
+    def format_value(symbol, value, precision):
+        value = round(value, precision) + 0  # Avoids printing -0.00
+        return rf"{symbol} = {value:.{precision}f}"
+
+    @classmethod
+    def variants(cls, symbol, max_value, precision=2):
+        """Every text a label shows for values between 0 and ``max_value``, to typeset in advance."""
+        steps = round(max_value * 10**precision)
+        return [cls.format_value(symbol, step / 10**precision, precision) for step in range(steps + 1)]
+
+    def format(self, value):
+        return self.format_value(self.symbol, value, self.precision)
+
+    def typeset(self, text):
+        key = (text, self.label_font_size, str(self.label_color))
+        if key in SpeedLabel.cache:
+            SpeedLabel.cache.move_to_end(key)
+        else:
+            SpeedLabel.cache[key] = MathTex(text, font_size=self.label_font_size, color=self.label_color)
+            if len(SpeedLabel.cache) > SpeedLabel.cache_size:
+                SpeedLabel.cache.popitem(last=False)
+        return SpeedLabel.cache[key]
+
+    def refresh(self):
+        text = self.format(self.value())
+        if text != self.text:
+            self.text = text
+            self.submobjects = self.typeset(text).copy().submobjects
+            self.anchor_center = None
+
+        anchor_center = self.anchor.get_center()
+        if self.anchor_center is None or not np.array_equal(anchor_center, self.anchor_center):
+            self.next_to(self.anchor, self.direction)
+            self.anchor_center = anchor_center
+        return self
+
+class WaveField(VGroup):
+    """Wavefronts emitted every ``wave_interval`` seconds, as a function of scene time.
+
+    ``clock`` returns the current scene time and each ``start()`` begins a
+    burst of emissions from ``source``, a function returning the emitter's
+    positions at an array of scene times. The rings shown at time ``t`` are
+    worked out from ``t`` alone by :mod:`doppler`, so no state is carried
+    from one frame to the next and the same time gives the same frame at any
+    frame rate. All rings are drawn from a single unit-circle path.
+    """
+
+    def __init__(self, clock, source, wave_interval, wave_speed, wave_lifetime, start_radius=0.05, color=WHITE, stroke_width=DEFAULT_STROKE_WIDTH, **kwargs):
+        super().__init__(**kwargs)
+        self.clock = clock
+        self.source = source
+        self.wave_interval = wave_interval
+        self.wave_speed = wave_speed
+        self.wave_lifetime = wave_lifetime
+        self.start_radius = start_radius
+
+        slots = int(np.ceil(wave_lifetime / wave_interval)) + 1
+        self.template = Circle(radius=1).points
+        self.add(*[VMobject(stroke_color=color, stroke_width=stroke_width) for _ in range(slots)])
+
+        # Plain lists of times, so that checkpoints save them
+        self.burst_starts = []
+        self.burst_ends = []
+        self.burst_sources = []
+        self.add_updater(lambda m: m.show(m.clock()))
+
+    def __deepcopy__(self, memo):
+        memo[id(self.clock)] = self.clock  # Copies made by FadeOut keep reading the scene's clock
+        return super().__deepcopy__(memo)
+
+    def start(self, duration, source=None):
+        now = self.clock()
+        self.burst_starts.append(now)
+        self.burst_ends.append(now + duration)
+        self.burst_sources.append(source or self.source)
+        return self
+
+    def stop(self):
+        now = self.clock()
+        self.burst_ends = [min(end, now) for end in self.burst_ends]
+        return self
+
+    def rings(self, t):
+        """Return the emission times, centres and radii of the wavefronts alive at scene time ``t``."""
+        emitted, centers, radii = [np.zeros(0)], [np.zeros((0, 3))], [np.zeros(0)]
+        for start, end, source in zip(self.burst_starts, self.burst_ends, self.burst_sources):
+            burst = emission_times(t, start, end, self.wave_interval, self.wave_lifetime)
+            burst_centers, burst_radii = wavefronts(t, burst, source, self.wave_speed)
+            emitted.append(burst)
+            centers.append(burst_centers)
+            radii.append(burst_radii)
+        return np.concatenate(emitted), np.concatenate(centers), np.concatenate(radii)
+
+    def show(self, t):
+        emitted, centers, radii = self.rings(t)
+        radii = self.start_radius + radii
+        opacities = np.clip(1 - (t - emitted) / self.wave_lifetime, 0, 1)
+        points = centers[:, None, :] + radii[:, None, None] * self.template
+
+        while len(self.submobjects) < len(emitted):
+            self.add(self.submobjects[0].copy())
+        for index, ring in enumerate(self.submobjects):
+            if index < len(emitted):
+                ring.points = points[index]
+                ring.set_stroke(opacity=opacities[index])
+            elif len(ring.points):
+                ring.clear_points()
+        return self
+
+class MotionProfile:
+    """Constant acceleration for ``accel_time`` seconds, then cruise at ``final_speed``.
+
+    ``distance`` and ``speed`` accept scalars or arrays of timestamps.
+    ``precompute`` tabulates the trajectory on the frame grid so that the
+    ``*_at`` lookups used by updaters are O(1) on frame timestamps, falling
+    back to the closed form anywhere else.
+    """
+
+    def __init__(self, accel_time, final_speed, direction=RIGHT, start=ORIGIN):
+        self.accel_time = accel_time
+        self.final_speed = final_speed
+        self.direction = np.asarray(direction, dtype=float)
+        self.start = np.asarray(start, dtype=float)
+        self.fps = None
+        self.points = None
+        self.speeds = None
+
+    def distance(self, t):
+        t = np.maximum(np.asarray(t, dtype=float), 0)
+        a = self.final_speed / self.accel_time
+        return np.where(
+            t < self.accel_time,
+            0.5 * a * t**2,
+            0.5 * self.final_speed * self.accel_time + self.final_speed * (t - self.accel_time)
+        )
+
+    def speed(self, t):
+        t = np.maximum(np.asarray(t, dtype=float), 0)
+        return np.minimum(self.final_speed / self.accel_time * t, self.final_speed)
+
+    def point(self, t):
+        return self.start + np.multiply.outer(self.distance(t), self.direction)
+
+    def precompute(self, duration, fps=None):
+        self.fps = fps or config.frame_rate
+        times = np.arange(int(np.ceil(duration * self.fps)) + 1) / self.fps
+        self.points = self.point(times)
+        self.speeds = self.speed(times)
+        return self
+
+    def frame_index(self, t):
+        if self.fps is None:
+            return None
+        frame = t * self.fps
+        index = round(frame)
+        if 0 <= index < len(self.speeds) and abs(frame - index) < 1e-6:
+            return index
+        return None
+
+    def point_at(self, t):
+        index = self.frame_index(t)
+        return self.point(t) if index is None else self.points[index]
+
+    def speed_at(self, t):
+        index = self.frame_index(t)
+        return float(self.speed(t)) if index is None else self.speeds[index]
+
+class RelativeVelocityDemo(Mobject):
+    """Dots A and B speeding up to a cruise speed, with velocity arrows and speed readouts.
+
+    Each dot follows a :class:`MotionProfile` from its start point and
+    ``follow`` keeps the camera on B. Arrows are copies of templates shared
+    by every demo and readouts come from the :class:`SpeedLabel` cache, so
+    once the first demo has run the next ones only cost their frames.
+
+    It is a mobject, never drawn, so that checkpoints match its dots like
+    the local variables of ``construct``.
+    """
+
+    arrows = {}
+    arrow_length = 0.75
+    gap_factor = 2
+
+    def __init__(self, scene, a_start, a_direction, a_speed, b_start, b_direction, b_speed, duration, accel_time=1.5, follow=False, **kwargs):
+        super().__init__(**kwargs)
+        self.scene = scene
+        self.run_time = duration
+        self.follow = follow
+        self.a_motion = MotionProfile(accel_time, a_speed, a_direction, a_start).precompute(duration)
+        self.b_motion = MotionProfile(accel_time, b_speed, b_direction, b_start).precompute(duration)
+        self.a_dot = Dot(a_start, color=RED)
+        self.b_dot = Dot(b_start, color=BLUE)
+        self.stopwatch = scene.stopwatch()
+        self.a_arrow = self.b_arrow = self.a_label = self.b_label = None
+
+    def __deepcopy__(self, memo):
+        memo[id(self.scene)] = self.scene
+        return super().__deepcopy__(memo)
+
+    @classmethod
+    def arrow(cls, direction):
+        key = tuple(np.round(direction, 6))
+        if key not in cls.arrows:
+            cls.arrows[key] = Arrow(start=ORIGIN, end=direction * cls.arrow_length, buff=0, color=GREEN)
+        return cls.arrows[key].copy()
+
+    def markers(self):
+        """Return new dots at the start points of A and B."""
+        return Dot(self.a_motion.start, color=RED), Dot(self.b_motion.start, color=BLUE)
+
+    def attach(self, dot, motion, symbol):
+        """Move ``dot`` along ``motion`` and return its arrow and speed readout."""
+        position = lambda: motion.point_at(self.stopwatch.elapsed())
+        dot.add_updater(lambda m: m.move_to(position()))
+        self.scene.depends_on(dot, position)
+        arrow = self.arrow(motion.direction)
+        gap = dot.radius * self.gap_factor
+        arrow.add_updater(lambda m: m.put_start_and_end_on(
+            dot.get_center() + motion.direction * gap,
+            dot.get_center() + motion.direction * (gap + self.arrow_length)))
+        self.scene.depends_on(arrow, dot)
+        label = SpeedLabel(symbol, lambda: motion.speed_at(self.stopwatch.elapsed()), arrow)
+        return arrow, label
+
+    def run(self):
+        """Play the motion, bring back dots at the start points and return them."""
+        scene = self.scene
+        frame = scene.camera.frame
+        if self.follow:
+            follow_updater = lambda mob: mob.move_to(self.b_dot.get_center())
+            frame.save_state()
+            scene.play(scene.camera.auto_zoom(self.b_dot, margin=8))
+            frame.add_updater(follow_updater)
+
+        self.a_arrow, self.a_label = self.attach(self.a_dot, self.a_motion, r"\upsilon_A")
+        self.b_arrow, self.b_label = self.attach(self.b_dot, self.b_motion, r"\upsilon_B")
+        overlays = (self.a_arrow, self.b_arrow, self.a_label, self.b_label)
+        scene.play(*[Write(overlay) for overlay in overlays])
+        scene.add(*overlays)
+
+        self.stopwatch.start()
+        scene.wait(self.run_time)
+
+        markers = self.markers()
+        scene.play(*[FadeIn(marker) for marker in markers])
+        if self.follow:
+            frame.remove_updater(follow_updater)
+            scene.play(Restore(frame))
+
+        # Remove updaters after animation is done
+        for mobject in (self.a_dot, self.b_dot, *overlays):
+            mobject.clear_updaters()
+        scene.remove(*overlays)
+        return markers
+
+class DopplerEffect(DeckSlide, MovingCameraScene):
     def construct(self):
 
+        # Typeset every formula of the scene in one batch; anything missing here
+        # is still typeset when it is built
+        self.prepare_tex(
+            r"\overrightarrow{\upsilon_{AB}} =  \overrightarrow{\upsilon_A} + \overrightarrow{\upsilon_B} ",
+            r"\overrightarrow{\upsilon_{AB}} =  \overrightarrow{\upsilon_A} - \overrightarrow{\upsilon_B} ",
+            r"\upsilon = \lambda f",
+            r"\upsilon'_s = \lambda' f_s",
+            r"\upsilon - \upsilon_s = \lambda' f_s",
+            r"\frac{\upsilon - \upsilon_s}{f_s} = \lambda'",
+            r"\upsilon'_o = \lambda' f_o",
+            r"\upsilon + \upsilon_o = \lambda' f_o",
+            r"\frac{\upsilon + \upsilon_o}{\lambda'} = f_o",
+            r"\frac{\upsilon + \upsilon_o}{\frac{\upsilon - \upsilon_s}{f_s}} = f_o",
+            r"\frac{\upsilon + \upsilon_o}{\upsilon - \upsilon_s}f_s = f_o",
+            r"\upsilon + \upsilon_o > \upsilon - \upsilon_s",
+            r"\frac{\upsilon + \upsilon_o}{\upsilon - \upsilon_s} > 1",
+            r"\frac{\upsilon - \upsilon_o}{\upsilon + \upsilon_s}f_s = f_o",
+            r"\frac{\upsilon - \upsilon_o}{\upsilon + \upsilon_s} < 1",
+            r"\frac{\upsilon \pm \upsilon_o}{\upsilon \mp \upsilon_s}f_s = f_o",
+            *SpeedLabel.variants(r"\upsilon_A", 3),
+            *SpeedLabel.variants(r"\upsilon_B", 3),
+            *SpeedLabel.variants("f_o", 10, precision=1),
+        )
+
         # Title screen
         title = Text("Το Φαινόμενο Doppler", font_size=48)
         title.set_color_by_gradient(BLUE, LIGHT_PINK, RED)
@@ -44,6 +358,7 @@ class DopplerEffect(Slide, MovingCameraScene):
         self.play(Write(car_text))
         self.play(Write(pedestrian_text))
         self.next_slide()
+        # bench: wave-emission
         self.next_slide(loop = True) #LOOOOOP LOOOOP LOOOOP
 
         wave_interval = 0.4
@@ -51,50 +366,15 @@ class DopplerEffect(Slide, MovingCameraScene):
         wave_lifetime = 4.5
         emission_duration = 20
 
-        wave_group = VGroup()
-        self.add(wave_group)
+        # The old per-frame rescale grew each ring's diameter at wave_speed
+        emitter = red_dot.get_center()
+        wave_field = WaveField(self.now, lambda t: emitter, wave_interval, wave_speed / 2, wave_lifetime)
+        self.add(wave_field)
+        wave_field.start(emission_duration)
 
-        start_emission_time = self.time
-        emission_active = True
-        last_emission_time = ValueTracker(0)
-
-        def emit_waves():
-            wave = Circle(radius=0.05, color=WHITE, stroke_opacity=0.6)
-            wave.move_to(red_dot.get_center())
-            age = ValueTracker(0)
-
-            def update_wave(m, dt):
-                age.increment_value(dt)
-                m.scale(1 + wave_speed * dt / m.width)
-                fade_ratio = max(0, 1 - age.get_value() / wave_lifetime)
-                m.set_stroke(opacity=fade_ratio)
-                if fade_ratio <= 0:
-                    m.clear_updaters()
-                    wave_group.remove(m)
-                    m.remove()
-
-            wave.add_updater(update_wave)
-            wave_group.add(wave)
-            self.add(wave)
-
-        def continuous_emission(mob, dt):
-            nonlocal emission_active
-            current_time = self.time
-            if current_time - start_emission_time >= emission_duration:
-                emission_active = False
-            if emission_active and current_time >= 0.1 and current_time - last_emission_time.get_value() >= wave_interval:
-                emit_waves()
-                last_emission_time.set_value(current_time)
-
-        dummy_emission = Vector().set_opacity(0)
-        dummy_emission.add_updater(continuous_emission)
-        self.add(dummy_emission)
-
-        self.wait(emission_duration + wave_lifetime + 1)
+        self.wait_loop(emission_duration + wave_lifetime + 1)
 
         self.next_slide()
-        dummy_emission.remove_updater(continuous_emission)
-        self.remove(dummy_emission)
 
         # Doppler effect simulation (motion + emission)
         self.next_slide()
@@ -108,54 +388,48 @@ class DopplerEffect(Slide, MovingCameraScene):
         final_velocity = movement_distance / movement_duration
         pedestrian_final_velocity = pedestrian_distance / movement_duration
 
-        start_emission_time = self.time
-        last_emission_time.set_value(0)
-        emission_active = True
-
-        dummy_emission.add_updater(continuous_emission)
-        self.add(dummy_emission)
-
-        time_tracker = ValueTracker(0)
-        self.add(time_tracker)
-        time_tracker.add_updater(lambda m, dt: m.increment_value(dt))
-
-        def red_position(t):
-            if t < acceleration_duration:
-                a = final_velocity / acceleration_duration
-                return 0.5 * a * t**2
-            else:
-                return (0.5 * final_velocity * acceleration_duration) + final_velocity * (t - acceleration_duration)
-
-        def pedestrian_position(t):
-            if t < acceleration_duration:
-                a = pedestrian_final_velocity / acceleration_duration
-                return -0.5 * a * t**2
-            else:
-                return -((0.5 * pedestrian_final_velocity * acceleration_duration) + pedestrian_final_velocity * (t - acceleration_duration))
-
-        red_start = LEFT * 5
-        pedestrian_start = DOWN * 2 + RIGHT * 1.5
+        motion_time = self.stopwatch().start()
+
+        motion_duration = movement_duration + wave_lifetime + 15
+        red_motion = MotionProfile(acceleration_duration, final_velocity, RIGHT, LEFT * 5).precompute(motion_duration)
+        pedestrian_motion = MotionProfile(acceleration_duration, pedestrian_final_velocity, LEFT, DOWN * 2 + RIGHT * 1.5).precompute(motion_duration)
+
+        wave_field.start(emission_duration, source=lambda t: red_motion.point(motion_time.elapsed(t)))
+
+        # What the pedestrian hears, from the same wavefronts as the ones drawn
+        listener = Listener(
+            red_motion.point, pedestrian_motion.point, wave_field.wave_speed, 1 / wave_interval, 0, emission_duration
+        ).precompute(0, motion_duration, config.frame_rate)
+        observed_label = SpeedLabel(
+            "f_o",
+            lambda: listener.frequency_at(motion_time.elapsed()),
+            blue_dot,
+            precision=1,
+            direction=DOWN,
+            color=BLUE
+        )
+        self.add(observed_label)
 
         red_dot.add_updater(
-            lambda m: m.move_to(red_start + RIGHT * red_position(time_tracker.get_value()))
+            lambda m: m.move_to(red_motion.point_at(motion_time.elapsed()))
         )
         car_text.add_updater(
             lambda m: m.next_to(red_dot, UP)
         )
+        self.depends_on(car_text, red_dot)
 
         blue_dot.add_updater(
-            lambda m: m.move_to(pedestrian_start + RIGHT * pedestrian_position(time_tracker.get_value()))
+            lambda m: m.move_to(pedestrian_motion.point_at(motion_time.elapsed()))
         )
         pedestrian_text.add_updater(
             lambda m: m.next_to(blue_dot, UP)
         )
+        self.depends_on(pedestrian_text, blue_dot)
 
-        self.wait(movement_duration + wave_lifetime + 15)
-        emission_active = False
-        dummy_emission.remove_updater(continuous_emission)
-        self.remove(dummy_emission)
+        self.wait(motion_duration)
+        wave_field.stop()
 
-        self.play(FadeOut(wave_group))
+        self.play(FadeOut(wave_field), FadeOut(observed_label))
 
         # Static post-motion scene
         red_dot_fake = Dot(color=RED).shift(LEFT * 5)
@@ -178,8 +452,7 @@ class DopplerEffect(Slide, MovingCameraScene):
             FadeOut(red_dot_fake),
             FadeOut(car_text_fake),
             FadeOut(f_blue_dot),
-            FadeOut(f_pedestrian_text),
-            *[FadeOut(wave) for wave in wave_group]
+            FadeOut(f_pedestrian_text)
         )
 
         d_proof = Text("Ευθεία Aπόδειξη", font_size=48)
@@ -194,242 +467,31 @@ class DopplerEffect(Slide, MovingCameraScene):
     
         taxitita = Text("Κανονική Ταχύτητα", font_size=36).shift(UP * 3)
 
-        a_dot = Dot(color=RED).shift(UP * 1).shift(LEFT * 5)
-        b_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 5)
-        self.play(FadeIn(a_dot), FadeIn(b_dot), FadeIn(taxitita))
+        demo = RelativeVelocityDemo(self, UP * 1 + LEFT * 5, RIGHT, 2, DOWN * 1 + RIGHT * 5, LEFT, 3, duration=4 + 2.5)
+        self.play(FadeIn(demo.a_dot), FadeIn(demo.b_dot), FadeIn(taxitita))
         self.next_slide()
+        # bench: relative-velocity
         self.next_slide(loop = True)
 
-        accel_time = 1.5
-        total_move_time = 4
-        afinal_speed = 2
-        bfinal_speed = 3
-
-        lemma_tracker = ValueTracker(0)
-        self.add(lemma_tracker)
-
-
-        def a_dot_pos(t):
-            if t < accel_time:
-                a = afinal_speed / accel_time
-                return RIGHT * (0.5 * a * t**2)
-            else:
-                return RIGHT * ((0.5 * afinal_speed * accel_time) + afinal_speed * (t - accel_time))
-
-        def b_dot_pos(t):
-            if t < accel_time:
-                a = bfinal_speed / accel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * bfinal_speed * accel_time) + bfinal_speed * (t - accel_time))
-
-        def a_dot_vel(t):
-            if t < accel_time:
-                a = afinal_speed / accel_time
-                return a * t
-            else:
-                return afinal_speed
-
-        def b_dot_vel(t):
-            if t < accel_time:
-                a = bfinal_speed / accel_time
-                return a * t
-            else:
-                return bfinal_speed
-
-        a_dot.add_updater(lambda m: m.move_to(UP * 1 + LEFT * 5 + a_dot_pos(lemma_tracker.get_value())))
-        b_dot.add_updater(lambda m: m.move_to(DOWN * 1 + RIGHT * 5 + b_dot_pos(lemma_tracker.get_value())))
-
-        arrow_length = 0.75
-        a_arrow = Arrow(start=ORIGIN, end=RIGHT * arrow_length, buff=0, color=GREEN)
-        b_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-
-        self.text_color = GREEN  # Initial color
-
-        a_speed_text = MathTex(
-            rf"\upsilon_A = {a_dot_vel(lemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(a_arrow, UP)
-
-        b_speed_text = MathTex(
-            rf"\upsilon_B = {b_dot_vel(lemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(b_arrow, UP)
-
-        gap_factor = 2
-        a_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            a_dot.get_center() + normalize(RIGHT) * a_dot.radius * gap_factor,
-            a_dot.get_center() + normalize(RIGHT) * (a_dot.radius * gap_factor + arrow_length)))
-        b_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            b_dot.get_center() + normalize(LEFT) * b_dot.radius * gap_factor,
-            b_dot.get_center() + normalize(LEFT) * (b_dot.radius * gap_factor + arrow_length)))
-
-        # Add updaters to the text to dynamically update its position and content
-        a_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_A = {a_dot_vel(lemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(a_arrow, UP)
-        ))
-
-        b_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_B = {b_dot_vel(lemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(b_arrow, UP)
-        ))
-
-        
-        self.play(Write(a_arrow), Write(b_arrow), Write(a_speed_text), Write(b_speed_text))
-        self.add(a_arrow, b_arrow, a_speed_text, b_speed_text)
-
-        lemma_tracker.add_updater(lambda m, dt: m.increment_value(dt))
-
-        self.wait(total_move_time + 2.5)
-
-        fa_dot = Dot(color=RED).shift(UP * 1).shift(LEFT * 5)
-        fb_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 5)
-        self.play(FadeIn(fa_dot), FadeIn(fb_dot))
-        
-
-        # Remove updaters after animation is done
-        a_dot.clear_updaters()
-        b_dot.clear_updaters()
-        a_arrow.clear_updaters()
-        b_arrow.clear_updaters()
-        a_speed_text.clear_updaters()
-        b_speed_text.clear_updaters()
-        self.remove(a_arrow, b_arrow, a_speed_text, b_speed_text)
-        self.remove(a_dot, b_dot)
+        fa_dot, fb_dot = demo.run()
+        self.remove(demo.a_dot, demo.b_dot)
 
         self.next_slide()
         ataxitita = Text("Σχετική Ταχύτητα", font_size=36).shift(UP * 3)
-        
-        aa_dot = Dot(color=RED).shift(UP * 1).shift(LEFT * 5)
-        ab_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 5)
-        self.play(FadeIn(aa_dot), FadeIn(ab_dot), ReplacementTransform(taxitita, ataxitita))
-        self.play(FadeOut(fa_dot), FadeOut(fb_dot), FadeOut(a_dot), FadeOut(b_dot))
+
+        ademo = RelativeVelocityDemo(self, UP * 1 + LEFT * 5, RIGHT, 2, DOWN * 1 + RIGHT * 5, LEFT, 3, duration=4 + 1, follow=True)
+        self.play(FadeIn(ademo.a_dot), FadeIn(ademo.b_dot), ReplacementTransform(taxitita, ataxitita))
+        self.play(FadeOut(fa_dot), FadeOut(fb_dot), FadeOut(demo.a_dot), FadeOut(demo.b_dot))
 
         self.next_slide()
+        # bench: camera-follow
         self.next_slide(loop = True)
-        follow_updater = lambda mob: mob.move_to(ab_dot.get_center())
-        self.camera.frame.save_state()
-
-        self.play(self.camera.auto_zoom(ab_dot, margin=8))
-        self.camera.frame.add_updater(follow_updater)
-
-        aaccel_time = 1.5
-        atotal_move_time = 4
-        aafinal_speed = 2
-        abfinal_speed = 3
-
-        alemma_tracker = ValueTracker(0)
-        self.add(alemma_tracker)
-
-        def aa_dot_pos(t):
-            if t < aaccel_time:
-                a = aafinal_speed / aaccel_time
-                return RIGHT * (0.5 * a * t**2)
-            else:
-                return RIGHT * ((0.5 * aafinal_speed * aaccel_time) + aafinal_speed * (t - aaccel_time))
-
-        def ab_dot_pos(t):
-            if t < aaccel_time:
-                a = abfinal_speed / aaccel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * abfinal_speed * aaccel_time) + abfinal_speed * (t - aaccel_time))
-
-        def aa_dot_vel(t):
-            if t < aaccel_time:
-                a = aafinal_speed / aaccel_time
-                return a * t
-            else:
-                return aafinal_speed
-
-        def ab_dot_vel(t):
-            if t < aaccel_time:
-                a = abfinal_speed / aaccel_time
-                return a * t
-            else:
-                return abfinal_speed
-
-        aa_dot.add_updater(lambda m: m.move_to(UP * 1 + LEFT * 5 + aa_dot_pos(alemma_tracker.get_value())))
-        ab_dot.add_updater(lambda m: m.move_to(DOWN * 1 + RIGHT * 5 + ab_dot_pos(alemma_tracker.get_value())))
-
-        aa_arrow = Arrow(start=ORIGIN, end=RIGHT * arrow_length, buff=0, color=GREEN)
-        ab_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-
-        self.text_color = GREEN  # Initial color
-
-        aa_speed_text = MathTex(
-            rf"\upsilon_A = {aa_dot_vel(alemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(aa_arrow, UP)
-
-        ab_speed_text = MathTex(
-            rf"\upsilon_B = {ab_dot_vel(alemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(ab_arrow, UP)
-
-        gap_factor = 2
-        aa_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            aa_dot.get_center() + normalize(RIGHT) * aa_dot.radius * gap_factor,
-            aa_dot.get_center() + normalize(RIGHT) * (aa_dot.radius * gap_factor + arrow_length)))
-        ab_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            ab_dot.get_center() + normalize(LEFT) * ab_dot.radius * gap_factor,
-            ab_dot.get_center() + normalize(LEFT) * (ab_dot.radius * gap_factor + arrow_length)))
-
-        # Add updaters to the text to dynamically update its position and content
-        aa_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_A = {aa_dot_vel(alemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(aa_arrow, UP)
-        ))
-
-        ab_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_B = {ab_dot_vel(alemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(ab_arrow, UP)
-        ))
-        
-
-        self.play(Write(aa_arrow), Write(ab_arrow), Write(aa_speed_text), Write(ab_speed_text))
-        self.add(aa_arrow, ab_arrow, aa_speed_text, ab_speed_text)
-
-        alemma_tracker.add_updater(lambda m, dt: m.increment_value(dt))
-
-        self.wait(atotal_move_time + 1)
 
-        afa_dot = Dot(color=RED).shift(UP * 1).shift(LEFT * 5)
-        afb_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 5)
-        self.play(FadeIn(afa_dot), FadeIn(afb_dot))
-
-        self.camera.frame.remove_updater(follow_updater)
-
-        self.play(Restore(self.camera.frame))
-        # Remove updaters after animation is done
-        aa_dot.clear_updaters()
-        ab_dot.clear_updaters()
-        aa_arrow.clear_updaters()
-        ab_arrow.clear_updaters()
-        aa_speed_text.clear_updaters()
-        ab_speed_text.clear_updaters()
-        self.remove(aa_arrow, ab_arrow, aa_speed_text, ab_speed_text)
+        afa_dot, afb_dot = ademo.run()
 
         self.next_slide()
 
-        self.play(FadeOut(afa_dot), FadeOut(afb_dot), FadeOut(aa_dot), FadeOut(ab_dot))
+        self.play(FadeOut(afa_dot), FadeOut(afb_dot), FadeOut(ademo.a_dot), FadeOut(ademo.b_dot))
 
         f = MathTex(r"\overrightarrow{\upsilon_{AB}} =  \overrightarrow{\upsilon_A} + \overrightarrow{\upsilon_B} ")
 
@@ -441,117 +503,13 @@ class DopplerEffect(Slide, MovingCameraScene):
 
         ztaxitita = Text("Κανονική Ταχύτητα", font_size=36).shift(UP * 3)
 
-        za_dot = Dot(color=RED).shift(UP * 1).shift(RIGHT * 5)
-        zb_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 3)
-        self.play(FadeIn(za_dot), FadeIn(zb_dot), FadeIn(ztaxitita))
+        zdemo = RelativeVelocityDemo(self, UP * 1 + RIGHT * 5, LEFT, 3, DOWN * 1 + RIGHT * 3, LEFT, 2, duration=4 + 2.5)
+        self.play(FadeIn(zdemo.a_dot), FadeIn(zdemo.b_dot), FadeIn(ztaxitita))
         self.next_slide()
         self.next_slide(loop = True)
 
-        zaccel_time = 1.5
-        ztotal_move_time = 4
-        zafinal_speed = 3
-        zbfinal_speed = 2
-
-        zlemma_tracker = ValueTracker(0)
-        self.add(zlemma_tracker)
-
-
-        def za_dot_pos(t):
-            if t < zaccel_time:
-                a = zafinal_speed / zaccel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * zafinal_speed * zaccel_time) + zafinal_speed * (t - zaccel_time))
-
-        def zb_dot_pos(t):
-            if t < zaccel_time:
-                a = zbfinal_speed / zaccel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * zbfinal_speed * zaccel_time) + zbfinal_speed * (t - zaccel_time))
-
-        def za_dot_vel(t):
-            if t < zaccel_time:
-                a = zafinal_speed / zaccel_time
-                return a * t
-            else:
-                return zafinal_speed
-
-        def zb_dot_vel(t):
-            if t < zaccel_time:
-                a = zbfinal_speed / zaccel_time
-                return a * t
-            else:
-                return zbfinal_speed
-
-        za_dot.add_updater(lambda m: m.move_to(UP * 1 + RIGHT * 5 + za_dot_pos(zlemma_tracker.get_value())))
-        zb_dot.add_updater(lambda m: m.move_to(DOWN * 1 + RIGHT * 3 + zb_dot_pos(zlemma_tracker.get_value())))
-
-        arrow_length = 0.75
-        za_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-        zb_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-
-        self.text_color = GREEN  # Initial color
-
-        za_speed_text = MathTex(
-            rf"\upsilon_A = {za_dot_vel(zlemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(za_arrow, UP)
-
-        zb_speed_text = MathTex(
-            rf"\upsilon_B = {zb_dot_vel(zlemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(zb_arrow, UP)
-
-        gap_factor = 2
-        za_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            za_dot.get_center() + normalize(LEFT) * za_dot.radius * gap_factor,
-            za_dot.get_center() + normalize(LEFT) * (za_dot.radius * gap_factor + arrow_length)))
-        zb_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            zb_dot.get_center() + normalize(LEFT) * zb_dot.radius * gap_factor,
-            zb_dot.get_center() + normalize(LEFT) * (zb_dot.radius * gap_factor + arrow_length)))
-
-        # Add updaters to the text to dynamically update its position and content
-        za_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_A = {za_dot_vel(zlemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(za_arrow, UP)
-        ))
-
-        zb_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_B = {zb_dot_vel(zlemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(zb_arrow, UP)
-        ))
-
-        
-        self.play(Write(za_arrow), Write(zb_arrow), Write(za_speed_text), Write(zb_speed_text))
-        self.add(za_arrow, zb_arrow, za_speed_text, zb_speed_text)
-
-        zlemma_tracker.add_updater(lambda m, dt: m.increment_value(dt))
-
-        self.wait(ztotal_move_time + 2.5)
-
-        zfa_dot = Dot(color=RED).shift(UP * 1).shift(RIGHT * 5)
-        zfb_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 3)
-        self.play(FadeIn(zfa_dot), FadeIn(zfb_dot))
-        
-
-        # Remove updaters after animation is done
-        za_dot.clear_updaters()
-        zb_dot.clear_updaters()
-        za_arrow.clear_updaters()
-        zb_arrow.clear_updaters()
-        za_speed_text.clear_updaters()
-        zb_speed_text.clear_updaters()
-        self.remove(za_arrow, zb_arrow, za_speed_text, zb_speed_text)
-        self.remove(za_dot, zb_dot)
+        zfa_dot, zfb_dot = zdemo.run()
+        self.remove(zdemo.a_dot, zdemo.b_dot)
 
         self.next_slide()
 
@@ -559,122 +517,13 @@ class DopplerEffect(Slide, MovingCameraScene):
 
         zataxitita = Text("Σχετική Ταχύτητα", font_size=36).shift(UP * 3)
 
-        zaa_dot = Dot(color=RED).shift(UP * 1).shift(RIGHT * 5)
-        zab_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 3)
-        self.play(FadeIn(zaa_dot), FadeIn(zab_dot), ReplacementTransform(ztaxitita, zataxitita))
+        zademo = RelativeVelocityDemo(self, UP * 1 + RIGHT * 5, LEFT, 3, DOWN * 1 + RIGHT * 3, LEFT, 2, duration=4 + 1, follow=True)
+        self.play(FadeIn(zademo.a_dot), FadeIn(zademo.b_dot), ReplacementTransform(ztaxitita, zataxitita))
 
         self.next_slide()
         self.next_slide(loop = True)
-        zfollow_updater = lambda mob: mob.move_to(zab_dot.get_center())
-        self.camera.frame.save_state()
-
-        self.play(self.camera.auto_zoom(zab_dot, margin=8))
-        self.camera.frame.add_updater(zfollow_updater)
-
-        zaaccel_time = 1.5
-        zatotal_move_time = 4
-        zaafinal_speed = 3
-        zabfinal_speed = 2
-
-        zalemma_tracker = ValueTracker(0)
-        self.add(zalemma_tracker)
-
-        def zaa_dot_pos(t):
-            if t < zaaccel_time:
-                a = zaafinal_speed / zaaccel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * zaafinal_speed * zaaccel_time) + zaafinal_speed * (t - zaaccel_time))
-
-        def zab_dot_pos(t):
-            if t < zaaccel_time:
-                a = zabfinal_speed / zaaccel_time
-                return LEFT * (0.5 * a * t**2)
-            else:
-                return LEFT * ((0.5 * zabfinal_speed * zaaccel_time) + zabfinal_speed * (t - zaaccel_time))
-
-        def zaa_dot_vel(t):
-            if t < zaaccel_time:
-                a = zaafinal_speed / zaaccel_time
-                return a * t
-            else:
-                return zaafinal_speed
-
-        def zab_dot_vel(t):
-            if t < zaaccel_time:
-                a = zabfinal_speed / zaaccel_time
-                return a * t
-            else:
-                return zabfinal_speed
-
-        zaa_dot.add_updater(lambda m: m.move_to(UP * 1 + RIGHT * 5 + zaa_dot_pos(zalemma_tracker.get_value())))
-        zab_dot.add_updater(lambda m: m.move_to(DOWN * 1 + RIGHT * 3 + zab_dot_pos(zalemma_tracker.get_value())))
-
-        zaa_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-        zab_arrow = Arrow(start=ORIGIN, end=LEFT * arrow_length, buff=0, color=GREEN)
-
-        self.text_color = GREEN  # Initial color
-
-        zaa_speed_text = MathTex(
-            rf"\upsilon_A = {zaa_dot_vel(zalemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(zaa_arrow, UP)
-
-        zab_speed_text = MathTex(
-            rf"\upsilon_B = {zab_dot_vel(zalemma_tracker.get_value()):.2f}",
-            font_size=36,
-            color=self.text_color
-        ).next_to(zab_arrow, UP)
-
-        gap_factor = 2
-        zaa_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            zaa_dot.get_center() + normalize(LEFT) * zaa_dot.radius * gap_factor,
-            zaa_dot.get_center() + normalize(LEFT) * (zaa_dot.radius * gap_factor + arrow_length)))
-        zab_arrow.add_updater(lambda m: m.put_start_and_end_on(
-            zab_dot.get_center() + normalize(LEFT) * zab_dot.radius * gap_factor,
-            zab_dot.get_center() + normalize(LEFT) * (zab_dot.radius * gap_factor + arrow_length)))
-
-        # Add updaters to the text to dynamically update its position and content
-        zaa_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_A = {zaa_dot_vel(zalemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(zaa_arrow, UP)
-        ))
-
-        zab_speed_text.add_updater(lambda m: m.become(
-            MathTex(
-                rf"\upsilon_B = {zab_dot_vel(zalemma_tracker.get_value()):.2f}",
-                font_size=36,
-                color=self.text_color
-            ).next_to(zab_arrow, UP)
-        ))
-        
-
-        self.play(Write(zaa_arrow), Write(zab_arrow), Write(zaa_speed_text), Write(zab_speed_text))
-        self.add(zaa_arrow, zab_arrow, zaa_speed_text, zab_speed_text)
-
-        zalemma_tracker.add_updater(lambda m, dt: m.increment_value(dt))
 
-        self.wait(zatotal_move_time + 1)
-
-        zafa_dot = Dot(color=RED).shift(UP * 1).shift(RIGHT * 5)
-        zafb_dot = Dot(color=BLUE).shift(DOWN * 1).shift(RIGHT * 3)
-        self.play(FadeIn(zafa_dot), FadeIn(zafb_dot))
-
-        self.camera.frame.remove_updater(zfollow_updater)
-
-        self.play(Restore(self.camera.frame))
-        # Remove updaters after animation is done
-        zaa_dot.clear_updaters()
-        zab_dot.clear_updaters()
-        zaa_arrow.clear_updaters()
-        zab_arrow.clear_updaters()
-        zaa_speed_text.clear_updaters()
-        zab_speed_text.clear_updaters()
-        self.remove(zaa_arrow, zab_arrow, zaa_speed_text, zab_speed_text)
+        zafa_dot, zafb_dot = zademo.run()
 
         self.next_slide()
 
@@ -701,6 +550,7 @@ class DopplerEffect(Slide, MovingCameraScene):
         ee2 = MathTex(r"\upsilon'_s = \lambda' f_s")
         e2 = Text(f"Η σχέση του ηχητικού κύματος που παράγει η πηγή s είναι:", font_size=24).shift(UP * 2)
         
+        # bench: glyph-map-chain
         self.next_slide()
         self.play(ReplacementTransform(e1, e2))
         self.play(TransformByGlyphMap(ee1, ee2,
@@ -827,7 +677,7 @@ class DopplerEffect(Slide, MovingCameraScene):
         self.next_slide()
         self.play(FadeOut(ee11), FadeOut(titleproof))
 
-class Outro(Slide):
+class Outro(DeckSlide):
     def construct(self):
         learn_more = VGroup(
             Text("Ευχαριστώ για την"),
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The deck's modules are imported from the repository root, as manim does
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.bench import SLICES, Slice, slice_boundaries
+
+DECK = '''
+class Deck(Scene):
+    def construct(self):
+        self.next_slide()
+        # bench: first
+        self.next_slide(loop=True)
+        self.wait()
+        self.next_slide()  # bench: last
+        self.next_slide()
+        # bench: twice
+        # bench: twice
+        self.next_slide()
+'''
+
+
+@pytest.fixture
+def deck(tmp_path):
+    file = tmp_path / "deck.py"
+    file.write_text(DECK)
+    return file
+
+
+def test_slices_start_at_their_markers(deck):
+    assert slice_boundaries(deck, Slice("first", "Deck")) == (2, 3)
+    assert slice_boundaries(deck, Slice("last", "Deck", 2)) == (3, 5)
+    assert slice_boundaries(deck, Slice("whole", "Deck", None)) == (0, 0)
+
+
+@pytest.mark.parametrize("bench_slice", [
+    Slice("missing", "Deck"),
+    Slice("twice", "Deck"),
+    Slice("last", "Deck", 3),
+    Slice("first", "Other"),
+])
+def test_slices_that_cannot_be_placed(deck, bench_slice):
+    with pytest.raises(ValueError):
+        slice_boundaries(deck, bench_slice)
+
+
+def test_deck_slices_are_where_they_were_measured():
+    # The boundaries of the baseline, before they were found by marker
+    deck = Path(__file__).parents[1] / "slides.py"
+    boundaries = {bench_slice.name: slice_boundaries(deck, bench_slice) for bench_slice in SLICES}
+    assert boundaries == {
+        "wave-emission": (6, 7),
+        "relative-velocity": (14, 15),
+        "camera-follow": (17, 18),
+        "glyph-map-chain": (29, 32),
+        "outro": (0, 0),
+    }
@@ -0,0 +1,60 @@
+import pickle
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import BLUE, RED, Dot, Square, VGroup
+
+from render_tools.checkpoint import Snapshot
+
+
+def _scene(*mobjects):
+    return types.SimpleNamespace(
+        camera=types.SimpleNamespace(),
+        mobjects=list(mobjects),
+        foreground_mobjects=[],
+        renderer=types.SimpleNamespace(time=2.5),
+        scene_time=3.0,
+    )
+
+
+def test_round_trip_restores_live_mobjects():
+    square = Square().shift([1, 0, 0]).set_color(RED)
+    dots = VGroup(Dot(), Dot([1, 1, 0]))
+    scene = _scene(square, dots)
+    local_variables = {"square": square, "dots": dots}
+    saved = pickle.loads(pickle.dumps(Snapshot.capture(scene, local_variables)))
+    points = square.points.copy()
+    dot_points = [dot.points.copy() for dot in dots]
+
+    square.shift([0, 2, 0]).set_color(BLUE)
+    dots.remove(dots[1])
+    scene.mobjects = [square]
+    scene.renderer.time = scene.scene_time = 10.0
+
+    saved.restore(scene, local_variables)
+    # Matched by local variable name: the live objects are updated in place
+    assert scene.mobjects == [square, dots]
+    np.testing.assert_allclose(square.points, points)
+    assert square.get_color() == RED
+    assert len(dots) == 2
+    for dot, expected in zip(dots, dot_points):
+        np.testing.assert_allclose(dot.points, expected)
+    assert scene.renderer.time == 2.5
+    assert scene.scene_time == 3.0
+
+
+def test_unmatched_mobjects_are_rebuilt():
+    square = Square()
+    scene = _scene(square)
+    saved = pickle.loads(pickle.dumps(Snapshot.capture(scene, {})))
+
+    restored = _scene()
+    saved.restore(restored, {})
+    (rebuilt,) = restored.mobjects
+    assert rebuilt is not square
+    assert type(rebuilt) is Square
+    np.testing.assert_allclose(rebuilt.points, square.points)
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Circle, Dot, Square
+from manim.camera.camera import Camera
+
+from render_tools.culling import CullingMixin, is_visible
+
+
+class Host:
+    def setup(self):
+        pass
+
+    def tear_down(self):
+        pass
+
+
+class CulledScene(CullingMixin, Host):
+    pass
+
+
+class Context:
+    """Records the curves of the paths a camera would stroke."""
+
+    def __init__(self):
+        self.curves = 0
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+    def curve_to(self, *args):
+        self.curves += 1
+
+
+def _record_drawing(monkeypatch):
+    drawn = []
+    # Drawing needs Cairo: what would be drawn is recorded instead
+    monkeypatch.setattr(
+        Camera,
+        "display_multiple_non_background_colored_vmobjects",
+        lambda self, vmobjects, pixel_array: drawn.extend(vmobjects),
+    )
+    return drawn
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """Mobjects that reach Cairo in a scene that culls."""
+    drawn = _record_drawing(monkeypatch)
+    scene = CulledScene()
+    scene.render_options = SimpleNamespace(culling=True)
+    scene.setup()
+    yield drawn
+    scene.tear_down()
+
+
+def test_visibility():
+    camera = SimpleNamespace(frame_center=[0, 0, 0], frame_width=14.2, frame_height=8, cairo_line_width_multiple=0.01)
+    assert is_visible(Dot(), camera)
+    assert not is_visible(Dot([20, 0, 0]), camera)
+    assert not is_visible(Circle(stroke_opacity=0), camera)
+    # Only the stroke of a wide enough line reaches into the frame
+    assert is_visible(Circle(radius=1, stroke_width=400).shift([8.5, 0, 0]), camera)
+
+
+def test_only_visible_mobjects_are_drawn(drawn):
+    on_screen = Dot()
+    off_screen = Dot([20, 0, 0])
+    transparent = Square().set_stroke(opacity=0).set_fill(opacity=0)
+    Camera().capture_mobjects([on_screen, off_screen, transparent])
+    assert drawn == [on_screen]
+
+
+def test_off_screen_curves_are_left_out(drawn):
+    camera = Camera()
+    inside, crossing = Context(), Context()
+    camera.set_cairo_context_path(inside, Circle(radius=2))
+    camera.set_cairo_context_path(crossing, Circle(radius=2).shift([7, 0, 0]))
+    assert inside.curves == len(Circle().points) // 4
+    assert 0 < crossing.curves < inside.curves
+
+
+def test_everything_is_drawn_once_the_scene_is_torn_down(monkeypatch):
+    drawn = _record_drawing(monkeypatch)
+    scene = CulledScene()
+    scene.render_options = SimpleNamespace(culling=True)
+    scene.setup()
+    scene.tear_down()
+    mobjects = [Dot(), Dot([20, 0, 0])]
+    Camera().capture_mobjects(mobjects)
+    assert drawn == mobjects
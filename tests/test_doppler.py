@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from doppler import Listener, arrival_times, observed_frequency, retarded_times, wavefronts
+
+SPEED = 4.0
+RIGHT = np.array([1.0, 0.0, 0.0])
+
+
+def still(point):
+    return lambda t: np.asarray(point, dtype=float)
+
+
+def moving(start, velocity):
+    return lambda t: np.asarray(start, dtype=float) + np.multiply.outer(t, np.asarray(velocity, dtype=float))
+
+
+def test_wavefronts_grow_from_where_they_were_emitted():
+    source = moving([0, 0, 0], RIGHT)
+    emitted = np.array([0.0, 1.0, 2.5])
+    centers, radii = wavefronts(3.0, emitted, source, SPEED)
+    np.testing.assert_allclose(centers, [[0, 0, 0], [1, 0, 0], [2.5, 0, 0]])
+    np.testing.assert_allclose(radii, SPEED * (3.0 - emitted))
+
+
+def test_still_source_and_observer():
+    t = np.linspace(5, 6, 4)
+    np.testing.assert_allclose(retarded_times(t, still([0, 0, 0]), still([8, 0, 0]), SPEED), t - 2)
+    np.testing.assert_allclose(arrival_times(t, still([0, 0, 0]), still([8, 0, 0]), SPEED), t + 2)
+    np.testing.assert_allclose(observed_frequency(t, still([0, 0, 0]), still([8, 0, 0]), SPEED, 2.5), 2.5)
+
+
+@pytest.mark.parametrize("velocity, factor", [(-1.0, (SPEED + 1) / SPEED), (1.0, (SPEED - 1) / SPEED)])
+def test_moving_observer(velocity, factor):
+    observer = moving([8, 0, 0], velocity * RIGHT)
+    t = np.linspace(2, 3, 5)
+    np.testing.assert_allclose(observed_frequency(t, still([0, 0, 0]), observer, SPEED, 2.5), 2.5 * factor, rtol=1e-6)
+
+
+def test_arrival_and_retarded_times_agree():
+    source, observer = moving([0, 0, 0], RIGHT), moving([8, 1, 0], [-0.5, 0, 0])
+    emitted = np.array([0.0, 0.4, 0.8])
+    arrived = arrival_times(emitted, source, observer, SPEED)
+    np.testing.assert_allclose(retarded_times(arrived, source, observer, SPEED), emitted, atol=1e-9)
+    centers, radii = wavefronts(arrived, emitted, source, SPEED)
+    np.testing.assert_allclose(np.linalg.norm(observer(arrived) - centers, axis=-1), radii)
+
+
+def test_listener_hears_the_emission_only():
+    listener = Listener(still([0, 0, 0]), still([8, 0, 0]), SPEED, 2.5, start=1, end=5).precompute(0, 10, 30)
+    assert listener.heard_from == pytest.approx(3)
+    assert listener.heard_until == pytest.approx(7)
+    assert listener.frequency_at(2.9) == 0
+    assert listener.frequency_at(4) == pytest.approx(2.5)
+    assert listener.frequency_at(4.01) == pytest.approx(2.5)
+    assert listener.frequency_at(7.5) == 0
@@ -0,0 +1,84 @@
+import inspect
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from render_tools.frame_store import FrameEntry, FrameStore, FrameStoreMixin
+
+
+class FileWriter:
+    """Records what reaches manim's movie writer."""
+
+    partial_movie_files = ["media/partial/abc.mp4"]
+
+    def __init__(self):
+        self.repeats = []
+
+    def write_frame(self, pixels, *, repeat=1):
+        self.repeats.append(repeat)
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+
+class Host:
+    def setup(self):
+        pass
+
+
+class StoreScene(FrameStoreMixin, Host):
+    pass
+
+
+def _frame(value):
+    return np.full((2, 3, 4), value, dtype=np.uint8)
+
+
+def _parameters(function):
+    return [(parameter.name, parameter.kind) for parameter in inspect.signature(function).parameters.values()]
+
+
+def test_fake_writer_matches_manim():
+    assert _parameters(FileWriter.write_frame) == _parameters(SceneFileWriter.write_frame)
+
+
+def test_repeated_frames_from_manim_are_stored(tmp_path):
+    file_writer = FileWriter()
+    scene = StoreScene()
+    scene.render_options = SimpleNamespace(frame_store=tmp_path)
+    scene.renderer = renderer = SimpleNamespace(
+        file_writer=file_writer, num_plays=0, skip_animations=False, time=0.0, camera=SimpleNamespace(frame_rate=30),
+    )
+    scene.setup()
+
+    # As manim calls it, with num_frames turned into repeat
+    CairoRenderer.add_frame(renderer, _frame(1), num_frames=3)
+    CairoRenderer.add_frame(renderer, _frame(2))
+    scene._frame_writer.close()
+
+    assert file_writer.repeats == [3, 1]
+    entry = FrameEntry(FrameStore(tmp_path, "StoreScene").directory / "frames" / "abc")
+    assert [(int(frame[0, 0, 0]), repeat) for frame, repeat in entry.frames()] == [(1, 3), (2, 1)]
+    assert len(entry) == 4
+
+
+def test_frames_with_the_same_key_are_stored_once(tmp_path):
+    writer = FrameStore(tmp_path, "Scene").writer("abc", (2, 3, 4), 30)
+    writer.write(_frame(1), 1, "a")
+    # A fresh copy of the previous frame, as frame reuse hands it over
+    writer.write(_frame(1), 2, "a")
+    writer.write(_frame(2), 1, "b")
+    # Without a key, frames are never taken for the previous one
+    writer.write(_frame(2), 1)
+    writer.write(_frame(2), 1)
+    writer.close()
+
+    entry = FrameEntry(tmp_path / "Scene" / "frames" / "abc")
+    assert [(int(frame[0, 0, 0]), repeat) for frame, repeat in entry.frames()] == [(1, 3), (2, 1), (2, 1), (2, 1)]
+    assert [int(frame[0, 0, 0]) for frame, _ in entry.frames(reverse=True)] == [2, 2, 2, 1]
@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import RIGHT, Dot, config
+from manim_slides.config import BaseSlideConfig
+
+from render_tools.clock import ClockMixin
+from render_tools.loops import LoopMixin, _read_cycle, find_period
+from render_tools.slide_cache import SlideCache
+
+
+def test_periodic_from_the_start():
+    assert find_period(list("abcabcabcabc")) == (0, 3)
+
+
+def test_build_up_before_the_cycle():
+    assert find_period(list("xyzababababab")) == (3, 2)
+
+
+def test_still_frames():
+    assert find_period(["a"] * 10) == (0, 1)
+
+
+def test_no_cycle():
+    assert find_period(list("abcdefghij")) is None
+
+
+def test_cycle_must_repeat_enough_times():
+    assert find_period(list("abcab"), repeats=3) is None
+    assert find_period(list("abcabcabc"), repeats=3) == (0, 3)
+
+
+def _scene(tmp_path, files):
+    return SimpleNamespace(
+        slide_cache=SlideCache(tmp_path, "Scene"),
+        _segment={"key": "segment", "start": 1},
+        renderer=SimpleNamespace(file_writer=SimpleNamespace(partial_movie_files=files)),
+    )
+
+
+def test_cycle_path_follows_the_segment(tmp_path):
+    path = LoopMixin._cycle_path(_scene(tmp_path, ["a", "b"]), 25)
+    assert path.parent == tmp_path / "Scene" / "loops"
+    assert LoopMixin._cycle_path(_scene(tmp_path, ["a", "b"]), 25) == path
+    # Another loop of the same segment, or another duration
+    assert LoopMixin._cycle_path(_scene(tmp_path, ["a", "b", "c"]), 25) != path
+    assert LoopMixin._cycle_path(_scene(tmp_path, ["a", "b"]), 20) != path
+    assert LoopMixin._cycle_path(SimpleNamespace(slide_cache=None), 25) is None
+
+
+def test_read_cycle(tmp_path):
+    path = tmp_path / "cycle.json"
+    assert _read_cycle(None) is None
+    assert _read_cycle(path) is None
+    path.write_text("{")
+    assert _read_cycle(path) is None
+    path.write_text('{"cycle": null}')
+    assert _read_cycle(path) == {"cycle": None}
+
+
+class Host:
+    """Plays ``wait()`` as manim does, recording the frames it renders."""
+
+    def setup(self):
+        self.mobjects = []
+        self.foreground_mobjects = []
+        self.camera = SimpleNamespace()
+        self.renderer = SimpleNamespace(time=0.0, skip_animations=False, num_plays=0)
+        self.duration = 0.0
+        self.rendered = []
+        self._base_slide_config = BaseSlideConfig()
+        self._current_animation = self._start_animation = 0
+
+    def play(self, run_time):
+        step = 1 / config.frame_rate
+        last = 0.0
+        for t in np.arange(0, run_time, step):
+            self.update_to_time(t)
+            self.update_mobjects(t - last)
+            last = t
+            self.rendered.append(self.mobjects[0].get_x())
+        self.duration = run_time
+        self.renderer.num_plays += 1
+        self.renderer.time += run_time
+
+    def wait(self, run_time, frozen_frame=None):
+        self.play(run_time)
+
+    def update_to_time(self, t):
+        pass
+
+    def update_mobjects(self, dt):
+        for mobject in self.mobjects:
+            mobject.update(dt)
+
+    def update_meshes(self, dt):
+        pass
+
+    def update_self(self, dt):
+        pass
+
+
+class LoopScene(ClockMixin, LoopMixin, Host):
+    pass
+
+
+def test_build_up_and_cycle_render_each_frame_once():
+    scene = LoopScene()
+    scene.render_options = SimpleNamespace(loop_extraction=True)
+    scene.setup()
+
+    def frame_shown(mobject):
+        # Frames 0, 1 and 2, then 3, 4, 5, 6 over and over
+        frame = round(scene.scene_time * config.frame_rate)
+        mobject.move_to(RIGHT * (frame if frame < 3 else 3 + (frame - 3) % 4))
+
+    scene.mobjects = [Dot().add_updater(frame_shown)]
+    frames = 20
+    scene.wait_loop(frames / config.frame_rate)
+
+    assert scene.rendered == [0, 1, 2, 3, 4, 5, 6]
+    # As after the full wait
+    assert scene.scene_time == pytest.approx(frames / config.frame_rate)
+    assert scene.mobjects[0].get_x() == 3 + (frames - 1 - 3) % 4
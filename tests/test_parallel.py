@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.parallel import split_boundaries
+
+
+def test_one_job_renders_everything():
+    assert split_boundaries([0, 1, 2, 3], 1) == [(0, 0)]
+
+
+def test_groups_have_similar_durations():
+    # Boundaries 1 to 4 at one second apart, the scene ends at 5 seconds
+    assert split_boundaries([0, 1, 2, 3, 4, 5], 2) == [(0, 3), (3, 0)]
+
+
+def test_groups_are_contiguous_and_at_most_jobs():
+    times = [0, 0.5, 4, 4.5, 5, 9, 9.5, 12]
+    groups = split_boundaries(times, 3)
+    assert len(groups) <= 3
+    assert groups[0][0] == 0 and groups[-1][1] == 0
+    for (_, stop), (start, _) in zip(groups, groups[1:]):
+        assert stop == start
+
+
+def test_nothing_is_cut_after_the_last_animation():
+    # Boundaries 2 and 3 are at the very end: no group may start there
+    times = [0, 1, 6, 6, 6]
+    assert all(times[start] < 6 for start, _ in split_boundaries(times, 3))
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from render_tools.patches import Patch, PatchesMixin
+
+
+class Target:
+    def draw(self):
+        return "manim"
+
+
+class Host:
+    def tear_down(self):
+        pass
+
+
+class PatchedScene(PatchesMixin, Host):
+    pass
+
+
+def test_patches_last_until_the_scene_is_torn_down():
+    original = Target.draw
+    module = SimpleNamespace()
+    for _ in range(2):
+        scene = PatchedScene()
+        scene.patch(Patch(Target, draw=lambda self: "cached"))
+        scene.patch(Patch(module, added=1))
+        assert Target().draw() == "cached"
+        assert module.added == 1
+        scene.tear_down()
+        assert Target.draw is original
+        assert not hasattr(module, "added")
+
+
+def test_patches_of_one_attribute_unwind_in_order():
+    original = Target.draw
+    with Patch(Target, draw=lambda self: "first"):
+        with Patch(Target, draw=lambda self: "second"):
+            assert Target().draw() == "second"
+        assert Target().draw() == "first"
+    assert Target.draw is original
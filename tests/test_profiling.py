@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Dot, Square
+
+from render_tools.profiling import ProfilingMixin
+
+
+class Host:
+    """Calls the hooks of a scene in the order manim's ``Scene.render`` does."""
+
+    def setup(self):
+        pass
+
+    def tear_down(self):
+        pass
+
+    def next_slide(self):
+        pass
+
+    def render(self):
+        self.setup()
+        self.construct()
+        self.tear_down()
+
+
+def _shift(mobject):
+    mobject.shift([0.1, 0, 0])
+
+
+def _rotate(mobject, dt):
+    mobject.rotate(dt)
+
+
+class ProfiledScene(ProfilingMixin, Host):
+    def construct(self):
+        self.dot = Dot().add_updater(_shift)
+        square = Square().add_updater(_rotate)
+        for _ in range(3):
+            self.dot.update()
+        self.next_slide()
+        square.update(0.1)
+        # Removing the plain function still finds the timed updater
+        self.dot.remove_updater(_shift)
+        self.dot.update()
+
+
+def test_trace_has_one_event_per_updater_call(tmp_path):
+    scene = ProfiledScene()
+    scene.render_options = SimpleNamespace(profile=tmp_path)
+    scene.renderer = SimpleNamespace(update_frame=lambda *args: None, file_writer=SimpleNamespace(write_frame=None))
+    scene.render()
+
+    trace = json.loads((tmp_path / "ProfiledScene.trace.json").read_text())
+    updaters = [
+        (event["name"].split()[0], event["args"]["mobject"], event["args"]["slide"])
+        for event in trace["traceEvents"]
+        if event["cat"] == "updater"
+    ]
+    assert updaters == [("_shift", "Dot", 0)] * 3 + [("_rotate", "Square", 1)]
+    assert scene.dot.updaters == []
+
+    # Once the scene is torn down, updaters are attached as manim does
+    Dot().add_updater(_shift).update()
+    assert len(scene.tracer.events) == len(trace["traceEvents"])
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import RIGHT, UP, Dot, Square, VGroup
+
+from render_tools.scheduler import UpdaterSchedulerMixin, update_order
+
+
+class Host:
+    def setup(self):
+        pass
+
+
+class ScheduledScene(UpdaterSchedulerMixin, Host):
+    def __init__(self, *mobjects):
+        self.mobjects = list(mobjects)
+        self.render_options = SimpleNamespace(update_scheduler=True)
+        self.renderer = SimpleNamespace(num_plays=0)
+        self.setup()
+
+
+def _follower(target):
+    return Square(side_length=0.2).add_updater(lambda m: m.next_to(target, UP))
+
+
+def test_inputs_are_updated_first():
+    positions = iter([RIGHT, 2 * RIGHT])
+    dot = Dot().add_updater(lambda m: m.move_to(next(positions)))
+    label = _follower(dot)
+    # Added before the dot it follows, and inside a group
+    scene = ScheduledScene(VGroup(label), dot)
+    assert update_order(scene.mobjects) == [dot, label]
+
+    for _ in range(2):
+        scene.update_mobjects(1 / 30)
+        assert np.allclose(label.get_bottom(), dot.get_top() + 0.25 * UP)
+
+
+def test_updaters_with_unchanged_inputs_are_skipped():
+    dot = Dot()
+    calls = []
+    label = Square().add_updater(lambda m: calls.append("label"))
+    timed = Square().add_updater(lambda m, dt: calls.append("timed"))
+    scene = ScheduledScene(dot, label, timed)
+    scene.depends_on(label, dot)
+    scene.depends_on(timed, dot)
+
+    for _ in range(3):
+        scene.update_mobjects(1 / 30)
+    assert calls == ["label", "timed", "timed", "timed"]
+
+    calls.clear()
+    dot.shift(RIGHT)
+    scene.update_mobjects(1 / 30)
+    scene.update_mobjects(1 / 30)
+    assert calls == ["label", "timed", "timed"]
+
+    # The first frame of every play runs everything
+    calls.clear()
+    scene.renderer.num_plays += 1
+    scene.update_mobjects(1 / 30)
+    assert calls == ["label", "timed"]
+
+
+def test_value_inputs_are_compared_by_value():
+    speed = [1.0]
+    calls = []
+    label = Square().add_updater(lambda m: calls.append(speed[0]))
+    scene = ScheduledScene(label)
+    scene.depends_on(label, lambda: speed[0])
+
+    for value in (1.0, 1.0, 2.0, 2.0):
+        speed[0] = value
+        scene.update_mobjects(1 / 30)
+    assert calls == [1.0, 2.0]
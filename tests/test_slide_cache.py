@@ -0,0 +1,126 @@
+import types
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import RIGHT, Square, tempconfig
+
+from render_tools.slide_cache import SlideCache, SlideCacheMixin, SourceIndex
+from render_tools.state import hash_mobjects, hash_values
+
+
+class Deck:
+    def construct(self):
+        self.play("intro")
+        self.next_slide()
+        self.play("middle")
+        self.next_slide(loop=True)
+        self.play("end")
+
+
+class Motion:
+    def __init__(self, speed):
+        self.speed = speed
+
+    def distance(self, t):
+        return self.speed * t
+
+
+class DemoDeck:
+    """A component built in one slide and run in the next, as RelativeVelocityDemo is."""
+
+    def construct(self):
+        demo = Motion(2)
+        self.next_slide()
+        self.play(demo.distance)
+
+    def next_slide(self):
+        self.seen = self.index.caller_locals()
+
+
+def _follower(speed):
+    return Square().add_updater(lambda m, dt: m.shift(speed * dt * RIGHT))
+
+
+def _host(source_index, state="state", preview=False):
+    return types.SimpleNamespace(
+        _source_index=source_index,
+        _chained_state=state,
+        render_options=types.SimpleNamespace(preview=preview),
+    )
+
+
+def test_source_index_finds_boundaries():
+    index = SourceIndex(Deck)
+    first, second = index.boundaries
+    assert second > first > index.first_line
+    assert '"middle"' in index.segment_source(first)
+    assert '"end"' not in index.segment_source(first)
+    assert '"end"' in index.segment_source(second)
+
+
+def test_segment_key_depends_on_code_state_and_settings():
+    index = SourceIndex(Deck)
+    first, second = index.boundaries
+    key = SlideCacheMixin._segment_key(_host(index), first)
+
+    assert SlideCacheMixin._segment_key(_host(index), first) == key
+    assert SlideCacheMixin._segment_key(_host(index), second) != key
+    assert SlideCacheMixin._segment_key(_host(index, state="other"), first) != key
+    assert SlideCacheMixin._segment_key(_host(index, preview=True), first) != key
+    with tempconfig({"frame_rate": 15}):
+        assert SlideCacheMixin._segment_key(_host(index), first) != key
+
+
+def test_hash_mobjects_follows_points_and_updaters():
+    square = Square()
+    digest = hash_mobjects([square])
+    assert hash_mobjects([square.copy()]) == digest
+    assert hash_mobjects([square.copy().shift([1, 0, 0])]) != digest
+    assert hash_mobjects([square.copy().add_updater(lambda m: m)]) != digest
+
+
+def test_hash_mobjects_follows_closures():
+    assert hash_mobjects([_follower(1)]) == hash_mobjects([_follower(1)])
+    assert hash_mobjects([_follower(2)]) != hash_mobjects([_follower(1)])
+
+
+def test_plain_objects_hash_by_attributes():
+    assert hash_values({"demo": Motion(2)}) == hash_values({"demo": Motion(2)})
+    assert hash_values({"demo": Motion(3)}) != hash_values({"demo": Motion(2)})
+    # A bound method carries the object it is bound to
+    assert hash_values({"f": Motion(3).distance}) != hash_values({"f": Motion(2).distance})
+
+
+def test_segment_key_follows_the_locals_the_segment_reads():
+    index = SourceIndex(DemoDeck)
+    (boundary,) = index.boundaries
+    assert {"demo", "self"} <= index.segment_names(boundary)
+
+    deck = DemoDeck()
+    deck.index = index
+    deck.play = lambda *args: None
+    deck.construct()
+    assert deck.seen["demo"].speed == 2
+
+    # Same code, same scene state: only the component built before the boundary changed
+    key = SlideCacheMixin._segment_key(_host(index), boundary, {"demo": Motion(2)})
+    assert SlideCacheMixin._segment_key(_host(index), boundary, {"demo": Motion(2)}) == key
+    assert SlideCacheMixin._segment_key(_host(index), boundary, {"demo": Motion(3)}) != key
+
+
+def test_slide_cache_round_trip(tmp_path):
+    movies = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+    for movie in movies:
+        movie.write_bytes(movie.name.encode())
+    cache = SlideCache(tmp_path / "cache", "Deck")
+    assert cache.lookup("key") is None
+
+    cache.store("key", movies, "end")
+    files, end_state = cache.lookup("key")
+    assert [file.read_bytes() for file in files] == [b"a.mp4", b"b.mp4"]
+    assert end_state == "end"
+
+    files[0].unlink()
+    assert cache.lookup("key") is None
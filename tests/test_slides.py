@@ -0,0 +1,185 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+pytest.importorskip("MF_Tools")
+
+from manim import DOWN, LEFT, RIGHT, UP, Square, VGroup
+
+import slides
+from render_tools.clock import Stopwatch
+from slides import MotionProfile, RelativeVelocityDemo, SpeedLabel, WaveField
+
+
+@pytest.fixture
+def typeset(monkeypatch):
+    """Texts typeset by the labels, with TeX left out."""
+    texts = []
+
+    def math_tex(text, **kwargs):
+        texts.append(text)
+        return VGroup(Square(side_length=0.1 * len(text)))
+
+    monkeypatch.setattr(slides, "MathTex", math_tex)
+    monkeypatch.setattr(SpeedLabel, "cache", OrderedDict())
+    return texts
+
+
+@pytest.mark.parametrize("value", [0, 0.004, 0.005, 0.015, 1.005, 1.125, 2.675, 2.999, 3, 9.95])
+def test_value_is_rounded_as_before(value):
+    # The demos used to format the speed straight into the MathTex string
+    assert SpeedLabel.format_value(r"\upsilon_A", value, 2) == rf"\upsilon_A = {value:.2f}"
+
+
+def test_negative_zero_is_shown_as_zero():
+    assert SpeedLabel.format_value("f_o", -0.04, 1) == "f_o = 0.0"
+
+
+def test_cache_hits_and_evicts(typeset, monkeypatch):
+    monkeypatch.setattr(SpeedLabel, "cache_size", 2)
+    speed = [0.0]
+    label = SpeedLabel("v", lambda: speed[0], Square())
+
+    for value in (0.001, 1, 0, 2, 1):
+        speed[0] = value
+        label.refresh()
+    # 0.00 comes back as a hit, so 1.00 is the least recently used when 2.00 is typeset
+    assert typeset == ["v = 0.00", "v = 1.00", "v = 2.00", "v = 1.00"]
+    assert list(SpeedLabel.cache) == [("v = 2.00", 36, str(label.label_color)), ("v = 1.00", 36, str(label.label_color))]
+
+    # Labels share the cache and each shows its own copy
+    other = SpeedLabel("v", lambda: 2, Square())
+    assert typeset[-1] == "v = 1.00"
+    assert other.submobjects[0] is not SpeedLabel.cache[other.text, 36, str(other.label_color)].submobjects[0]
+
+
+def test_label_follows_its_anchor(typeset):
+    anchor = Square()
+    label = SpeedLabel("v", lambda: 1, anchor)
+    anchor.shift(3 * UP)
+    label.refresh()
+    assert np.allclose(label.get_bottom()[1], anchor.get_top()[1] + 0.25)
+
+
+def _still(times):
+    return np.zeros((len(times), 3))
+
+
+def _moving(times):
+    return np.multiply.outer(times, RIGHT)
+
+
+def _drawn_rings(field):
+    """Centres and radii of the rings that have points, from the starts of their curves."""
+    rings = []
+    for ring in field.submobjects:
+        if len(ring.points):
+            anchors = ring.points[::4]
+            center = (anchors.max(axis=0) + anchors.min(axis=0)) / 2
+            rings.append((center, np.linalg.norm(anchors - center, axis=1)))
+    return rings
+
+
+@pytest.mark.parametrize("source", [_still, _moving])
+def test_ring_radii_grow_at_the_wave_speed(source):
+    now = [0.0]
+    field = WaveField(lambda: now[0], source, wave_interval=0.5, wave_speed=2, wave_lifetime=3, start_radius=0)
+    now[0] = 1.0
+    field.start(2)
+
+    now[0] = 2.2
+    field.update()
+    rings = _drawn_rings(field)
+    assert len(rings) == 3
+    for (center, radii), emitted in zip(rings, [1.0, 1.5, 2.0]):
+        assert np.allclose(radii, 2 * (2.2 - emitted))
+        assert np.allclose(center, source(np.array([emitted]))[0])
+
+
+def test_nothing_is_drawn_before_emission():
+    now = [0.0]
+    field = WaveField(lambda: now[0], _still, wave_interval=0.5, wave_speed=2, wave_lifetime=3, start_radius=0)
+    field.update()
+    assert _drawn_rings(field) == []
+
+    now[0] = 1.0
+    field.start(2)
+    # Only the emission at 1.0 has happened, the one at 1.5 is not drawn early
+    for t in (1.0, 1.25, 1.49):
+        now[0] = t
+        field.update()
+        [(_, radii)] = _drawn_rings(field)
+        assert np.allclose(radii, 2 * (t - 1.0))
+
+
+@pytest.mark.parametrize("accel_time, final_speed", [(1.5, 2), (1.5, 3), (0.4, 10)])
+def test_motion_is_continuous_where_cruising_starts(accel_time, final_speed):
+    motion = MotionProfile(accel_time, final_speed, LEFT, RIGHT)
+    epsilon = 1e-7
+    before, after = accel_time - epsilon, accel_time + epsilon
+    assert np.allclose(motion.point(before), motion.point(after), atol=1e-5)
+    assert motion.speed(before) == pytest.approx(motion.speed(after), abs=1e-5)
+    assert motion.speed(after) == final_speed
+    # The speed is the derivative of the distance on both sides
+    for t in (before, after):
+        derivative = (motion.distance(t + epsilon) - motion.distance(t - epsilon)) / (2 * epsilon)
+        assert derivative == pytest.approx(motion.speed(t), abs=1e-4)
+
+
+def test_tabulated_motion_matches_the_closed_form():
+    motion = MotionProfile(1.5, 2, RIGHT).precompute(4, fps=30)
+    times = [0, 1 / 30, 1.5, 2.2, 4, 4 + 1 / 30, 0.0123]
+    assert all(np.allclose(motion.point_at(t), motion.point(t)) for t in times)
+    assert all(motion.speed_at(t) == pytest.approx(float(motion.speed(t))) for t in times)
+    assert motion.frame_index(2.2) == 66
+    assert motion.frame_index(0.0123) is None
+
+
+class DemoScene:
+    """The parts of a deck scene a demo uses before it plays anything."""
+
+    scene_time = 0.0
+
+    def stopwatch(self):
+        return Stopwatch(self)
+
+    def depends_on(self, mobject, *inputs):
+        return mobject
+
+
+def _baseline_position(start, direction, final_speed, t, accel_time=1.5):
+    # The updaters of the demos before RelativeVelocityDemo
+    if t < accel_time:
+        a = final_speed / accel_time
+        return start + direction * (0.5 * a * t**2)
+    return start + direction * ((0.5 * final_speed * accel_time) + final_speed * (t - accel_time))
+
+
+@pytest.mark.parametrize("a_start, a_direction, a_speed, b_start, b_direction, b_speed, duration", [
+    (UP + 5 * LEFT, RIGHT, 2, DOWN + 5 * RIGHT, LEFT, 3, 4 + 2.5),
+    (UP + 5 * LEFT, RIGHT, 2, DOWN + 5 * RIGHT, LEFT, 3, 4 + 1),
+    (UP + 5 * RIGHT, LEFT, 3, DOWN + 3 * RIGHT, LEFT, 2, 4 + 2.5),
+    (UP + 5 * RIGHT, LEFT, 3, DOWN + 3 * RIGHT, LEFT, 2, 4 + 1),
+], ids=["demo", "ademo", "zdemo", "zademo"])
+def test_demo_follows_the_baseline_trajectories(typeset, a_start, a_direction, a_speed, b_start, b_direction, b_speed, duration):
+    scene = DemoScene()
+    demo = RelativeVelocityDemo(scene, a_start, a_direction, a_speed, b_start, b_direction, b_speed, duration)
+    overlays = [demo.attach(demo.a_dot, demo.a_motion, "A"), demo.attach(demo.b_dot, demo.b_motion, "B")]
+    demo.stopwatch.start()
+
+    for step in range(round(duration * 10) + 1):
+        scene.scene_time = step / 10
+        for dot, (arrow, label) in zip((demo.a_dot, demo.b_dot), overlays):
+            dot.update()
+            arrow.update()
+            label.update()
+
+    expected = [(a_start, a_direction, a_speed), (b_start, b_direction, b_speed)]
+    for dot, (arrow, label), (start, direction, speed) in zip((demo.a_dot, demo.b_dot), overlays, expected):
+        assert np.allclose(dot.get_center(), _baseline_position(start, direction, speed, duration))
+        gap = dot.radius * demo.gap_factor
+        assert np.allclose(arrow.get_start(), dot.get_center() + direction * gap)
+        assert np.allclose(arrow.get_end(), dot.get_center() + direction * (gap + demo.arrow_length))
+        assert label.text.endswith(f"= {speed:.2f}")
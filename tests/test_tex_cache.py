@@ -0,0 +1,84 @@
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import MathTex, TexTemplate
+from manim.mobject.text import tex_mobject
+
+from render_tools import tex_cache
+from render_tools.tex_cache import TexCache, TexCacheMixin, tex_request
+
+
+class FakeTeX:
+    """Stands in for the TeX programs: each page of a document becomes an SVG holding its source."""
+
+    def __init__(self):
+        self.compilations = 0
+
+    def __call__(self, command, cwd=None, **kwargs):
+        if command[1:] == ["--version"]:
+            return subprocess.CompletedProcess(command, 0, stdout="fake TeX\n")
+        if "-ini" in command:
+            jobname = next(arg for arg in command if arg.startswith("-jobname="))[len("-jobname="):]
+            Path(cwd, f"{jobname}.fmt").write_text("format")
+        elif command[0] == "dvisvgm":
+            output = Path(command[-1])
+            pattern = next(arg for arg in command if arg.startswith("--output="))[len("--output="):]
+            source = output.with_suffix(".tex").read_text()
+            for number, page in enumerate(source.split(r"\begin{standalone}")[1:], 1):
+                Path(pattern.replace("%p", str(number))).write_text(page.partition(r"\end{standalone}")[0])
+        else:
+            self.compilations += 1
+            Path(cwd, "expression.dvi").write_text("dvi")
+        return subprocess.CompletedProcess(command, 0)
+
+
+class Host:
+    def setup(self):
+        pass
+
+    def tear_down(self):
+        pass
+
+
+class TexScene(TexCacheMixin, Host):
+    pass
+
+
+def _key(cache, expression, tex_template):
+    return cache.key(tex_cache._tex_code(expression, None, tex_template), tex_template)
+
+
+def test_key_follows_the_expression_and_the_preamble(tmp_path):
+    cache = TexCache(tmp_path)
+    template = TexTemplate()
+    with_xcolor = TexTemplate()
+    with_xcolor.add_to_preamble(r"\usepackage{xcolor}")
+
+    assert _key(cache, "x^2", template) == _key(cache, "x^2", TexTemplate())
+    assert _key(cache, "x^2", template) != _key(cache, "x^3", template)
+    assert _key(cache, "x^2", template) != _key(cache, "x^2", with_xcolor)
+
+
+def test_batch_is_compiled_once(tmp_path, monkeypatch):
+    fake = FakeTeX()
+    monkeypatch.setattr(tex_cache.subprocess, "run", fake)
+    expressions = [f"x^{{{power}}}" for power in range(5)]
+    scene = TexScene()
+    scene.render_options = SimpleNamespace(tex_cache=tmp_path)
+    scene.setup()
+
+    scene.prepare_tex(*expressions, jobs=1)
+    assert fake.compilations == 1
+
+    # Every page went to its own expression, and later constructors only read the cache
+    for expression in expressions:
+        svg_file = tex_mobject.tex_to_svg_file(*tex_request(MathTex, expression))
+        assert expression in Path(svg_file).read_text()
+    scene.prepare_tex(*expressions, jobs=1)
+    assert fake.compilations == 1
+    scene.tear_down()
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import RIGHT, Dot, Square, Text, VGroup
+
+from render_tools.text_cache import TextCache, TextCacheMixin
+
+
+class Host:
+    def setup(self):
+        pass
+
+    def tear_down(self):
+        pass
+
+
+class TextScene(TextCacheMixin, Host):
+    pass
+
+
+def _points(mobject):
+    return [member.points.copy() for member in mobject.get_family()[1:]]
+
+
+@pytest.fixture
+def scene(tmp_path):
+    scene = TextScene()
+    scene.render_options = SimpleNamespace(text_cache=tmp_path)
+    scene.setup()
+    yield scene
+    scene.tear_down()
+
+
+def test_cache_hit_is_an_independent_copy(scene):
+    # Shaping needs Pango: the prototype is primed by hand
+    prototype = VGroup(Square(), Dot().shift(RIGHT))
+    scene.text_cache.prototypes[scene.text_cache.key("Title", {})] = prototype
+    expected = _points(prototype)
+
+    text = Text("Title")
+    assert isinstance(text, Text)
+    assert all(np.array_equal(a, b) for a, b in zip(_points(text), expected, strict=True))
+    assert not set(map(id, text.get_family())) & set(map(id, prototype.get_family()))
+
+    text.shift(RIGHT).set_color("#ff0000")
+    text.add(Dot())
+    again = Text("Title")
+    assert all(np.array_equal(a, b) for a, b in zip(_points(prototype), expected, strict=True))
+    assert all(np.array_equal(a, b) for a, b in zip(_points(again), expected, strict=True))
+
+
+def test_stored_prototype_is_read_back_from_disk(scene, tmp_path):
+    key = scene.text_cache.key("Title", {"font_size": 30})
+    prototype = VGroup(Square(), Dot())
+    scene.text_cache.store(key, prototype)
+
+    # A later process starts with an empty memory
+    scene.text_cache.prototypes.clear()
+    text = Text("Title", font_size=30)
+    assert all(np.array_equal(a, b) for a, b in zip(_points(text), _points(prototype), strict=True))